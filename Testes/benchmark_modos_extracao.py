@@ -0,0 +1,87 @@
+"""
+Benchmark dos modos de extração do ExtratorPDFProjetos.
+Compara o tempo do modo "fidelidade" (PyMuPDF4LLM) com o modo "rapido"
+(markdown montado direto dos spans do fitz) e a concordância do texto produzido.
+
+Uso:
+    python Testes/benchmark_modos_extracao.py caminho/arquivo.pdf [repeticoes]
+"""
+
+import sys
+import re
+import time
+import logging
+from difflib import SequenceMatcher
+from pathlib import Path
+
+# Permite executar a partir da raiz do projeto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.agents.extractor.preprocess import ExtratorPDFProjetos
+
+logging.disable(logging.INFO)
+
+
+def palavras(markdown):
+    """Normaliza o markdown em uma lista de palavras (sem marcação, tabelas ou caixa)."""
+    texto = re.sub(r"[#*|_`>-]+", " ", markdown)
+    return texto.lower().split()
+
+
+def medir(modo, caminho_pdf, repeticoes):
+    """Executa a extração `repeticoes` vezes e retorna (melhor tempo, páginas)."""
+    melhor = None
+    paginas = []
+    for _ in range(repeticoes):
+        extrator = ExtratorPDFProjetos(modo=modo)
+        inicio = time.perf_counter()
+        paginas = extrator.extrair_com_margens_controladas(caminho_pdf)
+        duracao = time.perf_counter() - inicio
+        melhor = duracao if melhor is None else min(melhor, duracao)
+    return melhor, paginas
+
+
+def concordancia(paginas_a, paginas_b):
+    """Similaridade média por página (0-1) entre as sequências de palavras."""
+    razoes = []
+    for pa, pb in zip(paginas_a, paginas_b):
+        a, b = palavras(pa.conteudo_markdown), palavras(pb.conteudo_markdown)
+        if not a and not b:
+            razoes.append(1.0)
+            continue
+        razoes.append(SequenceMatcher(None, a, b, autojunk=False).ratio())
+    return sum(razoes) / len(razoes) if razoes else 0.0, razoes
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    caminho_pdf = Path(sys.argv[1])
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    print(f"Arquivo: {caminho_pdf}")
+    print(f"Repetições por modo: {repeticoes}\n")
+
+    tempo_fid, paginas_fid = medir("fidelidade", caminho_pdf, repeticoes)
+    tempo_rap, paginas_rap = medir("rapido", caminho_pdf, repeticoes)
+
+    media, razoes = concordancia(paginas_fid, paginas_rap)
+    total = len(paginas_fid)
+
+    print("=== Tempo (melhor de N) ===")
+    print(f"fidelidade: {tempo_fid:.3f}s ({tempo_fid / max(total, 1) * 1000:.1f} ms/página)")
+    print(f"rapido:     {tempo_rap:.3f}s ({tempo_rap / max(total, 1) * 1000:.1f} ms/página)")
+    print(f"Aceleração: {tempo_fid / max(tempo_rap, 1e-9):.1f}x\n")
+
+    print("=== Concordância do texto (palavras, por página) ===")
+    print(f"Média: {media:.1%}")
+    print(f"Mínima: {min(razoes):.1%}" if razoes else "Mínima: -")
+    piores = sorted(enumerate(razoes, start=1), key=lambda item: item[1])[:5]
+    for numero, razao in piores:
+        print(f"  Página {numero}: {razao:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark da normalização de texto do ExtratorPDFProjetos
+(merge_lines, fix_hyphenation e normalize_spaces).
+
+Monta um corpus grande a partir de PDFs (páginas extraídas sem normalização)
+e/ou arquivos markdown, replicando-o até o tamanho pedido. Mede a vazão da
+passada única, verifica que o tempo cresce linearmente com o tamanho e mostra
+a economia de caracteres/tokens estimados de cada opção.
+
+Uso:
+    python Testes/benchmark_normalizacao.py arquivo.pdf|arquivo.md [...] [--mb 50] [--modo rapido]
+"""
+
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+
+# Permite executar a partir da raiz do projeto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.agents.extractor.preprocess import ExtratorPDFProjetos, _normalizar_linhas
+
+logging.disable(logging.INFO)
+
+OPCOES = {
+    "merge_lines": (True, False, False),
+    "fix_hyphenation": (False, True, False),
+    "normalize_spaces": (False, False, True),
+    "todas": (True, True, True),
+}
+
+
+def paginas_do_arquivo(caminho, modo):
+    """Markdown de cada página de um PDF (sem normalização) ou o conteúdo de um .md."""
+    if caminho.suffix.lower() != ".pdf":
+        return [caminho.read_text(encoding="utf-8")]
+    extrator = ExtratorPDFProjetos(modo=modo)
+    for opcao in ("merge_lines", "fix_hyphenation", "normalize_spaces"):
+        extrator.processing_config[opcao] = False
+    return [p.conteudo_markdown for p in extrator.extrair_com_margens_controladas(caminho)]
+
+
+def montar_corpus(paginas, tamanho_bytes):
+    """Replica as páginas até atingir o tamanho desejado."""
+    corpus = []
+    total = 0
+    while total < tamanho_bytes:
+        for pagina in paginas:
+            corpus.append(pagina)
+            total += len(pagina.encode("utf-8"))
+            if total >= tamanho_bytes:
+                break
+    return corpus
+
+
+def normalizar(corpus, opcoes):
+    """Normaliza todas as páginas e retorna (segundos, caracteres de saída, linhas de saída)."""
+    inicio = time.perf_counter()
+    caracteres = linhas = 0
+    for pagina in corpus:
+        for linha in _normalizar_linhas(pagina.split("\n"), *opcoes):
+            caracteres += len(linha) + 1
+            linhas += 1
+    return time.perf_counter() - inicio, caracteres, linhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("arquivos", nargs="+", type=Path)
+    parser.add_argument("--mb", type=float, default=50.0, help="Tamanho do corpus em MB")
+    parser.add_argument("--modo", default="rapido", help="Modo de extração dos PDFs")
+    args = parser.parse_args()
+
+    paginas = []
+    for caminho in args.arquivos:
+        paginas.extend(paginas_do_arquivo(caminho, args.modo))
+    if not paginas:
+        print("Nenhum texto encontrado.")
+        sys.exit(1)
+
+    corpus = montar_corpus(paginas, int(args.mb * 1024 * 1024))
+    caracteres_entrada = sum(len(p) + 1 for p in corpus)
+    linhas_entrada = sum(p.count("\n") + 1 for p in corpus)
+    megabytes = sum(len(p.encode("utf-8")) for p in corpus) / (1024 * 1024)
+
+    print(f"Corpus: {len(corpus)} páginas, {megabytes:.1f} MB, {linhas_entrada} linhas\n")
+
+    print("=== Economia por opção ===")
+    for nome, opcoes in OPCOES.items():
+        duracao, caracteres, linhas = normalizar(corpus, opcoes)
+        economia = caracteres_entrada - caracteres
+        print(
+            f"{nome:17s} {duracao:7.2f}s  {megabytes / duracao:6.1f} MB/s  "
+            f"-{economia} caracteres (~{economia // 4} tokens, {economia / caracteres_entrada:.1%})  "
+            f"-{linhas_entrada - linhas} linhas"
+        )
+
+    print("\n=== Escalabilidade (todas as opções) ===")
+    base = None
+    for fator in (0.25, 0.5, 1.0):
+        parte = corpus[:max(1, int(len(corpus) * fator))]
+        duracao, _, _ = normalizar(parte, OPCOES["todas"])
+        base = base or duracao / fator
+        print(f"{fator:4.0%} do corpus: {duracao:6.2f}s (linear esperado: {base * fator:6.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
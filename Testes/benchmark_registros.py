@@ -0,0 +1,134 @@
+"""
+Benchmark dos registros de página (Pagina, Navegador, Titulo, Campo, Elemento)
+contra a representação anterior em dicts aninhados.
+
+As páginas de um PDF são extraídas e replicadas até o número pedido (cada
+cópia é desserializada de JSON, com objetos próprios, como em uma extração
+real). Mede a memória retida por cada representação (tracemalloc), o tempo e
+o tamanho do JSON do documento (configuração embutida x referenciada pelo hash)
+e do pickle das páginas (transporte da extração paralela).
+
+Uso:
+    python Testes/benchmark_registros.py arquivo.pdf [--paginas 500] [--modo rapido]
+"""
+
+import sys
+import json
+import time
+import pickle
+import logging
+import argparse
+import tracemalloc
+from pathlib import Path
+
+# Permite executar a partir da raiz do projeto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.agents.extractor.preprocess import ExtratorPDFProjetos, Pagina, _json_padrao
+
+logging.disable(logging.INFO)
+
+
+def linhas_ndjson(extrator, caminho_pdf, total):
+    """Páginas extraídas, replicadas até `total` e serializadas uma por linha."""
+    paginas = [p.para_dict() for p in extrator.extrair_com_margens_controladas(caminho_pdf)]
+    linhas = []
+    for numero in range(1, total + 1):
+        pagina = dict(paginas[(numero - 1) % len(paginas)], numero=numero)
+        linhas.append(json.dumps(pagina, ensure_ascii=False))
+    return linhas
+
+
+def memoria_retida(construir):
+    """Executa `construir` e retorna (resultado, bytes alocados que continuam vivos)."""
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = construir()
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return resultado, depois - antes
+
+
+def como_dicts(linhas):
+    return [json.loads(linha) for linha in linhas]
+
+
+def como_registros(linhas):
+    # Metadados do documento compartilhados entre as páginas, como no pipeline
+    compartilhados = {}
+    paginas = []
+    for linha in linhas:
+        pagina = Pagina.de_dict(json.loads(linha))
+        pagina.metadados = compartilhados.setdefault(tuple(pagina.metadados.items()), pagina.metadados)
+        paginas.append(pagina)
+    return paginas
+
+
+def medir(funcao, repeticoes=3):
+    """Melhor tempo de N execuções e o último resultado."""
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        duracao = time.perf_counter() - inicio
+        melhor = duracao if melhor is None else min(melhor, duracao)
+    return melhor, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("arquivo", type=Path)
+    parser.add_argument("--paginas", type=int, default=500)
+    parser.add_argument("--modo", default="rapido", help="Modo de extração do PDF")
+    args = parser.parse_args()
+
+    extrator = ExtratorPDFProjetos(modo=args.modo)
+    linhas = linhas_ndjson(extrator, args.arquivo, args.paginas)
+    print(f"Arquivo: {args.arquivo} ({args.paginas} páginas)\n")
+
+    dicts, memoria_dicts = memoria_retida(lambda: como_dicts(linhas))
+    registros, memoria_registros = memoria_retida(lambda: como_registros(linhas))
+    texto = sum(len(p.conteudo_markdown.encode("utf-8")) for p in registros)
+
+    print("=== Memória retida (páginas em memória) ===")
+    print(f"dicts:     {memoria_dicts / 1024:9.0f} KiB ({memoria_dicts / args.paginas:6.0f} B/página)")
+    print(f"registros: {memoria_registros / 1024:9.0f} KiB ({memoria_registros / args.paginas:6.0f} B/página)")
+    print(f"Economia:  {1 - memoria_registros / memoria_dicts:.1%} (markdown das páginas: {texto / 1024:.0f} KiB)\n")
+
+    base = {
+        "arquivo": str(args.arquivo),
+        "total_paginas": args.paginas,
+        "margens_aplicadas": extrator.margens,
+    }
+    # Formato anterior: configuração embutida em cada JSON de saída
+    anterior = {
+        **base,
+        "configuracao": {
+            "header_config": extrator.header_config,
+            "field_config": extrator.field_config,
+            "special_elements": extrator.special_elements,
+            "navegadores_laterais": extrator.navegadores_laterais
+        },
+        "paginas": dicts,
+    }
+    atual = {**base, "hash_configuracao": extrator.hash_configuracao(), "paginas": registros}
+
+    def json_de(dados):
+        return lambda: json.dumps(dados, ensure_ascii=False, indent=2, default=_json_padrao)
+
+    print("=== Serialização (melhor de 3) ===")
+    for nome, funcao in (
+        ("JSON dicts + configuração", json_de(anterior)),
+        ("JSON registros + hash", json_de(atual)),
+        ("pickle dicts", lambda: pickle.dumps(dicts, pickle.HIGHEST_PROTOCOL)),
+        ("pickle registros", lambda: pickle.dumps(registros, pickle.HIGHEST_PROTOCOL)),
+    ):
+        duracao, saida = medir(funcao)
+        print(f"{nome:26s} {duracao * 1000:8.1f} ms  {len(saida) / 1024:9.0f} KiB")
+
+    configuracao = json.dumps(anterior["configuracao"], ensure_ascii=False, indent=2, default=_json_padrao)
+    print(f"\nConfiguração deixa de ser repetida em cada JSON: {len(configuracao) / 1024:.1f} KiB por saída")
+
+
+if __name__ == "__main__":
+    main()
@@ -61,15 +61,17 @@ def extrair_texto_de_pdf(caminho_pdf):
         dados_estruturados = dados.get('dados_estruturados', {})
         
         print(f"Dados estruturados: {len(dados_estruturados)} campos")
+        if dados.get('campos_ausentes'):
+            print(f"Campos não extraídos: {', '.join(dados['campos_ausentes'])}")
         
         # Salvar resultados
         data_hora = datetime.now().strftime('%Y%m%d%H%M%S')
         
-        # Salvar texto extraído
-        nome_arquivo_texto = f"texto_extraido_{data_hora}.txt"
-        with open(nome_arquivo_texto, "w", encoding="utf-8") as arquivo:
-            arquivo.write(dados_estruturados.get('texto_raw', ''))
-        print(f"\nTexto extraído salvo em: {nome_arquivo_texto}")
+        # Salvar dados estruturados (campos CNMP)
+        nome_arquivo_dados = f"dados_estruturados_{data_hora}.json"
+        with open(nome_arquivo_dados, "w", encoding="utf-8") as arquivo:
+            json.dump(dados_estruturados, arquivo, indent=2, ensure_ascii=False)
+        print(f"\nDados estruturados salvos em: {nome_arquivo_dados}")
         
         # Salvar resposta completa em JSON
         nome_arquivo_json = f"resposta_api_{data_hora}.json"
@@ -79,7 +81,11 @@ def extrair_texto_de_pdf(caminho_pdf):
         
         return dados
     else:
-        print(f"Erro na extração: {resposta.status_code} - {resposta.text}")
+        try:
+            detalhe = resposta.json().get('detail', resposta.text)
+        except ValueError:
+            detalhe = resposta.text
+        print(f"Erro na extração: {resposta.status_code} - {detalhe}")
         return None
 
 def verificar_servidor():
@@ -0,0 +1,118 @@
+"""
+Verificação da tolerância a falhas da extração em partes (map-reduce).
+
+Substitui extrair_dados_estruturados por uma versão local (sem Gemini) em
+que algumas partes "map" falham, e confere que as evidências das partes bem
+sucedidas ainda chegam à etapa "reduce". Também confere que a falha de todas
+as partes propaga o erro e que, na extração por grupos, um grupo que falha é
+repetido com o documento inteiro e, se falhar de novo, tem seus campos
+listados em "campos_ausentes".
+
+Uso:
+    python Testes/verificar_extracao_partes.py
+"""
+
+import sys
+import json
+import asyncio
+import logging
+from pathlib import Path
+
+# Permite executar a partir da raiz do projeto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.agents.extractor import extracao_partes
+from src.agents.extractor.prompts import CAMPOS_CNMP, GRUPOS_CAMPOS, MAP_PROMPT, REDUCE_PROMPT
+from src.agents.extractor.secoes import Parte, Secao
+
+logging.disable(logging.WARNING)
+
+
+def extrator_falso(partes_com_falha, chamadas_reduce):
+    """extrair_dados_estruturados local: partes em `partes_com_falha` levantam erro."""
+    async def extrair(texto, prompt, esquema=None, usar_cache=True):
+        if prompt is MAP_PROMPT:
+            if texto in partes_com_falha:
+                raise ValueError(f"Resposta JSON inválida para {texto}")
+            return {"nmProjeto": [f"Projeto da {texto}"]}
+        assert prompt is REDUCE_PROMPT
+        chamadas_reduce.append(json.loads(texto))
+        return {"nmProjeto": "Projeto final"}
+    return extrair
+
+
+async def verificar():
+    partes = [Parte((f"S{i}",), f"parte {i}") for i in range(1, 4)]
+
+    # Uma parte falha, as demais seguem para a redução
+    chamadas_reduce = []
+    extracao_partes.extrair_dados_estruturados = extrator_falso({"parte 2"}, chamadas_reduce)
+    resultado = await extracao_partes.extrair_em_partes(partes)
+    assert resultado == {"nmProjeto": "Projeto final"}, resultado
+    assert chamadas_reduce == [{"nmProjeto": ["Projeto da parte 1", "Projeto da parte 3"]}], chamadas_reduce
+    print("OK: falha parcial chega à redução com as evidências das partes bem sucedidas")
+
+    # Todas as partes falham: o erro é propagado, sem chamada de redução
+    chamadas_reduce = []
+    extracao_partes.extrair_dados_estruturados = extrator_falso({p.texto for p in partes}, chamadas_reduce)
+    try:
+        await extracao_partes.extrair_em_partes(partes)
+    except ValueError as e:
+        print(f"OK: falha de todas as partes propaga o erro ({e})")
+    else:
+        raise AssertionError("Falha de todas as partes deveria propagar o erro")
+    assert not chamadas_reduce
+
+
+def extrator_grupos_falso(falhas_por_grupo, chamadas):
+    """Versão local para a extração por grupos: o grupo falha nas primeiras `falhas_por_grupo[nome]` chamadas."""
+    grupos_por_prompt = {prompt: nome for nome, prompt in extracao_partes._PROMPTS_GRUPOS.items()}
+
+    async def extrair(texto, prompt, esquema=None, usar_cache=True):
+        nome = grupos_por_prompt[prompt]
+        chamadas.append((nome, texto))
+        if sum(1 for n, _ in chamadas if n == nome) <= falhas_por_grupo.get(nome, 0):
+            raise ValueError(f"Resposta JSON inválida para {nome}")
+        return {campo: f"valor de {campo}" for campo in GRUPOS_CAMPOS[nome]["campos"]}
+    return extrair
+
+
+async def verificar_grupos():
+    secoes = [Secao(f"Seção {i}", f"Texto da seção {i} sobre o projeto.") for i in range(1, 7)]
+    progresso = []
+
+    async def ao_concluir_etapa(concluidas, total):
+        progresso.append((concluidas, total))
+
+    # "descricao" falha só com as seções recuperadas; "valores" falha também com o documento inteiro
+    chamadas = []
+    extracao_partes.extrair_dados_estruturados = extrator_grupos_falso({"descricao": 1, "valores": 2}, chamadas)
+    resultado = await extracao_partes.extrair_por_grupos(
+        secoes, secoes_por_grupo=2, ao_concluir_etapa=ao_concluir_etapa
+    )
+
+    repeticoes = chamadas[len(GRUPOS_CAMPOS):]
+    assert sorted(nome for nome, _ in repeticoes) == ["descricao", "valores"], repeticoes
+    assert all(all(s.texto in texto for s in secoes) for _, texto in repeticoes), repeticoes
+    ausentes = list(GRUPOS_CAMPOS["valores"]["campos"])
+    assert resultado.pop("campos_ausentes") == ausentes, resultado
+    assert list(resultado) == list(CAMPOS_CNMP), list(resultado)
+    assert all(resultado[campo] == "" for campo in ausentes)
+    assert resultado["descricao"] == "valor de descricao", resultado
+    total = len(GRUPOS_CAMPOS) + 2
+    assert progresso == [(i, len(GRUPOS_CAMPOS)) for i in range(1, len(GRUPOS_CAMPOS) + 1)] + [
+        (len(GRUPOS_CAMPOS) + 1, total), (total, total)
+    ], progresso
+    print("OK: grupo com falha repetido com o documento inteiro; campos ainda ausentes listados")
+
+    # Sem falhas: nenhuma repetição e nenhum "campos_ausentes"
+    chamadas = []
+    extracao_partes.extrair_dados_estruturados = extrator_grupos_falso({}, chamadas)
+    resultado = await extracao_partes.extrair_por_grupos(secoes, secoes_por_grupo=2)
+    assert len(chamadas) == len(GRUPOS_CAMPOS) and "campos_ausentes" not in resultado, resultado
+    print("OK: extração por grupos sem falhas não repete chamadas")
+
+
+if __name__ == "__main__":
+    asyncio.run(verificar())
+    asyncio.run(verificar_grupos())
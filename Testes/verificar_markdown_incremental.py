@@ -0,0 +1,64 @@
+"""
+Verificação do EscritorMarkdownIncremental com remoção de cabeçalhos/rodapés.
+
+Monta páginas sintéticas (sem PDF) com um cabeçalho e um rodapé repetidos e
+confere que:
+- o conteúdo relido do spool sai exatamente como foi gravado, inclusive com
+  "\\r" e "\\r\\n" no texto das páginas;
+- em páginas curtas, linhas de conteúdo que diferem só em números ("Meta 1",
+  "Meta 2") não são tomadas por cabeçalhos, enquanto a numeração de página é.
+
+Uso:
+    python Testes/verificar_markdown_incremental.py
+"""
+
+import sys
+import logging
+from pathlib import Path
+
+# Permite executar a partir da raiz do projeto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.agents.extractor.preprocess import EscritorMarkdownIncremental, ExtratorPDFProjetos, Pagina
+
+logging.disable(logging.INFO)
+
+
+def conteudo_sem_indice(paginas):
+    """Markdown gerado para as páginas, sem o índice, com a remoção de cabeçalhos ativa."""
+    extrator = ExtratorPDFProjetos()
+    extrator.processing_config['clean_headers_footers'] = True
+    with EscritorMarkdownIncremental(extrator) as escritor:
+        for numero, markdown in enumerate(paginas, 1):
+            escritor.adicionar(Pagina(numero, markdown, {}))
+        return escritor.texto().split("\n---\n\n", 1)[1]
+
+
+def verificar_retorno_de_carro():
+    letras = "abcde"
+    corpos = [
+        f"Parágrafo {letra} com quebra Windows\r\ne um retorno\rsolto {letra}\n"
+        f"Terceira linha {letra}\nQuarta linha {letra}\nQuinta linha {letra}\nSexta linha {letra}"
+        for letra in letras
+    ]
+    paginas = [f"CABEÇALHO DO DOCUMENTO\n{corpo}\nRODAPÉ DO DOCUMENTO" for corpo in corpos]
+    resultado = conteudo_sem_indice(paginas)
+    assert resultado == "\n\n".join(corpos), repr(resultado[:300])
+    print("OK: páginas com \\r e \\r\\n relidas sem deslocar os limites")
+
+
+def verificar_paginas_curtas():
+    total = 5
+    corpos = [f"Meta {numero}\nEtapa {numero}" for numero in range(1, total + 1)]
+    paginas = [
+        f"CABEÇALHO DO DOCUMENTO\n{corpo}\nPágina {numero} de {total}"
+        for numero, corpo in enumerate(corpos, 1)
+    ]
+    resultado = conteudo_sem_indice(paginas)
+    assert resultado == "\n\n".join(corpos), repr(resultado)
+    print("OK: conteúdo de páginas curtas preservado; cabeçalho e numeração removidos")
+
+
+if __name__ == "__main__":
+    verificar_retorno_de_carro()
+    verificar_paginas_curtas()
@@ -1,54 +1,200 @@
-from fastmcp import FastMCP
+from fastmcp import FastMCP, Context
 from src.config import load_settings
 from src.services.llm import extrair_dados_estruturados
+from src.utils.validar_pdf import PDFInvalido, validar_pdf
 from .prompts import EXTRACTION_PROMPT
-import os
+from .esquema import ESQUEMA_CNMP
+import asyncio
 import base64
+import threading
 import tempfile
-import fitz
 import json
 import datetime
+from contextlib import aclosing
 from pathlib import Path
-from .preprocess import ExtratorPDFProjetos
+from typing import AsyncIterator, Callable, Iterator, Optional
+from .preprocess import ExtratorPDFProjetos, EscritorMarkdownIncremental
+from .cache import CacheExtracao
+from .secoes import agrupar_secoes, dividir_secoes
+from .extracao_partes import extrair_em_partes, extrair_por_grupos
 
 settings = load_settings()
 
+# Cache de extrações endereçado pelo conteúdo do PDF
+_dir_cache = Path(settings.extractor_cache_dir or Path(tempfile.gettempdir()) / "projeto_conexoes" / "cache")
+_cache_extracao = None
+if settings.extractor_cache_habilitado:
+    _cache_extracao = CacheExtracao(
+        _dir_cache,
+        max_bytes=settings.extractor_cache_max_mb * 1024 * 1024,
+        ttl_segundos=settings.extractor_cache_ttl_segundos,
+    )
+
+# Cache por página: versões revisadas de um PDF só reprocessam as páginas alteradas
+_cache_paginas = None
+if settings.extractor_cache_paginas_habilitado:
+    _cache_paginas = CacheExtracao(
+        _dir_cache / "paginas",
+        max_bytes=settings.extractor_cache_max_mb * 1024 * 1024,
+        ttl_segundos=settings.extractor_cache_ttl_segundos,
+    )
+
+# Extrator compartilhado: configuração e padrões compilados uma única vez, na
+# inicialização do servidor MCP. A instância é congelada (somente leitura) e pode
+# atender chamadas concorrentes; o estado de cada requisição fica na própria tool.
+def _criar_extrator(modo: str) -> ExtratorPDFProjetos:
+    extrator = ExtratorPDFProjetos(cache_paginas=_cache_paginas, modo=modo)
+    extrator.processing_config['clean_headers_footers'] = settings.extractor_remover_cabecalhos
+    extrator.processing_config['baixa_memoria'] = settings.extractor_baixa_memoria
+    extrator.congelar()
+    return extrator
+
+_extrator = _criar_extrator(settings.extractor_modo)
+
+# A prévia usa seu próprio modo (por padrão o rápido, para caber no orçamento de tempo)
+_extrator_previa = (
+    _extrator if settings.extractor_previa_modo == settings.extractor_modo
+    else _criar_extrator(settings.extractor_previa_modo)
+)
+
+# Estratégias de chamada ao LLM em structured_data_tool ("auto" escolhe pelo documento)
+ESTRATEGIAS_LLM = ("auto", "unica", "partes", "grupos")
+
 # Instancia MCP local para o agente extractor
 extractor_mcp = FastMCP(name="extractor")
 
+async def _iterar_em_thread(gerar: Callable[[], Iterator], max_pendentes: int = 4) -> AsyncIterator:
+    """
+    Consome um gerador bloqueante em uma thread dedicada, sem bloquear o event loop.
+    
+    Todo o gerador roda na mesma thread (o fitz não deve trocar de thread no meio
+    de um documento); os itens são repassados ao loop assim que ficam prontos.
+    No máximo `max_pendentes` itens aguardam o consumidor (a thread espera por
+    vaga). Se o consumidor for interrompido (cancelamento, cliente desconectado),
+    a thread para no próximo item e fecha o gerador, sem processar o restante;
+    use com contextlib.aclosing para que isso ocorra também quando a
+    interrupção chega no corpo do `async for`.
+    """
+    loop = asyncio.get_running_loop()
+    fila: asyncio.Queue = asyncio.Queue()
+    vagas = threading.Semaphore(max_pendentes)
+    parar = threading.Event()
+    fim = object()
+    
+    def produzir():
+        itens = gerar()
+        try:
+            for item in itens:
+                while not vagas.acquire(timeout=0.1):
+                    if parar.is_set():
+                        return
+                if parar.is_set():
+                    return
+                loop.call_soon_threadsafe(fila.put_nowait, item)
+        except BaseException as e:
+            loop.call_soon_threadsafe(fila.put_nowait, e)
+        finally:
+            fechar = getattr(itens, "close", None)
+            if fechar is not None:
+                fechar()
+            loop.call_soon_threadsafe(fila.put_nowait, fim)
+    
+    produtor = loop.run_in_executor(None, produzir)
+    try:
+        while True:
+            item = await fila.get()
+            if item is fim:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            vagas.release()
+            yield item
+    finally:
+        parar.set()
+        await produtor
+
 # Tool: extrai texto de PDF
 @extractor_mcp.tool()
-def pdf_text_tool(base64_pdf: str, session_id: str) -> dict:
+async def pdf_text_tool(base64_pdf: str, session_id: str, ctx: Context) -> dict:
     """
     Extrai o texto estruturado de um arquivo PDF codificado em base64
     usando o extrator avançado ExtratorPDFProjetos.
+    
+    As páginas são processadas em streaming: o progresso e o markdown parcial
+    de cada página são enviados ao cliente como notificações MCP. Arquivos
+    inválidos (não PDF, corrompidos, com senha, sem texto ou acima dos limites)
+    são rejeitados antes da extração com {"codigo", "erro"}.
     """
     try:
         # Decodificar PDF de base64
         decoded = base64.b64decode(base64_pdf)
         
-        # Salvar em arquivo temporário
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            tmp_file.write(decoded)
-            tmp_path = tmp_file.name
+        # Rejeição imediata de arquivos inválidos, antes do cache e da extração
+        try:
+            validacao = validar_pdf(
+                decoded,
+                max_mb=settings.extractor_max_mb,
+                max_paginas=settings.extractor_max_paginas,
+                exigir_texto=settings.extractor_exigir_texto,
+            )
+        except PDFInvalido as e:
+            await ctx.info(f"PDF rejeitado ({e.codigo}): {e.mensagem}")
+            return e.para_dict()
         
-        # Criar caminhos temporários para saída
-        temp_dir = Path(tempfile.gettempdir()) / "projeto_conexoes" / session_id
-        temp_dir.mkdir(parents=True, exist_ok=True)
+        # Reenvios do mesmo PDF com a mesma configuração saem do cache
+        # (hash do PDF e leitura em disco fora do event loop)
+        extrator = _extrator
+        chave_cache = None
+        if _cache_extracao is not None:
+            chave_cache = await asyncio.to_thread(_cache_extracao.chave, decoded, extrator.hash_configuracao())
+            em_cache = await asyncio.to_thread(_cache_extracao.obter, chave_cache)
+            if em_cache is not None:
+                await ctx.info("Extração recuperada do cache")
+                return {**em_cache, "cache": "hit"}
         
-        saida_md = temp_dir / "output.md"
-        saida_json = temp_dir / "output.json"
+        # Processar usando o extrator avançado, direto dos bytes em memória
+        total_paginas = validacao["total_paginas"]
+        tempos_etapas = {}
+        if settings.extractor_processos > 1:
+            # Extração paralela: as páginas chegam juntas, ao final de todas as fatias
+            def gerar_paginas():
+                return iter(extrator.extrair_com_margens_paralelo(
+                    decoded, settings.extractor_processos, tempos_etapas
+                ))
+        else:
+            def gerar_paginas():
+                return extrator.iter_paginas(decoded, tempos_etapas)
         
-        # Processar usando o extrator avançado
-        extrator = ExtratorPDFProjetos()
-        dados = extrator.extrair_completo(Path(tmp_path), saida_md, saida_json)
+        with EscritorMarkdownIncremental(extrator) as escritor:
+            async with aclosing(_iterar_em_thread(gerar_paginas)) as paginas:
+                async for pagina in paginas:
+                    fragmento = escritor.adicionar(pagina)
+                    await ctx.report_progress(escritor.total_paginas, total_paginas)
+                    await ctx.debug(fragmento)
+            
+            texto_extraido = escritor.texto()
+            resumo = escritor.resumo()
+            economia = escritor.economia()
         
-        # Ler o texto processado do arquivo markdown
-        texto_extraido = saida_md.read_text(encoding="utf-8") if saida_md.exists() else ""
-        
-        # Limpar arquivos temporários
-        os.remove(tmp_path)
+        if economia and economia["linhas_removidas"]:
+            await ctx.info(
+                f"Cabeçalhos/rodapés repetidos removidos: {economia['caracteres_economizados']} caracteres "
+                f"(~{economia['tokens_estimados_economizados']} tokens)"
+            )
         
+        # Artefatos em disco são opcionais (apenas para depuração)
+        if settings.extractor_salvar_artefatos:
+            temp_dir = Path(tempfile.gettempdir()) / "projeto_conexoes" / session_id
+            temp_dir.mkdir(parents=True, exist_ok=True)
+            (temp_dir / "output.md").write_text(texto_extraido, encoding="utf-8")
+            # Estrutura JSON apenas com o resumo (as páginas não são retidas em memória)
+            with open(temp_dir / "output.json", "w", encoding="utf-8") as f:
+                json.dump({
+                    "total_paginas": total_paginas,
+                    "margens_aplicadas": dict(extrator.margens),
+                    "resumo": resumo,
+                    "tempos_etapas": tempos_etapas,
+                }, f, ensure_ascii=False, indent=2, default=str)
         
         if not texto_extraido.strip():
             return {"erro": "Não foi possível extrair texto do PDF."}
@@ -58,26 +204,126 @@ def pdf_text_tool(base64_pdf: str, session_id: str) -> dict:
         resposta = {
             "texto": texto_extraido.strip(),
             "metadados": {
-                "total_paginas": dados["total_paginas"],
-                "campos_estruturados": dados["resumo"]["total_campos_estruturados"],
-                "navegadores_laterais": dados["resumo"]["total_navegadores_laterais"],
-                "tipos_documento": dados["resumo"]["tipos_documento"],
-                "hierarquia": dados["resumo"]["hierarquia_detectada"]
+                "total_paginas": total_paginas,
+                "campos_estruturados": resumo["total_campos_estruturados"],
+                "navegadores_laterais": resumo["total_navegadores_laterais"],
+                "tipos_documento": resumo["tipos_documento"],
+                "hierarquia": resumo["hierarquia_detectada"],
+                "cabecalhos_rodapes": economia
             }
         }
         
-        return resposta
+        if chave_cache is not None:
+            await asyncio.to_thread(_cache_extracao.salvar, chave_cache, resposta)
+        
+        return {**resposta, "cache": "miss" if chave_cache is not None else "desabilitado"}
     except Exception as e:
         return {"erro": f"Erro na extração do PDF: {str(e)}"}
 
+# Tool: prévia rápida do PDF (índice e páginas iniciais), sem LLM
+@extractor_mcp.tool()
+async def pdf_preview_tool(base64_pdf: str, session_id: str, ctx: Context) -> dict:
+    """
+    Gera uma prévia do PDF dentro de um orçamento de tempo: processa apenas as
+    primeiras páginas e as páginas onde começam seções dos navegadores laterais,
+    retornando o nome do projeto, o índice hierárquico e o markdown das páginas
+    iniciais. Arquivos inválidos são rejeitados como em pdf_text_tool.
+    """
+    try:
+        decoded = base64.b64decode(base64_pdf)
+        
+        try:
+            validar_pdf(
+                decoded,
+                max_mb=settings.extractor_max_mb,
+                max_paginas=settings.extractor_max_paginas,
+                exigir_texto=settings.extractor_exigir_texto,
+            )
+        except PDFInvalido as e:
+            await ctx.info(f"PDF rejeitado ({e.codigo}): {e.mensagem}")
+            return e.para_dict()
+        
+        previa = await asyncio.to_thread(
+            _extrator_previa.extrair_previa,
+            decoded,
+            settings.extractor_previa_paginas,
+            settings.extractor_previa_tempo_limite,
+        )
+        if not previa["completa"]:
+            await ctx.info(
+                f"Prévia parcial: {previa['paginas_processadas']} de "
+                f"{len(previa['paginas_selecionadas'])} páginas selecionadas no tempo limite"
+            )
+        
+        return {
+            "nome_projeto": previa["nome_projeto"],
+            "indice": previa["indice"],
+            "texto": previa["markdown"],
+            "metadados": {
+                chave: previa[chave] for chave in (
+                    "total_paginas", "paginas_selecionadas", "paginas_processadas",
+                    "paginas_varridas", "completa", "tempo_segundos",
+                )
+            }
+        }
+    except Exception as e:
+        return {"erro": f"Erro na prévia do PDF: {str(e)}"}
+
 # Tool: extrai dados estruturados usando Gemini
 @extractor_mcp.tool()
-def structured_data_tool(texto: str) -> dict:
+async def structured_data_tool(texto: str, ctx: Context, estrategia: Optional[str] = None) -> dict:
     """
     Utiliza Gemini via utilitário centralizado para extrair dados estruturados de um texto jurídico.
+    
+    Estratégias (padrão em extractor_llm_estrategia):
+    - "unica": texto inteiro e EXTRACTION_PROMPT em uma chamada;
+    - "grupos": índice BM25 local das seções; cada grupo de campos recebe só as
+      seções mais relevantes e as suas regras, com os grupos em paralelo;
+    - "partes": map-reduce sobre as seções H1/navegadores laterais (evidências
+      por parte em paralelo + chamada final que monta os 26 campos CNMP);
+    - "auto": "unica" até extractor_llm_dividir_acima_caracteres; acima disso,
+      "grupos" se o documento tem mais seções do que as recuperadas por grupo,
+      senão "partes".
+    
+    Todas as chamadas usam o modo JSON do Gemini com schema (esquema.py): os
+    campos de classificação só aceitam as opções listadas no prompt.
     """
     try:
-        return extrair_dados_estruturados(texto, EXTRACTION_PROMPT)
+        estrategia = estrategia or settings.extractor_llm_estrategia
+        if estrategia not in ESTRATEGIAS_LLM:
+            return {"erro": f"Estratégia inválida: {estrategia} (opções: {', '.join(ESTRATEGIAS_LLM)})"}
+        
+        if estrategia == "auto":
+            limite = settings.extractor_llm_dividir_acima_caracteres
+            estrategia = "dividir" if limite and len(texto) > limite else "unica"
+        
+        secoes = dividir_secoes(texto) if estrategia != "unica" else []
+        if estrategia == "dividir":
+            # Texto longo: grupos se há mais seções do que as recuperadas por grupo
+            estrategia = "grupos" if len(secoes) > settings.extractor_llm_secoes_por_grupo else "partes"
+        
+        if estrategia == "grupos":
+            await ctx.info(f"Extração por grupos de campos ({len(secoes)} seções)")
+            return await extrair_por_grupos(
+                secoes,
+                secoes_por_grupo=settings.extractor_llm_secoes_por_grupo,
+                max_caracteres_grupo=settings.extractor_llm_grupo_max_caracteres,
+                concorrencia=settings.extractor_llm_concorrencia,
+                ao_concluir_etapa=ctx.report_progress,
+            )
+        
+        partes = []
+        if estrategia == "partes":
+            partes = agrupar_secoes(secoes, settings.extractor_llm_parte_max_caracteres)
+        if len(partes) > 1:
+            await ctx.info(f"Extração em {len(partes)} partes ({len(texto)} caracteres)")
+            return await extrair_em_partes(
+                partes,
+                concorrencia=settings.extractor_llm_concorrencia,
+                max_caracteres_campo=settings.extractor_llm_evidencias_max_caracteres,
+                ao_concluir_etapa=ctx.report_progress,
+            )
+        return await extrair_dados_estruturados(texto, EXTRACTION_PROMPT, ESQUEMA_CNMP)
     except Exception as e:
         return {"erro": f"Erro ao processar resposta do Gemini: {str(e)}"}
 
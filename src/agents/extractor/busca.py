@@ -0,0 +1,79 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Iterable, List
+
+_RE_PALAVRA = re.compile(r'[a-z0-9]+')
+
+# Radical por prefixo: "cronograma"/"cronogramas", "risco"/"riscos" caem no mesmo termo
+_TAMANHO_RADICAL = 6
+
+_STOPWORDS = frozenset("""
+a ao aos as com como da das de do dos e em entre na nas no nos o os ou para pela pelas pelo
+pelos por que se sem sao ser sua suas seu seus um uma umas uns ja mais nao foi sobre ate
+""".split())
+
+
+def tokenizar(texto: str) -> List[str]:
+    """Termos de busca: sem acentos, minúsculos, sem stopwords, reduzidos a um radical por prefixo."""
+    sem_acentos = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return [
+        palavra[:_TAMANHO_RADICAL]
+        for palavra in _RE_PALAVRA.findall(sem_acentos.lower())
+        if len(palavra) > 1 and palavra not in _STOPWORDS
+    ]
+
+
+class IndiceBM25:
+    """
+    Índice Okapi BM25 em memória sobre uma lista pequena de documentos (seções).
+
+    Sem dependências externas: tokenização simples (tokenizar) e pontuação
+    BM25 clássica, com IDF sempre positivo.
+    """
+
+    def __init__(self, documentos: Iterable[str], k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            documentos: Textos indexados (a posição na lista identifica o documento)
+            k1: Saturação da frequência do termo
+            b: Normalização pelo tamanho do documento
+        """
+        self.k1 = k1
+        self.b = b
+        self._frequencias = [Counter(tokenizar(documento)) for documento in documentos]
+        self._tamanhos = [sum(frequencia.values()) for frequencia in self._frequencias]
+        total = len(self._frequencias)
+        self._tamanho_medio = (sum(self._tamanhos) / total) if total else 0.0
+
+        documentos_com_termo = Counter()
+        for frequencia in self._frequencias:
+            documentos_com_termo.update(frequencia.keys())
+        self._idf = {
+            termo: math.log(1 + (total - n + 0.5) / (n + 0.5))
+            for termo, n in documentos_com_termo.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._frequencias)
+
+    def pontuar(self, consulta: str) -> List[float]:
+        """Pontuação BM25 de cada documento para a consulta."""
+        termos = [termo for termo in set(tokenizar(consulta)) if termo in self._idf]
+        pontuacoes = []
+        for frequencia, tamanho in zip(self._frequencias, self._tamanhos):
+            normalizacao = self.k1 * (1 - self.b + self.b * tamanho / (self._tamanho_medio or 1))
+            pontuacao = 0.0
+            for termo in termos:
+                ocorrencias = frequencia.get(termo)
+                if ocorrencias:
+                    pontuacao += self._idf[termo] * ocorrencias * (self.k1 + 1) / (ocorrencias + normalizacao)
+            pontuacoes.append(pontuacao)
+        return pontuacoes
+
+    def melhores(self, consulta: str, quantidade: int) -> List[int]:
+        """Índices dos `quantidade` documentos mais relevantes (pontuação > 0), do melhor ao pior."""
+        pontuacoes = self.pontuar(consulta)
+        ordem = sorted(range(len(pontuacoes)), key=lambda i: pontuacoes[i], reverse=True)
+        return [i for i in ordem[:quantidade] if pontuacoes[i] > 0]
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CacheExtracao:
+    """
+    Cache em disco, endereçado por conteúdo, para resultados de extração de PDF.
+
+    Cada entrada é um arquivo JSON nomeado pela chave (SHA-256 do PDF + hash da
+    configuração do extrator). A expiração usa TTL a partir da criação e o limite
+    de tamanho descarta primeiro as entradas usadas há mais tempo (LRU pelo mtime,
+    atualizado a cada acerto).
+    """
+
+    SUFIXO = ".json"
+
+    def __init__(self, diretorio: Path, max_bytes: int, ttl_segundos: int, intervalo_poda: float = 10.0):
+        """
+        Args:
+            diretorio: Diretório onde as entradas são gravadas
+            max_bytes: Tamanho máximo total das entradas em disco
+            ttl_segundos: Tempo de vida de cada entrada (0 = sem expiração)
+            intervalo_poda: Intervalo mínimo (s) entre varreduras de TTL/tamanho,
+                           para que gravações em rajada (ex.: por página) não
+                           listem o diretório a cada chamada
+        """
+        self.diretorio = Path(diretorio)
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_segundos = ttl_segundos
+        self.intervalo_poda = intervalo_poda
+        self._ultima_poda = 0.0
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def __getstate__(self):
+        # O lock não é serializável (extração paralela envia o cache aos processos)
+        estado = self.__dict__.copy()
+        del estado["_lock"]
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def chave(conteudo: bytes, hash_config: str) -> str:
+        """
+        Calcula a chave de uma entrada.
+
+        Args:
+            conteudo: Bytes do PDF decodificado
+            hash_config: Hash da configuração do extrator
+
+        Returns:
+            Chave hexadecimal
+        """
+        return hashlib.sha256(conteudo).hexdigest() + "-" + hash_config[:16]
+
+    def _caminho(self, chave: str) -> Path:
+        return self.diretorio / f"{chave}{self.SUFIXO}"
+
+    def _expirado(self, criado_em: float, agora: float) -> bool:
+        return bool(self.ttl_segundos) and agora - criado_em > self.ttl_segundos
+
+    def obter(self, chave: str) -> Optional[Dict]:
+        """
+        Recupera uma entrada válida.
+
+        Args:
+            chave: Chave calculada por `chave()`
+
+        Returns:
+            Dados armazenados ou None se ausente/expirada/corrompida
+        """
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, encoding="utf-8") as f:
+                entrada = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.falhas += 1
+            return None
+
+        # Entrada de outro formato (ex.: versão anterior do cache): trata como ausente
+        if not isinstance(entrada, dict) or "dados" not in entrada:
+            self._remover(caminho)
+            self.falhas += 1
+            return None
+
+        agora = time.time()
+        if self._expirado(entrada.get("criado_em", 0), agora):
+            self._remover(caminho)
+            self.falhas += 1
+            return None
+
+        # Marca o uso para a política LRU
+        try:
+            os.utime(caminho, (agora, agora))
+        except OSError:
+            pass
+        self.acertos += 1
+        return entrada["dados"]
+
+    def salvar(self, chave: str, dados: Dict) -> None:
+        """
+        Grava uma entrada de forma atômica e aplica os limites de TTL e tamanho.
+
+        Args:
+            chave: Chave calculada por `chave()`
+            dados: Dados serializáveis em JSON
+        """
+        entrada = {"criado_em": time.time(), "dados": dados}
+        fd, tmp = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entrada, f, ensure_ascii=False, default=str)
+            os.replace(tmp, self._caminho(chave))
+        except OSError as e:
+            logger.warning(f"Falha ao gravar entrada de cache {chave}: {e}")
+            self._remover(Path(tmp))
+            return
+        self._podar()
+
+    def _podar(self) -> None:
+        """Remove entradas expiradas e, se necessário, as menos usadas até caber no limite."""
+        with self._lock:
+            agora = time.time()
+            if agora - self._ultima_poda < self.intervalo_poda:
+                return
+            self._ultima_poda = agora
+            entradas = []
+            for caminho in self.diretorio.glob(f"*{self.SUFIXO}"):
+                try:
+                    st = caminho.stat()
+                except OSError:
+                    continue
+                entradas.append((st.st_mtime, st.st_size, caminho))
+
+            # TTL: o mtime nunca é anterior à criação, então só verifica o arquivo
+            # quando o próprio mtime já passou do prazo
+            total = 0
+            vivas = []
+            for mtime, tamanho, caminho in entradas:
+                if self._expirado(mtime, agora) and self._entrada_expirada(caminho, agora):
+                    self._remover(caminho)
+                else:
+                    vivas.append((mtime, tamanho, caminho))
+                    total += tamanho
+
+            # LRU: descarta as menos usadas recentemente
+            vivas.sort()
+            for mtime, tamanho, caminho in vivas:
+                if total <= self.max_bytes:
+                    break
+                self._remover(caminho)
+                total -= tamanho
+
+    def _entrada_expirada(self, caminho: Path, agora: float) -> bool:
+        try:
+            with open(caminho, encoding="utf-8") as f:
+                return self._expirado(json.load(f).get("criado_em", 0), agora)
+        except (OSError, json.JSONDecodeError):
+            return True
+
+    @staticmethod
+    def _remover(caminho: Path) -> None:
+        try:
+            caminho.unlink()
+        except OSError:
+            pass
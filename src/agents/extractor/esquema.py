@@ -0,0 +1,90 @@
+import re
+from typing import Dict, List, Sequence, Tuple
+
+from .prompts import CAMPOS_CNMP, EXTRACTION_PROMPT
+
+# Títulos das listas de opções em EXTRACTION_PROMPT
+_TITULO_OBJETIVOS = "## **OBJETIVO ESTRATÉGICO PEN-MP**"
+_TITULO_CATEGORIAS = "## **CATEGORIAS PARA O PRÊMIO**"
+
+# "I. Atuação Finalística do Ministério Público > Investigação e Inteligência"
+_RE_CATEGORIA = re.compile(r'^(?:I|II|III)\. [^>]+ > [^>]+$')
+
+TIPOS_INICIATIVA = ("programa", "projeto")
+TIPOS_INICIATIVA2 = ("ação", "campanha", "ferramenta")
+
+
+def _itens_da_lista(titulo: str) -> List[str]:
+    """Itens "- ..." da seção de EXTRACTION_PROMPT com o título indicado, sem negrito e com espaços normalizados."""
+    linhas = EXTRACTION_PROMPT.split("\n")
+    inicio = next(i for i, linha in enumerate(linhas) if linha.startswith(titulo))
+    itens = []
+    for linha in linhas[inicio + 1:]:
+        if linha.startswith("#"):
+            break
+        if linha.startswith("- "):
+            itens.append(" ".join(linha[2:].replace("*", " ").split()))
+    return itens
+
+
+def _sem_repeticoes(itens: Sequence[str]) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(itens))
+
+
+# Opções aceitas em objEstrategico1/2/3, ex.: "1.1 > Adequação das tarifas no transporte público"
+OBJETIVOS_PEN_MP = _sem_repeticoes(_itens_da_lista(_TITULO_OBJETIVOS))
+
+# Opções aceitas em categoriaPremio. A lista do prompt repete algumas categorias
+# em negrito e tem uma linha com duas categorias coladas; só entram as linhas
+# "Grupo > Categoria" bem formadas, uma vez cada.
+CATEGORIAS_PREMIO = _sem_repeticoes(
+    item for item in _itens_da_lista(_TITULO_CATEGORIAS) if _RE_CATEGORIA.match(item)
+)
+
+_OPCOES_CAMPOS = {
+    "tpIniciativa": TIPOS_INICIATIVA,
+    "tpIniciativa2": TIPOS_INICIATIVA2,
+    "objEstrategico1": OBJETIVOS_PEN_MP,
+    "objEstrategico2": OBJETIVOS_PEN_MP,
+    "objEstrategico3": OBJETIVOS_PEN_MP,
+    "categoriaPremio": CATEGORIAS_PREMIO,
+}
+
+
+def esquema_cnmp(campos: Sequence[str] = CAMPOS_CNMP) -> Dict:
+    """
+    Schema de resposta (response_schema do Gemini) com os campos CNMP indicados.
+
+    Todos os campos são strings obrigatórias, na ordem de CAMPOS_CNMP; os de
+    classificação só aceitam as opções listadas em EXTRACTION_PROMPT.
+
+    Args:
+        campos: Subconjunto de CAMPOS_CNMP (padrão: os 26 campos)
+
+    Returns:
+        Schema OBJECT no formato aceito por GenerateContentConfig.response_schema
+    """
+    ordenados = [campo for campo in CAMPOS_CNMP if campo in campos]
+    propriedades = {}
+    for campo in ordenados:
+        propriedade = {"type": "STRING"}
+        if campo in _OPCOES_CAMPOS:
+            propriedade.update(format="enum", enum=list(_OPCOES_CAMPOS[campo]))
+        propriedades[campo] = propriedade
+    return {
+        "type": "OBJECT",
+        "properties": propriedades,
+        "required": ordenados,
+        "propertyOrdering": ordenados,
+    }
+
+
+# Resposta completa da extração (chamada única, etapa "reduce")
+ESQUEMA_CNMP = esquema_cnmp()
+
+# Resposta da etapa "map": listas de evidências, só para os campos encontrados
+ESQUEMA_EVIDENCIAS = {
+    "type": "OBJECT",
+    "properties": {campo: {"type": "ARRAY", "items": {"type": "STRING"}} for campo in CAMPOS_CNMP},
+    "propertyOrdering": list(CAMPOS_CNMP),
+}
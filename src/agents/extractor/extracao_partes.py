@@ -0,0 +1,305 @@
+import asyncio
+import json
+import logging
+import re
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from src.services.llm import extrair_dados_estruturados
+from .busca import IndiceBM25
+from .esquema import ESQUEMA_CNMP, ESQUEMA_EVIDENCIAS, esquema_cnmp
+from .prompts import CAMPOS_CNMP, EXTRACTION_PROMPT, GRUPO_PROMPT, GRUPOS_CAMPOS, MAP_PROMPT, REDUCE_PROMPT
+from .secoes import Parte, Secao, fragmentar_secoes
+
+logger = logging.getLogger(__name__)
+
+# Recebe (etapas concluídas, total de etapas) a cada chamada ao LLM concluída
+AoConcluirEtapa = Callable[[int, int], Awaitable[None]]
+
+_CABECALHO_TABELA_CAMPOS = "| Campo destino (JSON)"
+
+
+async def _em_paralelo(
+    chamadas: Sequence[Tuple[str, str, Dict]],
+    concorrencia: int,
+    ao_concluir_etapa: Optional[AoConcluirEtapa],
+    total_etapas: int,
+) -> List[Union[Dict, Exception]]:
+    """
+    Executa chamadas (texto, prompt, esquema) a extrair_dados_estruturados com no máximo
+    `concorrencia` simultâneas. Falhas são devolvidas como exceção na posição da
+    chamada, sem interromper as demais.
+    """
+    semaforo = asyncio.Semaphore(max(1, concorrencia))
+    concluidas = 0
+
+    async def chamar(texto: str, prompt: str, esquema: Dict):
+        nonlocal concluidas
+        async with semaforo:
+            try:
+                resultado = await extrair_dados_estruturados(texto, prompt, esquema)
+            except Exception as e:
+                resultado = e
+        concluidas += 1
+        if ao_concluir_etapa is not None:
+            await ao_concluir_etapa(concluidas, total_etapas)
+        return resultado
+
+    return await asyncio.gather(*(chamar(*chamada) for chamada in chamadas))
+
+
+def _candidatos_da_resposta(resposta: Dict) -> Dict[str, List[str]]:
+    """Evidências válidas de uma resposta "map": só campos CNMP, trechos não vazios."""
+    candidatos = {}
+    for campo, valor in resposta.items():
+        if campo not in CAMPOS_CNMP:
+            continue
+        valores = valor if isinstance(valor, list) else [valor]
+        trechos = [str(v).strip() for v in valores if v is not None and str(v).strip()]
+        if trechos:
+            candidatos[campo] = trechos
+    return candidatos
+
+
+def combinar_candidatos(
+    candidatos_por_parte: List[Dict[str, List[str]]],
+    max_caracteres_campo: int,
+) -> Dict[str, List[str]]:
+    """
+    Junta as evidências de todas as partes por campo, na ordem do documento.
+
+    Trechos repetidos (ignorando caixa e espaços) entram uma vez só e cada
+    campo fica limitado a max_caracteres_campo, o que mantém a chamada de
+    redução pequena.
+
+    Args:
+        candidatos_por_parte: Evidências de cada parte, na ordem do documento
+        max_caracteres_campo: Limite de caracteres das evidências de cada campo
+
+    Returns:
+        Dict campo -> lista de trechos (apenas campos com evidência)
+    """
+    combinados: Dict[str, List[str]] = {}
+    vistos: Dict[str, set] = {}
+    tamanhos: Dict[str, int] = {}
+    for candidatos in candidatos_por_parte:
+        for campo, trechos in candidatos.items():
+            for trecho in trechos:
+                chave = " ".join(trecho.casefold().split())
+                if chave in vistos.setdefault(campo, set()):
+                    continue
+                if tamanhos.get(campo, 0) + len(trecho) > max_caracteres_campo:
+                    continue
+                vistos[campo].add(chave)
+                tamanhos[campo] = tamanhos.get(campo, 0) + len(trecho)
+                combinados.setdefault(campo, []).append(trecho)
+    # Ordem fixa dos campos (mesma do JSON final)
+    return {campo: combinados[campo] for campo in CAMPOS_CNMP if campo in combinados}
+
+
+async def extrair_em_partes(
+    partes: List[Parte],
+    concorrencia: int = 4,
+    max_caracteres_campo: int = 3000,
+    ao_concluir_etapa: Optional[AoConcluirEtapa] = None,
+) -> Dict:
+    """
+    Extração map-reduce dos campos CNMP para documentos longos.
+
+    Etapa "map": cada parte é enviada com MAP_PROMPT (curto) e devolve as
+    evidências de cada campo (ESQUEMA_EVIDENCIAS); até `concorrencia` chamadas rodam ao mesmo tempo.
+    Etapa "reduce": as evidências combinadas (combinar_candidatos) são enviadas
+    com REDUCE_PROMPT, que aplica as regras de EXTRACTION_PROMPT e monta os 26
+    campos (ESQUEMA_CNMP). Partes que falham são registradas e ignoradas; se todas falharem,
+    o erro da última é propagado.
+
+    Args:
+        partes: Partes do documento (secoes.agrupar_secoes)
+        concorrencia: Chamadas "map" simultâneas
+        max_caracteres_campo: Limite das evidências de cada campo na redução
+        ao_concluir_etapa: Callback assíncrono de progresso (concluídas, total)
+
+    Returns:
+        Resultado de extrair_dados_estruturados na etapa de redução
+    """
+    total_etapas = len(partes) + 1
+    respostas = await _em_paralelo(
+        [(parte.texto, MAP_PROMPT, ESQUEMA_EVIDENCIAS) for parte in partes], concorrencia, ao_concluir_etapa, total_etapas
+    )
+    erros = [resposta for resposta in respostas if isinstance(resposta, Exception)]
+    for indice, resposta in enumerate(respostas):
+        if isinstance(resposta, Exception):
+            logger.warning(f"Falha na extração da parte {indice + 1}/{len(partes)}: {resposta}")
+    if len(erros) == len(partes):
+        raise erros[-1]
+    candidatos_por_parte = [
+        _candidatos_da_resposta(resposta) for resposta in respostas if not isinstance(resposta, Exception)
+    ]
+
+    evidencias = combinar_candidatos(candidatos_por_parte, max_caracteres_campo)
+    logger.info(
+        f"Evidências de {len(partes) - len(erros)}/{len(partes)} partes: "
+        f"{sum(len(v) for v in evidencias.values())} trechos em {len(evidencias)} campos"
+    )
+
+    resultado = await extrair_dados_estruturados(
+        json.dumps(evidencias, ensure_ascii=False, indent=1), REDUCE_PROMPT, ESQUEMA_CNMP
+    )
+    if ao_concluir_etapa is not None:
+        await ao_concluir_etapa(total_etapas, total_etapas)
+    return resultado
+
+
+def _trecho_do_prompt(titulo: str) -> str:
+    """Trecho de EXTRACTION_PROMPT do título indicado (prefixo da linha) até o próximo título de mesmo nível ou acima."""
+    linhas = EXTRACTION_PROMPT.split("\n")
+    for inicio, linha in enumerate(linhas):
+        if linha.startswith(titulo):
+            nivel = len(linha) - len(linha.lstrip("#"))
+            fim = next(
+                (j for j in range(inicio + 1, len(linhas))
+                 if linhas[j].startswith("#") and len(linhas[j]) - len(linhas[j].lstrip("#")) <= nivel),
+                len(linhas),
+            )
+            return "\n".join(linhas[inicio:fim]).strip().removesuffix("---").rstrip()
+    raise KeyError(f"Título não encontrado em EXTRACTION_PROMPT: {titulo}")
+
+
+def _montar_prompt_grupo(grupo: Dict) -> str:
+    """
+    Prompt mínimo de um grupo de campos, recortado de EXTRACTION_PROMPT.
+
+    Mantém apenas as linhas de regras e da tabela de especificações que citam
+    os campos do grupo, mais os trechos listados em grupo["secoes_prompt"].
+    """
+    campos = grupo["campos"]
+    padroes = [re.compile(rf'\*\*{campo}\b|\|[^|]*\b{campo}\b[^|]*\|\s*$') for campo in campos]
+    linhas = EXTRACTION_PROMPT.split("\n")
+    regras = []
+    for i, linha in enumerate(linhas):
+        if linha.startswith(_CABECALHO_TABELA_CAMPOS):
+            regras.extend(linhas[i:i + 2])
+        elif any(padrao.search(linha) for padrao in padroes):
+            regras.append(linha)
+
+    prompt = GRUPO_PROMPT.format(campos=", ".join(campos)) + "\n".join(regras)
+    for titulo in grupo["secoes_prompt"]:
+        prompt += "\n\n" + _trecho_do_prompt(titulo)
+    return prompt + "\n"
+
+
+# Prompts e schemas de resposta dos grupos montados uma única vez, na importação
+_PROMPTS_GRUPOS = {nome: _montar_prompt_grupo(grupo) for nome, grupo in GRUPOS_CAMPOS.items()}
+_ESQUEMAS_GRUPOS = {nome: esquema_cnmp(grupo["campos"]) for nome, grupo in GRUPOS_CAMPOS.items()}
+
+
+def _texto_do_grupo(
+    fragmentos: List[Secao],
+    indice: IndiceBM25,
+    consulta: str,
+    quantidade: int,
+    max_caracteres: int,
+) -> str:
+    """
+    Seções recuperadas para um grupo, na ordem do documento e até max_caracteres.
+
+    Sem nenhuma seção relevante para a consulta, usa as primeiras seções do
+    documento. Fragmentos de texto idêntico (páginas repetidas) entram uma vez.
+    """
+    candidatas = indice.melhores(consulta, quantidade) or range(len(fragmentos))
+    escolhidas = []
+    vistos = set()
+    tamanho = 0
+    for i in candidatas:
+        markdown = fragmentos[i].markdown()
+        if markdown in vistos or (escolhidas and tamanho + len(markdown) > max_caracteres):
+            continue
+        vistos.add(markdown)
+        escolhidas.append(i)
+        tamanho += len(markdown) + 2
+    return "\n\n".join(fragmentos[i].markdown() for i in sorted(escolhidas))
+
+
+async def extrair_por_grupos(
+    secoes: List[Secao],
+    secoes_por_grupo: int = 3,
+    max_caracteres_grupo: int = 16000,
+    concorrencia: int = 4,
+    ao_concluir_etapa: Optional[AoConcluirEtapa] = None,
+) -> Dict:
+    """
+    Extração dos campos CNMP por grupos de campos, com recuperação BM25 de seções.
+
+    As seções (quebradas em fragmentos de até max_caracteres_grupo) são
+    indexadas localmente (IndiceBM25, título com peso dobrado). Para cada grupo
+    de GRUPOS_CAMPOS, as `secoes_por_grupo` seções mais relevantes para a
+    consulta do grupo são enviadas com o prompt mínimo do grupo e o schema
+    só com os campos do grupo; os grupos
+    rodam em paralelo e os resultados são unidos na ordem de CAMPOS_CNMP.
+    Grupos que falham têm uma nova tentativa com o texto do documento
+    inteiro; os campos que ainda faltarem saem vazios e listados em
+    "campos_ausentes". Se todos os grupos falharem, o erro do último é
+    propagado.
+
+    Args:
+        secoes: Seções do documento (secoes.dividir_secoes)
+        secoes_por_grupo: Seções recuperadas por grupo
+        max_caracteres_grupo: Limite do texto do documento enviado em cada grupo
+        concorrencia: Chamadas simultâneas
+        ao_concluir_etapa: Callback assíncrono de progresso (concluídas, total)
+
+    Returns:
+        Dict com os campos CNMP extraídos e, se algum grupo falhou mesmo com o
+        documento inteiro, "campos_ausentes" com os campos não extraídos
+    """
+    fragmentos = fragmentar_secoes(secoes, max_caracteres_grupo)
+    indice = IndiceBM25(f"{f.titulo}\n{f.titulo}\n{f.texto}" for f in fragmentos)
+
+    grupos = list(GRUPOS_CAMPOS.items())
+    textos = [
+        _texto_do_grupo(fragmentos, indice, grupo["consulta"], secoes_por_grupo, max_caracteres_grupo)
+        for _, grupo in grupos
+    ]
+    logger.info(
+        f"Extração por grupos: {len(grupos)} chamadas com {sum(map(len, textos))} caracteres do documento "
+        f"(documento: {sum(len(f.texto) for f in fragmentos)} caracteres em {len(fragmentos)} seções)"
+    )
+
+    respostas = await _em_paralelo(
+        [(texto, _PROMPTS_GRUPOS[nome], _ESQUEMAS_GRUPOS[nome]) for (nome, _), texto in zip(grupos, textos)],
+        concorrencia, ao_concluir_etapa, len(grupos),
+    )
+
+    # Nova tentativa dos grupos que falharam, com o documento inteiro
+    falhas = [i for i, resposta in enumerate(respostas) if isinstance(resposta, Exception)]
+    if falhas:
+        for i in falhas:
+            logger.warning(f"Falha na extração do grupo {grupos[i][0]}: {respostas[i]}; repetindo com o documento inteiro")
+        documento = "\n\n".join(dict.fromkeys(f.markdown() for f in fragmentos))
+        total_etapas = len(grupos) + len(falhas)
+
+        async def ao_concluir_repeticao(concluidas: int, _total: int) -> None:
+            await ao_concluir_etapa(len(grupos) + concluidas, total_etapas)
+
+        repeticoes = await _em_paralelo(
+            [(documento, _PROMPTS_GRUPOS[grupos[i][0]], _ESQUEMAS_GRUPOS[grupos[i][0]]) for i in falhas],
+            concorrencia, ao_concluir_repeticao if ao_concluir_etapa is not None else None, len(falhas),
+        )
+        for i, resposta in zip(falhas, repeticoes):
+            respostas[i] = resposta
+
+    dados = {}
+    erros = []
+    for (nome, grupo), resposta in zip(grupos, respostas):
+        if isinstance(resposta, Exception):
+            logger.warning(f"Falha na extração do grupo {nome} com o documento inteiro: {resposta}")
+            erros.append(resposta)
+        else:
+            dados.update((campo, resposta[campo]) for campo in grupo["campos"] if campo in resposta)
+    if len(erros) == len(grupos):
+        raise erros[-1]
+
+    resultado = {campo: dados.get(campo, "") for campo in CAMPOS_CNMP}
+    ausentes = [campo for campo in CAMPOS_CNMP if campo not in dados]
+    if ausentes:
+        resultado["campos_ausentes"] = ausentes
+    return resultado
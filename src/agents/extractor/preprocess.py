@@ -1,26 +1,504 @@
 import fitz  # PyMuPDF
+import numpy as np
 import pymupdf4llm
 from pathlib import Path
+import hashlib
+import io
 import json
 import logging
-from typing import Dict, List, Optional
+import shutil
+import tempfile
+from typing import ClassVar, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+import os
 import re
+import time
+from types import MappingProxyType
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Expressões fixas do pós-processamento hierárquico
+_RE_HEADER_EXISTENTE = re.compile(r'^(.*?)(#{1,4})\s*\*\*(.+?)\*\*\s*$')
+_RE_FRAGMENTO_NEGRITO = re.compile(r'(\*\*[^*]+\*\*)')
+_RE_LINHA_NEGRITO = re.compile(r'^\*\*(.+)\*\*$')
+_NIVEIS_HEADER = ('h1', 'h2', 'h3', 'h4')
+
+# Versão do pipeline de extração: incrementar quando uma mudança de código alterar
+# a saída, para invalidar resultados em cache gerados pela versão anterior
+VERSAO_EXTRATOR = "2"
+
+# Chaves de processing_config que afetam só a execução, não o resultado
+_CHAVES_EXECUCAO = {
+    'processos', 'paginas_min_por_fatia', 'paginas_por_lote', 'baixa_memoria',
+    'previa_paginas', 'previa_tempo_limite',
+}
+
+# Modos de extração suportados
+MODOS_EXTRACAO = ("fidelidade", "rapido")
+
+# Flag de negrito nos spans do fitz e tamanho máximo de uma linha de título no modo rápido
+_FLAG_NEGRITO = 16
+_MAX_CHARS_TITULO = 120
+
+# Limpeza de cabeçalhos/rodapés: marcação ignorada na comparação de linhas,
+# números de linhas curtas (paginação) e estimativa de caracteres por token do LLM
+_RE_MARCACAO_LINHA = re.compile(r'[#*_`>|]+')
+_RE_DIGITOS = re.compile(r'\d+')
+# Numeração de página em linhas de borda: "página 3 de 10", "pág. 3", "fls. 12", "3 / 10", "- 3 -"
+_RE_NUMERACAO_PAGINA = re.compile(
+    r'\b(?:p[aá]g(?:ina)?|fls?|folha)\.?\s*\d+(?:\s*(?:/|de)\s*\d+)?\b'
+    r'|^[\s\-–—.]*\d+(?:\s*(?:/|de)\s*\d+)?[\s\-–—.]*$'
+)
+_CHARS_POR_TOKEN = 4
+
+# Normalização do texto (merge_lines, fix_hyphenation, normalize_spaces)
+_RE_TITULO_MD = re.compile(r'#{1,6}(?:\s|$)')
+_RE_ITEM_LISTA = re.compile(r'\s*(?:[-*+]|\d{1,3}[.)])\s')
+_RE_REGRA_HORIZONTAL = re.compile(r'(?:-{3,}|\*{3,}|_{3,})$')
+_RE_HIFEN_CELULA = re.compile(r'(?<=[^\W\d_])-<br>(?=[a-zß-öø-ÿ])')
+
+# Campos estruturados (em minúsculas) que trazem o nome do projeto, por prioridade,
+# e o rótulo no markdown quando o valor vem na linha seguinte ("**Nome Completo do Projeto:**")
+_CAMPOS_NOME_PROJETO = ("nome completo do projeto", "nome do projeto")
+_RE_ROTULO_NOME_PROJETO = re.compile(
+    r'^[#>*_|\s]*nome (?:completo )?do projeto[*_\s]*:[*_\s]*(?P<valor>[^\n]*)(?:\n\s*)*(?P<seguinte>[^\n]*)',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Origem de um PDF: caminho em disco ou o conteúdo do arquivo em memória
+OrigemPDF = Union[str, Path, bytes]
+
+
+# Registros das páginas processadas: sem __dict__ (slots) e com serialização explícita
+
+@dataclass(slots=True)
+class Navegador:
+    """Navegador lateral de seção detectado na margem direita da página."""
+
+    secao: str
+    texto: str
+    posicao: Tuple[float, float, float, float]
+
+    TIPO: ClassVar[str] = "navegador_lateral"
+
+    def para_dict(self) -> Dict:
+        return {"secao": self.secao, "texto": self.texto, "posicao": list(self.posicao), "tipo": self.TIPO}
+
+    @classmethod
+    def de_dict(cls, dados: Dict) -> "Navegador":
+        return cls(dados["secao"], dados["texto"], tuple(dados["posicao"]))
+
+
+@dataclass(slots=True)
+class Titulo:
+    """Header markdown encontrado no texto da página."""
+
+    nivel_markdown: int
+    titulo: str
+    posicao: int
+
+    @property
+    def nivel(self) -> str:
+        return f"h{self.nivel_markdown}"
+
+    def para_dict(self) -> Dict:
+        return {
+            "nivel": self.nivel,
+            "nivel_markdown": self.nivel_markdown,
+            "titulo": self.titulo,
+            "posicao": self.posicao,
+        }
+
+    @classmethod
+    def de_dict(cls, dados: Dict) -> "Titulo":
+        return cls(dados["nivel_markdown"], dados["titulo"], dados["posicao"])
+
+
+@dataclass(slots=True)
+class Campo:
+    """Campo estruturado "Campo: valor" (tipo campo_estruturado ou campo_negrito)."""
+
+    campo: str
+    valor: str
+    tipo: str
+
+    def para_dict(self) -> Dict:
+        return {"campo": self.campo, "valor": self.valor, "tipo": self.tipo}
+
+    @classmethod
+    def de_dict(cls, dados: Dict) -> "Campo":
+        return cls(dados["campo"], dados["valor"], dados["tipo"])
+
+
+@dataclass(slots=True)
+class Elemento:
+    """Elemento especial (assinatura ou data) e sua posição no texto da página."""
+
+    texto: str
+    posicao: int
+
+    def para_dict(self) -> Dict:
+        return {"texto": self.texto, "posicao": self.posicao}
+
+    @classmethod
+    def de_dict(cls, dados: Dict) -> "Elemento":
+        return cls(dados["texto"], dados["posicao"])
+
+
+@dataclass(slots=True)
+class Pagina:
+    """
+    Página processada pelo ExtratorPDFProjetos.
+
+    Registro compacto (sem __dict__): coleções são tuplas, que vazias não
+    alocam nada, e `metadados` guarda só os metadados do documento, o mesmo
+    objeto compartilhado por todas as páginas de uma extração; page_number
+    vem de `numero`. A serialização é explícita (para_dict/de_dict) e produz
+    o mesmo formato de dict usado no JSON de saída e no cache de páginas.
+    """
+
+    numero: int
+    conteudo_markdown: str
+    metadados: Dict
+    campos: Tuple[Campo, ...] = ()
+    assinaturas: Tuple[Elemento, ...] = ()
+    datas: Tuple[Elemento, ...] = ()
+    navegadores: Tuple[Navegador, ...] = ()
+    tipo_documento: Optional[str] = None
+    titulo_principal: Optional[str] = None
+    titulos: Tuple[Titulo, ...] = ()
+
+    def secoes(self) -> Dict[str, list]:
+        """Títulos agrupados por nível, na ordem em que os níveis aparecem."""
+        secoes = {}
+        for titulo in self.titulos:
+            secoes.setdefault(titulo.nivel, []).append(titulo.titulo)
+        return secoes
+
+    def para_dict(self) -> Dict:
+        """
+        Serializa a página no formato de dict da saída JSON.
+
+        Returns:
+            Dict com numero, conteudo_markdown, metadados, campos_estruturados,
+            elementos_especiais, navegadores_laterais e analise_projeto
+        """
+        metadados = dict(self.metadados)
+        if "page_count" in metadados:
+            metadados["page_number"] = self.numero
+        return {
+            "numero": self.numero,
+            "conteudo_markdown": self.conteudo_markdown,
+            "metadados": metadados,
+            "campos_estruturados": [campo.para_dict() for campo in self.campos],
+            "elementos_especiais": {
+                "assinaturas": [elemento.para_dict() for elemento in self.assinaturas],
+                "datas": [elemento.para_dict() for elemento in self.datas],
+                "texto_sem_hierarquia": [],
+            },
+            "navegadores_laterais": [nav.para_dict() for nav in self.navegadores],
+            "analise_projeto": {
+                "tipo_documento": self.tipo_documento,
+                "titulo_principal": self.titulo_principal,
+                "hierarquia_completa": [titulo.para_dict() for titulo in self.titulos],
+                "secoes": self.secoes(),
+                "campos_estruturados": [],
+            },
+        }
+
+    @classmethod
+    def de_dict(cls, dados: Dict) -> "Pagina":
+        """
+        Reconstrói uma página a partir de para_dict (JSON, NDJSON ou cache).
+
+        Args:
+            dados: Dict no formato de para_dict
+
+        Returns:
+            Pagina
+        """
+        metadados = dict(dados.get("metadados", {}))
+        metadados.pop("page_number", None)
+        elementos = dados.get("elementos_especiais", {})
+        analise = dados.get("analise_projeto", {})
+        return cls(
+            numero=dados["numero"],
+            conteudo_markdown=dados["conteudo_markdown"],
+            metadados=metadados,
+            campos=tuple(Campo.de_dict(c) for c in dados.get("campos_estruturados", ())),
+            assinaturas=tuple(Elemento.de_dict(e) for e in elementos.get("assinaturas", ())),
+            datas=tuple(Elemento.de_dict(e) for e in elementos.get("datas", ())),
+            navegadores=tuple(Navegador.de_dict(n) for n in dados.get("navegadores_laterais", ())),
+            tipo_documento=analise.get("tipo_documento"),
+            titulo_principal=analise.get("titulo_principal"),
+            titulos=tuple(Titulo.de_dict(t) for t in analise.get("hierarquia_completa", ())),
+        )
+
+
+def _abrir_pdf(origem: OrigemPDF) -> fitz.Document:
+    """Abre um PDF a partir de um caminho ou dos bytes do arquivo (sem tocar o disco)."""
+    if isinstance(origem, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=origem, filetype="pdf")
+    return fitz.open(origem)
+
+
+def _nome_origem(origem: OrigemPDF) -> str:
+    """Identificação textual da origem para metadados e logs."""
+    if isinstance(origem, (bytes, bytearray, memoryview)):
+        return ""
+    return str(origem)
+
+
+def _congelar(valor):
+    """Converte dicts/listas (recursivamente) em visões somente leitura e tuplas."""
+    if isinstance(valor, dict):
+        return MappingProxyType({k: _congelar(v) for k, v in valor.items()})
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(v) for v in valor)
+    return valor
+
+
+def _descongelar(valor):
+    """Inverso de `_congelar`, para serialização (MappingProxyType não é picklable nem JSON)."""
+    if isinstance(valor, MappingProxyType):
+        return {k: _descongelar(v) for k, v in valor.items()}
+    if isinstance(valor, tuple):
+        return [_descongelar(v) for v in valor]
+    return valor
+
+
+def _json_padrao(obj):
+    """
+    Serializador padrão do json.dump: registros (Pagina etc.) viram dict,
+    configuração congelada volta a dict, regex vira o padrão.
+    """
+    if isinstance(obj, (Pagina, Navegador, Titulo, Campo, Elemento)):
+        return obj.para_dict()
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    return getattr(obj, "pattern", str(obj))
+
+
+def _padrao_em_linha(pattern: str) -> str:
+    """
+    Adapta um padrão escrito para re.match sobre uma linha já sem espaços nas
+    pontas à varredura multilinha do texto inteiro, sem atravessar quebras:
+    o ^ inicial é removido (a varredura ancora no início da linha), \\s, \\W, \\D
+    e classes negadas deixam de casar "\\n" e $ tolera espaços no fim da linha.
+    """
+    if pattern.startswith('^'):
+        pattern = pattern[1:]
+    saida = []
+    em_classe = False
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\' and i + 1 < len(pattern):
+            par = pattern[i:i + 2]
+            if not em_classe and par in ('\\s', '\\W', '\\D'):
+                par = {'\\s': '[^\\S\\n]', '\\W': '[^\\w\\n]', '\\D': '[^\\d\\n]'}[par]
+            saida.append(par)
+            i += 2
+            continue
+        if em_classe:
+            if c == ']':
+                em_classe = False
+        elif c == '[':
+            em_classe = True
+            if pattern.startswith('[^', i):
+                saida.append('[^\\n')
+                i += 2
+                continue
+        elif c == '$':
+            c = '(?=[^\\S\\n]*$)'
+        saida.append(c)
+        i += 1
+    return ''.join(saida)
+
+
+def _tipo_linha(linha: str) -> str:
+    """Classifica uma linha de markdown para a normalização (estrutura nunca é mesclada)."""
+    conteudo = linha.strip()
+    if not conteudo:
+        return "vazia"
+    if conteudo.startswith(("```", "~~~")):
+        return "cerca"
+    if _RE_TITULO_MD.match(conteudo):
+        return "titulo"
+    if conteudo.startswith("|"):
+        return "tabela"
+    if _RE_REGRA_HORIZONTAL.match(conteudo):
+        return "regra"
+    if _RE_ITEM_LISTA.match(linha):
+        return "lista"
+    if conteudo.startswith(">"):
+        return "citacao"
+    if _RE_LINHA_NEGRITO.match(conteudo):
+        return "negrito"  # Linha inteira em negrito: título visual
+    return "texto"
+
+
+def _quebra_forcada(linha: str) -> bool:
+    """Quebra de linha explícita do markdown (dois espaços, barra invertida ou <br>)."""
+    return linha.endswith(("  ", "\\", "<br>"))
+
+
+# Pronomes átonos em ênclise/mesóclise ("reunir-se", "dizer-lhe", "fazê-lo", "fazem-no"):
+# o hífen é da grafia e não de hifenização, então é mantido
+_RE_PALAVRA_INICIAL = re.compile(r'[^\W\d_]+')
+_CLITICOS = frozenset(("se", "me", "te", "lhe", "lhes", "nos", "vos"))
+_CLITICOS_APOS_VOGAL_TONICA = frozenset(("lo", "la", "los", "las"))  # fazê-lo, amá-la
+_CLITICOS_APOS_NASAL = frozenset(("no", "na", "nas"))  # fazem-no, dão-na, põe-nas
+
+
+def _pronome_enclitico(anterior: str, seguinte: str) -> bool:
+    """"verbo-" seguido de pronome átono no início da linha seguinte."""
+    if not (len(anterior) > 1 and anterior[-1] == "-" and anterior[-2].isalpha()):
+        return False
+    palavra = _RE_PALAVRA_INICIAL.match(seguinte)
+    if palavra is None:
+        return False
+    pronome = palavra.group().lower()
+    final = anterior[:-1].lower()
+    if pronome in _CLITICOS:
+        return True
+    if pronome in _CLITICOS_APOS_VOGAL_TONICA:
+        return final[-1:] in "áéêíóô"
+    if pronome in _CLITICOS_APOS_NASAL:
+        return final.endswith(("m", "ão", "õe"))
+    return False
+
+
+def _hifenizada(anterior: str, seguinte: str) -> bool:
+    """Palavra partida no fim da linha: "pala-" seguida de "vra" (minúscula), exceto pronomes enclíticos."""
+    return (
+        len(anterior) > 1 and anterior[-1] == "-" and anterior[-2].isalpha()
+        and seguinte[:1].islower()
+        and not _pronome_enclitico(anterior, seguinte)
+    )
+
+
+def _sem_hifen_celula(match: re.Match) -> str:
+    """Substituição de _RE_HIFEN_CELULA: remove "-<br>", ou só o "<br>" antes de pronome enclítico."""
+    if _pronome_enclitico(match.string[:match.start()] + "-", match.string[match.end():]):
+        return "-"
+    return ""
+
+
+def _normalizar_linhas(
+    linhas: Iterable[str],
+    juntar_linhas: bool = True,
+    corrigir_hifens: bool = True,
+    normalizar_espacos: bool = True,
+) -> Iterator[str]:
+    """
+    Normaliza linhas de markdown em uma única passada (tempo linear, em streaming).
+    
+    Apenas linhas de texto corrido são unidas à linha anterior (parágrafo,
+    item de lista ou citação); títulos, tabelas, regras, linhas em negrito e
+    blocos de código delimitam parágrafos e são mantidos em linhas próprias.
+    
+    Args:
+        linhas: Linhas do texto, sem o "\n" final
+        juntar_linhas: Une linhas quebradas do mesmo parágrafo (merge_lines)
+        corrigir_hifens: Desfaz a hifenização de fim de linha (fix_hyphenation),
+                         inclusive em quebras <br> dentro de células de tabela
+        normalizar_espacos: Colapsa espaços repetidos, remove espaços finais e
+                            linhas vazias consecutivas (normalize_spaces)
+        
+    Yields:
+        Linhas normalizadas
+    """
+    partes = []  # Parágrafo em aberto, montado sem concatenações repetidas
+    aberto = False  # O parágrafo em aberto aceita continuação
+    em_codigo = False
+    vazia_anterior = False
+    
+    for linha in linhas:
+        if em_codigo:
+            yield linha
+            em_codigo = not linha.strip().startswith(("```", "~~~"))
+            continue
+        
+        tipo = _tipo_linha(linha)
+        forcada = _quebra_forcada(linha)
+        # isprintable() é falso para tabulações, espaços não separáveis e afins
+        if normalizar_espacos and tipo != "cerca" and (
+            "  " in linha or linha.endswith(" ") or not linha.isprintable()
+        ):
+            recuo = linha[:len(linha) - len(linha.lstrip())]
+            linha = recuo + " ".join(linha.split())
+        
+        if tipo == "vazia":
+            if partes:
+                yield "".join(partes)
+                partes, aberto = [], False
+            if not (normalizar_espacos and vazia_anterior):
+                yield linha
+            vazia_anterior = True
+            continue
+        vazia_anterior = False
+        
+        if tipo == "texto" and aberto:
+            continuacao = linha.lstrip()
+            if corrigir_hifens and _hifenizada(partes[-1].rstrip(), continuacao):
+                partes[-1] = partes[-1].rstrip()[:-1]
+                partes.append(continuacao)
+                aberto = not forcada
+                continue
+            if corrigir_hifens and _pronome_enclitico(partes[-1].rstrip(), continuacao):
+                # "reunir-" + "se": mantém o hífen, sem espaço
+                partes[-1] = partes[-1].rstrip()
+                partes.append(continuacao)
+                aberto = not forcada
+                continue
+            if juntar_linhas:
+                partes.append(" ")
+                partes.append(continuacao)
+                aberto = not forcada
+                continue
+        
+        if partes:
+            yield "".join(partes)
+            partes, aberto = [], False
+        
+        if tipo in ("texto", "lista", "citacao"):
+            partes.append(linha)
+            aberto = not forcada
+        elif tipo == "tabela" and corrigir_hifens:
+            yield _RE_HIFEN_CELULA.sub(_sem_hifen_celula, linha)
+        else:
+            em_codigo = tipo == "cerca"
+            yield linha
+    
+    if partes:
+        yield "".join(partes)
+
 class ExtratorPDFProjetos:
     """Extrator de PDF otimizado para documentos de projetos com hierarquia avançada e suporte a layouts complexos."""
     
-    def __init__(self, margens: Dict[str, float] = None):
+    def __init__(self, margens: Dict[str, float] = None, cache_paginas=None, modo: str = "fidelidade"):
         """
         Inicializa o extrator com configurações personalizadas.
         
         Args:
             margens: Dicionário com margens normalizadas (0-1)
                     Ex: {"superior": 0.05, "inferior": 0.95}
+            cache_paginas: Cache (interface obter/salvar, ex.: CacheExtracao) para
+                    reaproveitar páginas já processadas em versões revisadas do PDF
+            modo: "fidelidade" (PyMuPDF4LLM, com detecção de tabelas) ou
+                  "rapido" (markdown montado direto dos spans do fitz, para
+                  documentos simples de uma coluna gerados digitalmente)
         """
+        if modo not in MODOS_EXTRACAO:
+            raise ValueError(f"Modo de extração inválido: {modo!r}. Use um de {MODOS_EXTRACAO}.")
+        self.modo = modo
+        self.cache_paginas = cache_paginas
+        
         self.margens = margens or {
             "superior": 0.08,
             "inferior": 0.92,
@@ -319,13 +797,25 @@ class ExtratorPDFProjetos:
             'detect_columns': True,  # Detectar texto em colunas
             'preserve_formatting': True,  # Preservar formatação (negrito, itálico)
             'extract_footnotes': True,  # Extrair notas de rodapé
-            'clean_headers_footers': False,  # Manter cabeçalhos/rodapés
+            'clean_headers_footers': False,  # Remover cabeçalhos/rodapés repetidos entre páginas
+            'linhas_borda_cabecalho': 3,  # Linhas não vazias do topo/base de cada página comparadas
+            'frequencia_cabecalho': 0.6,  # Fração mínima de páginas em que a linha deve se repetir
+            'processos': 1,  # Processos paralelos na extração (1 = sequencial)
+            'paginas_min_por_fatia': 4,  # Evita fatias pequenas demais para compensar o custo do processo
+            'paginas_por_lote': 1,  # Páginas por chamada ao PyMuPDF4LLM no modo streaming (iter_paginas)
+            'baixa_memoria': False,  # Memória limitada: recorte por lote e páginas em NDJSON no disco
+            'previa_paginas': 3,  # Prévia: páginas iniciais sempre processadas
+            'previa_tempo_limite': 5.0,  # Prévia: orçamento de tempo (s) da varredura + extração
         }
         
         # Cache para otimização
         self._pattern_cache = {}
         self._compiled_patterns = {}
         
+        # Configuração congelada (instância compartilhada): ver congelar()
+        self._congelado = False
+        self._hash_config = None
+        
         # Pré-compilar padrões regex para performance
         self._compile_patterns()
 
@@ -350,16 +840,302 @@ class ExtratorPDFProjetos:
         # Compilar padrões de hierarquia que são regex
         for nivel, config in self.header_config.items():
             for pattern in config['patterns']:
-                if not isinstance(pattern, str) or pattern.startswith('^'):
+                if not isinstance(pattern, str):
+                    # Padrão já compilado: re.compile não aceita flags adicionais
+                    self._compiled_patterns[pattern] = pattern
+                elif pattern.startswith('^'):
                     if pattern not in self._compiled_patterns:
                         self._compiled_patterns[pattern] = re.compile(pattern, re.IGNORECASE)
+        
+        # Índice de classificação de títulos
+        self._construir_indice_titulos()
+        
+        # Varredura única de campos e elementos especiais
+        self._construir_varredura_campos()
+
+    # Atributos de configuração congelados por congelar()
+    _ATRIBUTOS_CONFIGURACAO = (
+        'margens', 'navegadores_laterais', 'ignore_patterns', 'header_config',
+        'field_config', 'special_patterns', 'special_elements',
+        'config_pymupdf4llm', 'processing_config',
+        '_pattern_cache', '_compiled_patterns', '_titulos_exatos', '_grupos_elementos',
+    )
+
+    def congelar(self) -> "ExtratorPDFProjetos":
+        """
+        Torna a configuração imutável para que a instância seja compartilhada entre chamadas.
+        
+        Os dicionários de configuração, padrões compilados e o índice de títulos
+        viram visões somente leitura (MappingProxyType/tuplas) e o hash da
+        configuração é calculado uma única vez. Como os métodos de extração só
+        leem a configuração e recebem o estado da requisição (tempos, escritor)
+        por parâmetro, a instância congelada pode ser usada por várias threads
+        ao mesmo tempo.
+        
+        Returns:
+            A própria instância, para encadeamento
+        """
+        if self._congelado:
+            return self
+        self._hash_config = self.hash_configuracao()
+        self._congelar_atributos()
+        self._congelado = True
+        return self
+
+    def _congelar_atributos(self):
+        for atributo in self._ATRIBUTOS_CONFIGURACAO:
+            setattr(self, atributo, _congelar(getattr(self, atributo)))
+
+    @property
+    def congelado(self) -> bool:
+        return self._congelado
+
+    def __getstate__(self):
+        # Extração paralela envia o extrator aos processos: MappingProxyType não é picklable
+        estado = self.__dict__.copy()
+        if self._congelado:
+            for atributo in self._ATRIBUTOS_CONFIGURACAO:
+                estado[atributo] = _descongelar(estado[atributo])
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        if self._congelado:
+            self._congelar_atributos()
+
+    def hash_configuracao(self) -> str:
+        """
+        Calcula um hash estável de tudo que influencia o resultado da extração.
+        
+        Usado como parte da chave de cache: configurações diferentes (ou outra
+        versão do pipeline/PyMuPDF4LLM) nunca compartilham entradas. Em uma
+        instância congelada o valor é calculado uma única vez.
+        
+        Returns:
+            SHA-256 hexadecimal da configuração
+        """
+        if self._hash_config is not None:
+            return self._hash_config
+        serializado = json.dumps(
+            self.configuracao(),
+            sort_keys=True,
+            ensure_ascii=False,
+            default=_json_padrao
+        )
+        return hashlib.sha256(serializado.encode("utf-8")).hexdigest()
+    
+    def configuracao(self) -> Dict:
+        """
+        Tudo que influencia o resultado da extração (a entrada de hash_configuracao).
+        
+        Returns:
+            Dict com versão do pipeline, modo, versão do PyMuPDF4LLM e configurações
+        """
+        return {
+            "versao": VERSAO_EXTRATOR,
+            "modo": self.modo,
+            "pymupdf4llm": getattr(pymupdf4llm, "__version__", ""),
+            "margens": self.margens,
+            "navegadores_laterais": self.navegadores_laterais,
+            "ignore_patterns": self.ignore_patterns,
+            "header_config": self.header_config,
+            "field_config": self.field_config,
+            "special_patterns": self.special_patterns,
+            "special_elements": self.special_elements,
+            "config_pymupdf4llm": self.config_pymupdf4llm,
+            "processing_config": {
+                k: v for k, v in self.processing_config.items() if k not in _CHAVES_EXECUCAO
+            },
+        }
+    
+    def salvar_configuracao(self, diretorio: Path) -> Path:
+        """
+        Grava a configuração em `configuracao-<hash>.json`, uma vez por configuração.
+        
+        As saídas JSON referenciam a configuração apenas por "hash_configuracao";
+        este arquivo (nomeado pelos 16 primeiros caracteres do hash) a resolve.
+        
+        Args:
+            diretorio: Diretório de destino
+            
+        Returns:
+            Caminho do arquivo de configuração
+        """
+        hash_config = self.hash_configuracao()
+        caminho = Path(diretorio) / f"configuracao-{hash_config[:16]}.json"
+        if not caminho.exists():
+            with open(caminho, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"hash_configuracao": hash_config, **self.configuracao()},
+                    f, ensure_ascii=False, indent=2, default=_json_padrao
+                )
+        return caminho
+
+    def _construir_indice_titulos(self):
+        """
+        Pré-computa o índice de classificação de títulos a partir de header_config.
+        
+        - Padrões string: dict {PADRÃO.upper(): nível}, mantendo o primeiro nível
+          em que o padrão aparece (mesma precedência h1 > h2 > h3 > h4 do laço original).
+        - Padrões regex (objetos compilados): uma única alternação, com um grupo
+          nomeado por nível na ordem h1..h4, usada com fullmatch.
+        
+        Deve ser chamado novamente se header_config for alterado após a inicialização
+        (o que não é possível em uma instância congelada).
+        """
+        self._titulos_exatos = {}
+        alternativas = []
+        
+        for nivel in _NIVEIS_HEADER:
+            regex_nivel = []
+            for pattern in self.header_config[nivel]['patterns']:
+                if isinstance(pattern, str):
+                    self._titulos_exatos.setdefault(pattern.upper(), nivel)
+                else:
+                    regex_nivel.append(self._regex_com_flags(pattern))
+            if regex_nivel:
+                alternativas.append(f"(?P<{nivel}>{'|'.join(regex_nivel)})")
+        
+        # Alternação em ordem: a primeira que casa a linha inteira define o nível
+        self._titulos_regex = re.compile('|'.join(alternativas)) if alternativas else None
+
+    @staticmethod
+    def _regex_com_flags(pattern) -> str:
+        """Converte um padrão compilado em grupo com flags inline, para uso em alternação."""
+        flags = ''.join(
+            letra for flag, letra in ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+            if pattern.flags & flag
+        )
+        return f"(?{flags}:{pattern.pattern})" if flags else f"(?:{pattern.pattern})"
+
+    def _nivel_titulo_exato(self, texto: str) -> Optional[str]:
+        """Nível do título por comparação exata (case insensitive) com os padrões string."""
+        return self._titulos_exatos.get(texto.upper())
+
+    def _nivel_titulo(self, texto: str) -> Optional[str]:
+        """Nível do título por comparação exata ou regex, respeitando a precedência h1..h4."""
+        nivel = self._titulos_exatos.get(texto.upper())
+        if self._titulos_regex is None or nivel == 'h1':
+            return nivel
+        
+        match = self._titulos_regex.fullmatch(texto)
+        if match and (nivel is None or match.lastgroup < nivel):
+            return match.lastgroup
+        return nivel
+
+    def _construir_ir_pagina(self, pagina) -> Dict:
+        """
+        Constrói a representação intermediária (IR) da página em uma única passada.
+        
+        O dicionário de spans do fitz é a etapa mais cara da extração, por isso é
+        gerado apenas uma vez por página e compartilhado por todos os classificadores
+        (navegadores laterais, rotação e texto da área principal).
+        
+        Args:
+            pagina: Página fitz
+            
+        Returns:
+            Dict com dimensões da página e lista plana de spans
+        """
+        # Sem TEXT_PRESERVE_IMAGES: blocos de imagem são descartados pelos classificadores
+        flags = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+        blocks = pagina.get_text("dict", flags=flags)
+        
+        spans = []
+        bboxes = []
+        transforms = []
+        for num_bloco, block in enumerate(blocks["blocks"]):
+            if block["type"] != 0:  # Apenas blocos de texto
+                continue
+            for num_linha, line in enumerate(block["lines"]):
+                for span in line["spans"]:
+                    matrix = span.get("transform")
+                    spans.append({
+                        "texto": span["text"],
+                        "fonte": span["font"],
+                        "bbox": span["bbox"],
+                        "transform": matrix,
+                        "font_size": span["size"],
+                        "flags": span["flags"],
+                        "bloco": num_bloco,
+                        "linha": num_linha,
+                    })
+                    bboxes.append(span["bbox"])
+                    # Só os termos de rotação da matriz interessam; NaN = sem matriz
+                    transforms.append((matrix[1], matrix[2]) if matrix is not None else (np.nan, np.nan))
+        
+        return {
+            "numero": pagina.number,
+            "largura": pagina.rect.width,
+            "altura": pagina.rect.height,
+            "spans": spans,
+            # Geometria em arrays (N x 4 e N x 2) para classificação em lote
+            "bboxes": np.array(bboxes, dtype=np.float64).reshape(-1, 4),
+            "transforms": np.array(transforms, dtype=np.float64).reshape(-1, 2),
+        }
+
+    @staticmethod
+    def _span_rotacionado(span: Dict) -> bool:
+        """Verifica se um span da IR está rotacionado (matriz ou proporção da bbox)."""
+        matrix = span["transform"]
+        if matrix is not None:
+            return abs(matrix[1]) > 0.9 or abs(matrix[2]) > 0.9
+        # Se altura é muito maior que largura, pode ser texto vertical
+        bbox = span["bbox"]
+        return (bbox[3] - bbox[1]) > 3 * (bbox[2] - bbox[0])
+
+    def _classificar_geometria(self, ir: Dict) -> Dict[str, np.ndarray]:
+        """
+        Classifica a geometria de todos os spans da página de uma vez (NumPy).
+        
+        Equivalente, span a span, ao teste de margem lateral e a `_span_rotacionado`.
+        O resultado fica memorizado na IR, que é compartilhada pelos classificadores.
+        
+        Args:
+            ir: Representação intermediária da página
+            
+        Returns:
+            Dict com máscaras booleanas "lateral", "rotacionado" e "principal"
+        """
+        mascaras = ir.get("mascaras")
+        if mascaras is not None:
+            return mascaras
+        
+        bboxes = ir["bboxes"]
+        transforms = ir["transforms"]
+        x0, y0, x1, y1 = bboxes[:, 0], bboxes[:, 1], bboxes[:, 2], bboxes[:, 3]
+        
+        lateral = x0 > ir["largura"] * self.navegadores_laterais['area_margem_direita']
+        # Com matriz: componentes de rotação; sem matriz: bbox muito mais alta que larga
+        rotacionado = np.where(
+            np.isnan(transforms[:, 0]),
+            (y1 - y0) > 3 * (x1 - x0),
+            (np.abs(transforms[:, 0]) > 0.9) | (np.abs(transforms[:, 1]) > 0.9),
+        )
+        
+        mascaras = {
+            "lateral": lateral,
+            "rotacionado": rotacionado,
+            "principal": ~(lateral | rotacionado),
+        }
+        ir["mascaras"] = mascaras
+        return mascaras
 
-    def _extrair_texto_completo_pagina(self, pagina):
+    def _identificar_navegador(self, texto: str, bbox) -> Optional[Navegador]:
+        """Retorna o navegador lateral correspondente ao texto, se houver."""
+        texto_upper = texto.upper()
+        for pattern in self.navegadores_laterais['patterns']:
+            if pattern in texto_upper:
+                return Navegador(pattern, texto, tuple(bbox))
+        return None
+
+    def _extrair_texto_completo_pagina(self, pagina, ir: Dict = None):
         """
         Extrai todo o texto da página, incluindo elementos rotacionados.
         
         Args:
             pagina: Página fitz
+            ir: Representação intermediária da página (construída se omitida)
             
         Returns:
             Dict com texto principal e elementos especiais
@@ -370,157 +1146,89 @@ class ExtratorPDFProjetos:
             "elementos_rotacionados": []
         }
         
-        # Extrair texto com informações detalhadas
-        blocks = pagina.get_text("dict")
-        largura_pagina = pagina.rect.width
-        
-        # Processar cada bloco
-        for block in blocks["blocks"]:
-            if block["type"] == 0:  # Bloco de texto
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        texto = span["text"].strip()
-                        if not texto:
-                            continue
-                            
-                        bbox = span["bbox"]
-                        
-                        # Verificar se é texto rotacionado ou lateral
-                        is_rotacionado = False
-                        is_lateral = bbox[0] > largura_pagina * self.navegadores_laterais['area_margem_direita']
-                        
-                        # Verificar rotação
-                        if "transform" in span:
-                            matrix = span["transform"]
-                            if abs(matrix[1]) > 0.9 or abs(matrix[2]) > 0.9:
-                                is_rotacionado = True
-                        else:
-                            # Verificar pela proporção da bbox
-                            if (bbox[3] - bbox[1]) > 3 * (bbox[2] - bbox[0]):
-                                is_rotacionado = True
-                        
-                        # Classificar e armazenar o texto
-                        if is_lateral or is_rotacionado:
-                            # Verificar se é um navegador conhecido
-                            is_navegador = False
-                            for pattern in self.navegadores_laterais['patterns']:
-                                if pattern in texto.upper():
-                                    resultado["navegadores_laterais"].append({
-                                        "secao": pattern,
-                                        "texto": texto,
-                                        "posicao": bbox,
-                                        "tipo": "navegador_lateral"
-                                    })
-                                    is_navegador = True
-                                    break
-                            
-                            if not is_navegador and is_rotacionado:
-                                resultado["elementos_rotacionados"].append({
-                                    "texto": texto,
-                                    "bbox": bbox,
-                                    "rotacao": True
-                                })
-                        else:
-                            # Texto normal - adicionar ao texto principal
-                            resultado["texto_principal"] += texto + " "
+        if ir is None:
+            ir = self._construir_ir_pagina(pagina)
+        spans = ir["spans"]
+        mascaras = self._classificar_geometria(ir)
+        rotacionados = mascaras["rotacionado"]
+        
+        # Texto normal - área principal, na ordem dos spans
+        textos = (spans[i]["texto"].strip() for i in np.flatnonzero(mascaras["principal"]))
+        resultado["texto_principal"] = "".join(texto + " " for texto in textos if texto)
+        
+        # Texto rotacionado ou lateral
+        for i in np.flatnonzero(~mascaras["principal"]):
+            texto = spans[i]["texto"].strip()
+            if not texto:
+                continue
+            bbox = spans[i]["bbox"]
+            # Verificar se é um navegador conhecido
+            navegador = self._identificar_navegador(texto, bbox)
+            if navegador:
+                resultado["navegadores_laterais"].append(navegador)
+            elif rotacionados[i]:
+                resultado["elementos_rotacionados"].append({
+                    "texto": texto,
+                    "bbox": bbox,
+                    "rotacao": True
+                })
         
         return resultado
 
-    def _detectar_texto_rotacionado(self, pagina_fitz):
+    def _detectar_texto_rotacionado(self, pagina_fitz, ir: Dict = None):
         """
         Detecta blocos de texto rotacionado em 90 graus na página.
         
         Args:
             pagina_fitz: Objeto página do fitz
+            ir: Representação intermediária da página (construída se omitida)
             
         Returns:
             Lista de blocos de texto rotacionado
         """
-        blocos_rotacionados = []
-        
-        # Extrair blocos de texto com informações de rotação
-        blocks = pagina_fitz.get_text("dict")
-        
-        for block in blocks["blocks"]:
-            if block["type"] == 0:  # Bloco de texto
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        # Verificar se o texto está rotacionado
-                        if "transform" in span:
-                            matrix = span["transform"]
-                            # Detectar rotação de 90 graus (texto vertical)
-                            if abs(matrix[1]) > 0.9 or abs(matrix[2]) > 0.9:
-                                blocos_rotacionados.append({
-                                    "texto": span["text"],
-                                    "bbox": span["bbox"],
-                                    "font_size": span["size"],
-                                    "rotacao": True
-                                })
-                        # Alternativa: verificar pela orientação da bbox
-                        else:
-                            bbox = span["bbox"]
-                            # Se altura é muito maior que largura, pode ser texto vertical
-                            if (bbox[3] - bbox[1]) > 3 * (bbox[2] - bbox[0]):
-                                blocos_rotacionados.append({
-                                    "texto": span["text"],
-                                    "bbox": bbox,
-                                    "font_size": span["size"],
-                                    "rotacao": True
-                                })
-        
-        return blocos_rotacionados
+        if ir is None:
+            ir = self._construir_ir_pagina(pagina_fitz)
+        spans = ir["spans"]
+        
+        return [
+            {
+                "texto": spans[i]["texto"],
+                "bbox": spans[i]["bbox"],
+                "font_size": spans[i]["font_size"],
+                "rotacao": True
+            }
+            for i in np.flatnonzero(self._classificar_geometria(ir)["rotacionado"])
+        ]
 
-    def _processar_navegadores_laterais(self, pagina, textos_rotacionados):
+    def _processar_navegadores_laterais(self, pagina, textos_rotacionados, ir: Dict = None):
         """
         Identifica e processa navegadores de seção laterais.
         
         Args:
             pagina: Página fitz
             textos_rotacionados: Lista de textos rotacionados detectados
+            ir: Representação intermediária da página (construída se omitida)
             
         Returns:
             Lista de navegadores identificados
         """
         navegadores = []
-        largura_pagina = pagina.rect.width
         
-        # Processar todos os textos da página
-        all_text = pagina.get_text("dict")
+        if ir is None:
+            ir = self._construir_ir_pagina(pagina)
+        spans = ir["spans"]
         
-        for block in all_text["blocks"]:
-            if block["type"] == 0:  # Bloco de texto
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        texto = span["text"].strip()
-                        bbox = span["bbox"]
-                        
-                        # Verificar se está na margem direita
-                        if bbox[0] > largura_pagina * self.navegadores_laterais['area_margem_direita']:
-                            # Verificar se é um navegador conhecido
-                            for pattern in self.navegadores_laterais['patterns']:
-                                if pattern in texto.upper():
-                                    navegadores.append({
-                                        "secao": pattern,
-                                        "texto": texto,
-                                        "posicao": bbox,
-                                        "tipo": "navegador_lateral"
-                                    })
-                                    break
+        # Spans na margem direita
+        for i in np.flatnonzero(self._classificar_geometria(ir)["lateral"]):
+            navegador = self._identificar_navegador(spans[i]["texto"].strip(), spans[i]["bbox"])
+            if navegador:
+                navegadores.append(navegador)
         
         # Adicionar textos rotacionados que são navegadores
         for texto_rot in textos_rotacionados:
-            texto_limpo = texto_rot["texto"].strip()
-            
-            # Verificar se é um navegador conhecido
-            for pattern in self.navegadores_laterais['patterns']:
-                if pattern in texto_limpo.upper():
-                    navegadores.append({
-                        "secao": pattern,
-                        "texto": texto_limpo,
-                        "posicao": texto_rot["bbox"],
-                        "tipo": "navegador_lateral"
-                    })
-                    break
+            navegador = self._identificar_navegador(texto_rot["texto"].strip(), texto_rot["bbox"])
+            if navegador:
+                navegadores.append(navegador)
         
         return navegadores
 
@@ -549,8 +1257,8 @@ class ExtratorPDFProjetos:
         if navegadores:
             margem_direita_max = largura
             for nav in navegadores:
-                if nav["posicao"][0] < margem_direita_max:
-                    margem_direita_max = nav["posicao"][0] - 10  # 10px de buffer
+                if nav.posicao[0] < margem_direita_max:
+                    margem_direita_max = nav.posicao[0] - 10  # 10px de buffer
             
             area_util.x1 = margem_direita_max
         
@@ -613,51 +1321,242 @@ class ExtratorPDFProjetos:
         
         return False
     
-    def extrair_com_margens_controladas(self, caminho_pdf: Path) -> List[Dict]:
+    def extrair_com_margens_controladas(
+        self,
+        caminho_pdf: OrigemPDF,
+        tempos: Dict[str, float] = None,
+        intervalo: Optional[Tuple[int, int]] = None,
+    ) -> List[Pagina]:
         """
         Usa fitz para cortar margens e PyMuPDF4LLM com hierarquia customizada.
         Versão modificada que detecta elementos rotacionados e navegadores laterais.
         
+        O PDF é aberto uma única vez: para cada página a IR de spans é construída,
+        os navegadores são classificados e a área útil é copiada para o novo documento.
+        
         Args:
-            caminho_pdf: Caminho do PDF
+            caminho_pdf: Caminho do PDF ou bytes do arquivo em memória
+            tempos: Dict opcional que recebe o tempo (s) gasto em cada etapa
+            intervalo: Faixa de páginas (início, fim) com base 0 e fim exclusivo.
+                      Se None, processa o documento inteiro.
             
         Returns:
             Lista de chunks de página processados
         """
-        paginas_processadas = []
-        navegadores_por_pagina = {}  # Mapear navegadores por número de página
+        if tempos is None:
+            tempos = {}
+        
+        try:
+            # Um único lote: PyMuPDF4LLM converte a faixa inteira de uma vez
+            paginas_processadas = list(
+                self._iter_paginas(caminho_pdf, tempos, intervalo, paginas_por_lote=0)
+            )
+            logger.info("Tempos por etapa: " + ", ".join(f"{k}={v:.3f}s" for k, v in tempos.items()))
+            return paginas_processadas
+            
+        except Exception as e:
+            logger.error(f"Erro na extração: {e}")
+            raise
+    
+    def iter_paginas(
+        self,
+        caminho_pdf: OrigemPDF,
+        tempos: Dict[str, float] = None,
+        paginas_por_lote: Optional[int] = None,
+        baixa_memoria: Optional[bool] = None,
+        paginas: Optional[Iterable[int]] = None,
+    ) -> Iterator[Pagina]:
+        """
+        Gera cada página processada assim que ela fica pronta.
         
-        # Primeiro, extrair navegadores de todas as páginas
-        with fitz.open(caminho_pdf) as doc_original:
-            for num_pagina, pagina in enumerate(doc_original):
-                # Extrair texto completo incluindo elementos laterais
-                texto_completo = self._extrair_texto_completo_pagina(pagina)
-                navegadores_por_pagina[num_pagina] = texto_completo["navegadores_laterais"]
-                logger.info(f"Página {num_pagina + 1}: {len(texto_completo['navegadores_laterais'])} navegadores encontrados")
+        Mesmo pipeline de extrair_com_margens_controladas, mas o PyMuPDF4LLM é
+        executado em lotes pequenos e nenhuma página processada é acumulada:
+        o consumidor recebe a primeira página sem esperar o documento inteiro.
         
-        # Criar PDF temporário com margens cortadas
-        pdf_temp = Path("data/temp/temp_margins.pdf")
-        pdf_temp.parent.mkdir(parents=True, exist_ok=True)
+        Args:
+            caminho_pdf: Caminho do PDF ou bytes do arquivo em memória
+            tempos: Dict opcional que recebe o tempo (s) gasto em cada etapa
+            paginas_por_lote: Páginas por chamada ao PyMuPDF4LLM
+                             (padrão: processing_config['paginas_por_lote'])
+            baixa_memoria: Recorta e converte cada lote em um documento próprio,
+                          descartado em seguida, em vez de um único documento
+                          recortado com todas as páginas (que cresce com o PDF).
+                          Padrão: processing_config['baixa_memoria']
+            paginas: Índices (base 0) das páginas a processar; None = todas
+            
+        Yields:
+            Pagina processada (mesmo formato de extrair_com_margens_controladas)
+        """
+        if paginas_por_lote is None:
+            paginas_por_lote = self.processing_config.get('paginas_por_lote', 1)
+        if baixa_memoria is None:
+            baixa_memoria = self.processing_config.get('baixa_memoria', False)
+        yield from self._iter_paginas(
+            caminho_pdf, tempos, None, max(1, paginas_por_lote),
+            recorte_por_lote=baixa_memoria, selecao=paginas
+        )
+    
+    def _iter_paginas(
+        self,
+        caminho_pdf: OrigemPDF,
+        tempos: Optional[Dict[str, float]],
+        intervalo: Optional[Tuple[int, int]],
+        paginas_por_lote: int,
+        recorte_por_lote: bool = False,
+        selecao: Optional[Iterable[int]] = None,
+    ) -> Iterator[Pagina]:
+        """
+        Núcleo da extração: recorte em memória e conversão em lotes.
         
-        try:
-            # Abrir documento original novamente
-            with fitz.open(caminho_pdf) as doc_original:
-                # Criar novo documento com margens aplicadas
-                doc_novo = fitz.open()
+        Args:
+            caminho_pdf: Caminho do PDF ou bytes do arquivo em memória
+            tempos: Dict que recebe o tempo (s) gasto em cada etapa
+            intervalo: Faixa de páginas (início, fim) ou None para o documento inteiro
+            paginas_por_lote: Páginas por chamada ao PyMuPDF4LLM (0 = faixa inteira)
+            recorte_por_lote: Cada lote de paginas_por_lote páginas é recortado em
+                             um documento próprio, convertido e fechado antes do
+                             próximo (memória constante; os níveis de título da API
+                             clássica passam a ser calculados por lote)
+            selecao: Índices (base 0) das páginas a processar, em vez do intervalo;
+                    geradas na ordem do documento
+            
+        Yields:
+            Pagina processada
+        """
+        if tempos is None:
+            tempos = {}
+        for etapa in ("ir_paginas", "classificacao", "recorte_margens", "pymupdf4llm", "pos_processamento"):
+            tempos.setdefault(etapa, 0.0)
+        navegadores_por_pagina = {}  # Mapear navegadores por número de página
+        chaves_paginas = {}  # Chave de cache de cada página recortada
+        em_cache = {}  # Páginas reaproveitadas do cache, por índice original
+        originais = []  # Índice original de cada página de doc_novo
+        compartilhados = {}  # Metadados de documento comuns às páginas
+        hash_config = self.hash_configuracao() if self.cache_paginas is not None else None
+        
+        def reaproveitadas_ate(limite: int) -> Iterator[Pagina]:
+            # Páginas do cache que precedem `limite`, na ordem do documento
+            for num in sorted(k for k in em_cache if k < limite):
+                yield self._reaproveitar_pagina(
+                    em_cache.pop(num), num, caminho_pdf, total_paginas, compartilhados
+                )
+        
+        def converter(doc_recortado, originais: List[int], por_lote: int) -> Iterator[Pagina]:
+            # Usar PyMuPDF4LLM diretamente no documento em memória
+            # (sem arquivo temporário: extrações concorrentes não colidem)
+            total_recortado = doc_recortado.page_count
+            opcoes = dict(self.config_pymupdf4llm)
+            if total_recortado == 0:
+                lotes = []
+            elif por_lote <= 0:
+                lotes = [None]
+            else:
+                lotes = [
+                    list(range(k, min(k + por_lote, total_recortado)))
+                    for k in range(0, total_recortado, por_lote)
+                ]
+                # Níveis de título calculados sobre o documento inteiro, para que a
+                # conversão em lotes produza os mesmos headers (API clássica)
+                identificar_headers = getattr(pymupdf4llm, "IdentifyHeaders", None)
+                if identificar_headers is not None and len(lotes) > 1:
+                    opcoes["hdr_info"] = identificar_headers(doc_recortado)
+            
+            for lote in lotes:
+                t0 = time.perf_counter()
+                resultado = pymupdf4llm.to_markdown(doc_recortado, pages=lote, **opcoes)
+                tempos["pymupdf4llm"] += time.perf_counter() - t0
                 
-                for num_pagina, pagina in enumerate(doc_original):
-                    # Recuperar navegadores já detectados
-                    navegadores = navegadores_por_pagina.get(num_pagina, [])
+                # Processar cada chunk de página
+                for posicao, chunk in enumerate(resultado):
+                    num_pagina = originais[lote[posicao] if lote is not None else posicao]
+                    yield from reaproveitadas_ate(num_pagina)
                     
+                    t0 = time.perf_counter()
+                    pagina_info = self._processar_chunk_pagina(
+                        chunk,
+                        num_pagina,
+                        navegadores_por_pagina.pop(num_pagina - inicio, []),
+                        caminho_pdf,
+                        total_paginas,
+                        compartilhados
+                    )
+                    tempos["pos_processamento"] += time.perf_counter() - t0
+                    if num_pagina in chaves_paginas:
+                        self.cache_paginas.salvar(chaves_paginas.pop(num_pagina), pagina_info.para_dict())
+                    yield pagina_info
+        
+        # Documento com margens aplicadas, mantido apenas em memória
+        doc_novo = fitz.open()
+        try:
+            with _abrir_pdf(caminho_pdf) as doc_original:
+                total_paginas = doc_original.page_count
+                inicio, fim = intervalo or (0, total_paginas)
+                if selecao is None:
+                    numeros = range(inicio, fim)
+                else:
+                    numeros = sorted({n for n in selecao if inicio <= n < fim})
+            
+                for num_pagina in numeros:
+                    pagina = doc_original[num_pagina]
+                    # Construir a IR da página uma única vez
+                    t0 = time.perf_counter()
+                    ir = self._construir_ir_pagina(pagina)
+                    t1 = time.perf_counter()
+                    tempos["ir_paginas"] += t1 - t0
+                
+                    # Extrair texto completo incluindo elementos laterais
+                    texto_completo = self._extrair_texto_completo_pagina(pagina, ir)
+                    navegadores = texto_completo["navegadores_laterais"]
+                    navegadores_por_pagina[num_pagina - inicio] = navegadores
+                    logger.info(f"Página {num_pagina + 1}: {len(navegadores)} navegadores encontrados")
+                
                     # Definir área principal excluindo navegadores
                     area_principal = self._definir_area_principal(pagina, navegadores)
-                    
+                    t2 = time.perf_counter()
+                    tempos["classificacao"] += t2 - t1
+                
+                    # Página inalterada (mesmo conteúdo e mesmo recorte) já processada antes
+                    if hash_config is not None:
+                        chave = self._chave_pagina(pagina, ir, area_principal, hash_config)
+                        pagina_cache = self.cache_paginas.obter(chave)
+                        if pagina_cache is not None:
+                            if self.modo == "rapido":
+                                yield self._reaproveitar_pagina(
+                                    pagina_cache, num_pagina, caminho_pdf, total_paginas, compartilhados
+                                )
+                            else:
+                                em_cache[num_pagina] = pagina_cache
+                            continue
+                        chaves_paginas[num_pagina] = chave
+                
+                    if self.modo == "rapido":
+                        # Markdown montado direto da IR: sem recorte nem PyMuPDF4LLM
+                        chunk = {
+                            "text": self._markdown_rapido(ir, area_principal),
+                            "metadata": {
+                                **doc_original.metadata,
+                                "file_path": _nome_origem(caminho_pdf),
+                                "page_count": total_paginas,
+                                "page_number": num_pagina + 1,
+                            },
+                        }
+                        t0 = time.perf_counter()
+                        tempos["markdown_rapido"] = tempos.get("markdown_rapido", 0.0) + t0 - t2
+                        pagina_info = self._processar_chunk_pagina(
+                            chunk, num_pagina, navegadores, caminho_pdf, total_paginas, compartilhados
+                        )
+                        tempos["pos_processamento"] += time.perf_counter() - t0
+                        if num_pagina in chaves_paginas:
+                            self.cache_paginas.salvar(chaves_paginas[num_pagina], pagina_info.para_dict())
+                        yield pagina_info
+                        continue
+                
                     # Criar nova página apenas com área útil
                     nova_pagina = doc_novo.new_page(
                         width=area_principal.width,
                         height=area_principal.height
                     )
-                    
+                
                     # Copiar apenas conteúdo da área útil
                     nova_pagina.show_pdf_page(
                         nova_pagina.rect,
@@ -665,87 +1564,372 @@ class ExtratorPDFProjetos:
                         num_pagina,
                         clip=area_principal
                     )
+                    originais.append(num_pagina)
+                    tempos["recorte_margens"] += time.perf_counter() - t2
                 
-                # Salvar PDF temporário
-                doc_novo.save(pdf_temp)
-                doc_novo.close()
-            
-            # Usar PyMuPDF4LLM no PDF com margens cortadas
-            resultado = pymupdf4llm.to_markdown(
-                pdf_temp,
-                **self.config_pymupdf4llm
-            )
-            
-            # Processar cada chunk de página
-            for i, chunk in enumerate(resultado):
-                texto_original = chunk.get("text", "")
-                
-                # Recuperar navegadores da página original
-                navegadores = navegadores_por_pagina.get(i, [])
-                
-                # Adicionar navegadores como títulos H1 se encontrados
-                if navegadores:
-                    # Adicionar navegador como título no início do texto
-                    for nav in navegadores:
-                        titulo_navegador = f"# **{nav['secao']}**\n\n"
-                        # Adicionar o navegador como título no início do texto
-                        texto_original = titulo_navegador + texto_original
-                
-                # Aplicar pós-processamento hierárquico com contexto de navegadores
-                texto_processado = self._aplicar_hierarquia_customizada(
-                    texto_original, 
-                    navegadores
-                )
-                
-                pagina_info = {
-                    "numero": i + 1,
-                    "conteudo_markdown": texto_processado,
-                    "metadados": chunk.get("metadata", {}),
-                    "campos_estruturados": self._extrair_campos_estruturados(texto_processado),
-                    "elementos_especiais": self._processar_elementos_especiais(texto_processado),
-                    "navegadores_laterais": navegadores
-                }
-                
-                # Análise de projetos com hierarquia avançada
-                pagina_info["analise_projeto"] = self._analisar_conteudo_projeto(
-                    texto_processado
-                )
-                
-                paginas_processadas.append(pagina_info)
+                    # Lote completo: converte e descarta o documento recortado
+                    if recorte_por_lote and len(originais) >= paginas_por_lote:
+                        yield from converter(doc_novo, originais, 0)
+                        doc_novo.close()
+                        doc_novo = fitz.open()
+                        originais = []
             
-            return paginas_processadas
+                if hash_config is not None:
+                    logger.info(
+                        f"Cache de páginas: {len(em_cache)} reaproveitadas, "
+                        f"{len(originais)} a processar"
+                    )
             
-        except Exception as e:
-            logger.error(f"Erro na extração: {e}")
-            raise
+                yield from converter(doc_novo, originais, 0 if recorte_por_lote else paginas_por_lote)
+                yield from reaproveitadas_ate(fim)
         finally:
-            # Limpar arquivo temporário
-            if pdf_temp.exists():
-                pdf_temp.unlink()
+            doc_novo.close()
     
-    def _aplicar_hierarquia_customizada(self, texto: str, navegadores: List[Dict] = None) -> str:
+    def _markdown_rapido(self, ir: Dict, area_principal) -> str:
         """
-        Aplica hierarquia customizada ao texto baseado nas configurações.
-        Versão modificada que considera navegadores de seção.
+        Monta o markdown da área principal diretamente dos spans da IR (modo rápido).
+        
+        Os títulos são atribuídos pelas regras de fonte de header_config
+        (font_size_min, is_bold, is_uppercase), testando h1 a h3 nessa ordem;
+        h4 (itens de lista) é mantido como texto. Tabelas não são detectadas.
         
         Args:
-            texto: Texto original do PyMuPDF4LLM
-            navegadores: Lista de navegadores laterais detectados
+            ir: Representação intermediária da página
+            area_principal: Rect da área útil (margens e navegadores excluídos)
             
         Returns:
-            Texto com hierarquia ajustada
+            Markdown da página
         """
-        linhas = texto.split('\n')
-        linhas_processadas = []
-        secao_atual = None
+        # Spans com o centro dentro da área principal (teste em lote sobre as bboxes)
+        bboxes = ir["bboxes"]
+        centro_x = (bboxes[:, 0] + bboxes[:, 2]) / 2
+        centro_y = (bboxes[:, 1] + bboxes[:, 3]) / 2
+        dentro = (
+            (area_principal.x0 <= centro_x) & (centro_x <= area_principal.x1)
+            & (area_principal.y0 <= centro_y) & (centro_y <= area_principal.y1)
+        )
         
-        # Mapear navegadores para seções
+        # Agrupar spans por linha, mantendo a ordem de leitura do fitz
+        linhas = {}
+        spans = ir["spans"]
+        for i in np.flatnonzero(dentro):
+            span = spans[i]
+            linhas.setdefault((span["bloco"], span["linha"]), []).append(span)
+        
+        blocos = []
+        bloco_atual = None
+        partes = []
+        for (num_bloco, _), spans in linhas.items():
+            texto = "".join(span["texto"] for span in spans).strip()
+            if not texto:
+                continue
+            if num_bloco != bloco_atual:
+                if partes:
+                    blocos.append("\n".join(partes))
+                partes = []
+                bloco_atual = num_bloco
+            
+            visiveis = [span for span in spans if span["texto"].strip()]
+            negrito = all(span["flags"] & _FLAG_NEGRITO for span in visiveis)
+            tamanho = max(span["font_size"] for span in visiveis)
+            
+            nivel = self._nivel_por_fonte(texto, tamanho, negrito)
+            if nivel:
+                partes.append(f"{self._get_header_prefix(nivel)}**{texto}**")
+            elif negrito:
+                partes.append(f"**{texto}**")
+            else:
+                partes.append(texto)
+        if partes:
+            blocos.append("\n".join(partes))
+        
+        return "\n\n".join(blocos) + "\n" if blocos else ""
+    
+    def _nivel_por_fonte(self, texto: str, tamanho: float, negrito: bool) -> Optional[str]:
+        """Nível de título de uma linha pelas regras de fonte de header_config (h1 a h3)."""
+        if len(texto) > _MAX_CHARS_TITULO:
+            return None
+        for nivel in ('h1', 'h2', 'h3'):
+            config = self.header_config[nivel]
+            if tamanho < config.get('font_size_min', 0):
+                continue
+            if config.get('is_bold') and not negrito:
+                continue
+            if config.get('is_uppercase') and not texto.isupper():
+                continue
+            return nivel
+        return None
+    
+    def _chave_pagina(self, pagina, ir: Dict, area_principal, hash_config: str) -> str:
+        """
+        Calcula a chave de cache de uma página a partir do seu conteúdo e do recorte.
+        
+        Considera os content streams, as fontes usadas (sem os xrefs, que mudam
+        entre versões do arquivo), o texto, a fonte, o tamanho e a bbox de cada
+        span da IR, as dimensões e a área recortada. Os spans cobrem páginas que
+        desenham o texto por form XObjects (show_pdf_page, carimbos, junções de
+        arquivos), cujo content stream ("/Fm0 Do") não muda com o texto. Os níveis de
+        título do PyMuPDF4LLM usam estatísticas do documento inteiro, então uma
+        página reaproveitada pode diferir em nível de header de uma reconversão completa.
+        
+        Args:
+            pagina: Página fitz
+            ir: IR da página (_construir_ir_pagina)
+            area_principal: Rect da área útil
+            hash_config: Hash da configuração do extrator
+            
+        Returns:
+            Chave hexadecimal
+        """
+        h = hashlib.sha256(hash_config.encode("utf-8"))
+        h.update(pagina.read_contents())
+        for fonte in pagina.get_fonts():
+            h.update(repr(fonte[1:]).encode("utf-8"))
+        for span in ir["spans"]:
+            h.update(repr((span["texto"], span["fonte"], span["font_size"], span["flags"], span["bbox"])).encode("utf-8"))
+        h.update(repr((tuple(pagina.rect), tuple(area_principal))).encode("utf-8"))
+        return "pagina-" + h.hexdigest()
+    
+    def _reaproveitar_pagina(
+        self,
+        pagina_cache: Dict,
+        num_pagina: int,
+        caminho_pdf: OrigemPDF,
+        total_paginas: int,
+        compartilhados: Dict = None,
+    ) -> Pagina:
+        """
+        Ajusta uma página vinda do cache à posição que ocupa no documento atual.
+        
+        Args:
+            pagina_cache: Página processada recuperada do cache (formato de Pagina.para_dict)
+            num_pagina: Índice da página no documento atual (base 0)
+            caminho_pdf: Caminho (ou bytes) do PDF de origem
+            total_paginas: Total de páginas do documento atual
+            compartilhados: Metadados já usados na extração (ver _metadados_documento)
+            
+        Returns:
+            Pagina processada
+        """
+        pagina_info = Pagina.de_dict(pagina_cache)
+        pagina_info.numero = num_pagina + 1
+        pagina_info.metadados = self._metadados_documento(
+            pagina_info.metadados, caminho_pdf, total_paginas, compartilhados
+        )
+        return pagina_info
+    
+    @staticmethod
+    def _metadados_documento(
+        metadados: Dict,
+        caminho_pdf: OrigemPDF,
+        total_paginas: int,
+        compartilhados: Dict = None,
+    ) -> Dict:
+        """
+        Metadados de um chunk reduzidos aos do documento, compartilhados entre as páginas.
+        
+        O documento recortado existe só em memória (e pode ser uma fatia): o
+        file_path passa a referenciar o PDF de origem e page_count a numeração
+        global. page_number é descartado (Pagina.para_dict o recria a partir de
+        `numero`) e, sem ele, os metadados de todas as páginas costumam ser
+        iguais: o primeiro dict de cada conteúdo é reaproveitado pelos seguintes.
+        
+        Args:
+            metadados: Metadados do chunk (alterados no lugar)
+            caminho_pdf: Caminho (ou bytes) do PDF de origem
+            total_paginas: Total de páginas do documento original
+            compartilhados: Dicts já usados na extração, por conteúdo (None = não compartilhar)
+            
+        Returns:
+            Dict de metadados da página
+        """
+        if "file_path" in metadados:
+            metadados["file_path"] = _nome_origem(caminho_pdf)
+        if metadados.pop("page_number", None) is not None or "page_count" in metadados:
+            metadados["page_count"] = total_paginas
+        if compartilhados is None:
+            return metadados
+        try:
+            return compartilhados.setdefault(tuple(metadados.items()), metadados)
+        except TypeError:
+            # Valor não hashable: a página fica com a própria cópia
+            return metadados
+    
+    def _normalizar_texto(self, texto: str) -> str:
+        """
+        Aplica merge_lines, fix_hyphenation e normalize_spaces (conforme processing_config).
+        
+        Args:
+            texto: Markdown da página
+            
+        Returns:
+            Markdown normalizado (inalterado se as três opções estiverem desligadas)
+        """
+        juntar = self.processing_config.get('merge_lines', False)
+        hifens = self.processing_config.get('fix_hyphenation', False)
+        espacos = self.processing_config.get('normalize_spaces', False)
+        if not (juntar or hifens or espacos):
+            return texto
+        return "\n".join(_normalizar_linhas(texto.split("\n"), juntar, hifens, espacos))
+
+    def _processar_chunk_pagina(
+        self,
+        chunk: Dict,
+        num_pagina: int,
+        navegadores: List[Navegador],
+        caminho_pdf: OrigemPDF,
+        total_paginas: int,
+        compartilhados: Dict = None,
+    ) -> Pagina:
+        """
+        Aplica o pós-processamento hierárquico e as análises a um chunk do PyMuPDF4LLM.
+        
+        Args:
+            chunk: Chunk de página retornado pelo PyMuPDF4LLM
+            num_pagina: Índice da página no documento original (base 0)
+            navegadores: Navegadores laterais detectados na página
+            caminho_pdf: Caminho (ou bytes) do PDF de origem
+            total_paginas: Total de páginas do documento original
+            compartilhados: Metadados já usados na extração (ver _metadados_documento)
+            
+        Returns:
+            Pagina processada
+        """
+        texto_original = chunk.get("text", "")
+        
+        # Adicionar navegadores como títulos H1 se encontrados
+        if navegadores:
+            # Adicionar navegador como título no início do texto
+            for nav in navegadores:
+                titulo_navegador = f"# **{nav.secao}**\n\n"
+                # Adicionar o navegador como título no início do texto
+                texto_original = titulo_navegador + texto_original
+        
+        # Aplicar pós-processamento hierárquico com contexto de navegadores
+        texto_processado = self._aplicar_hierarquia_customizada(
+            texto_original, 
+            navegadores
+        )
+        # Campos, elementos e títulos sobre o texto normalizado: as posições
+        # gravadas indexam o conteudo_markdown armazenado
+        conteudo_markdown = self._normalizar_texto(texto_processado)
+        campos, elementos = self._extrair_campos_e_elementos(conteudo_markdown)
+        
+        # Análise de projetos com hierarquia avançada
+        tipo_documento, titulo_principal, titulos = self._analisar_conteudo_projeto(conteudo_markdown)
+        
+        return Pagina(
+            numero=num_pagina + 1,
+            conteudo_markdown=conteudo_markdown,
+            metadados=self._metadados_documento(
+                chunk.get("metadata", {}), caminho_pdf, total_paginas, compartilhados
+            ),
+            campos=campos,
+            assinaturas=elementos["assinaturas"],
+            datas=elementos["datas"],
+            navegadores=tuple(navegadores),
+            tipo_documento=tipo_documento,
+            titulo_principal=titulo_principal,
+            titulos=titulos,
+        )
+    
+    def extrair_com_margens_paralelo(
+        self,
+        caminho_pdf: OrigemPDF,
+        processos: Optional[int] = None,
+        tempos: Dict[str, float] = None,
+    ) -> List[Pagina]:
+        """
+        Divide o documento em fatias contíguas de páginas e processa cada uma com
+        extrair_com_margens_controladas em um ProcessPoolExecutor.
+        
+        As listas de páginas são concatenadas na ordem das fatias; como cada fatia
+        numera suas páginas a partir do próprio início, a numeração final é a mesma
+        da extração sequencial.
+        
+        Args:
+            caminho_pdf: Caminho do PDF ou bytes do arquivo em memória
+            processos: Número de processos (padrão: os.cpu_count())
+            tempos: Dict opcional que recebe a soma dos tempos de cada etapa
+            
+        Returns:
+            Lista de chunks de página processados, em ordem
+        """
+        if tempos is None:
+            tempos = {}
+        processos = processos or os.cpu_count() or 1
+        
+        with _abrir_pdf(caminho_pdf) as doc:
+            total_paginas = doc.page_count
+        
+        fatias = self._dividir_em_fatias(total_paginas, processos)
+        if len(fatias) <= 1:
+            return self.extrair_com_margens_controladas(caminho_pdf, tempos)
+        
+        logger.info(f"Extração paralela: {total_paginas} páginas em {len(fatias)} fatias")
+        t0 = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=len(fatias)) as executor:
+            futuros = [
+                executor.submit(_extrair_fatia, self, caminho_pdf, fatia)
+                for fatia in fatias
+            ]
+            # Resultados coletados na ordem de submissão (= ordem das páginas)
+            resultados = [futuro.result() for futuro in futuros]
+        
+        paginas_processadas = []
+        for paginas_fatia, tempos_fatia in resultados:
+            paginas_processadas.extend(paginas_fatia)
+            for etapa, valor in tempos_fatia.items():
+                tempos[etapa] = tempos.get(etapa, 0.0) + valor
+        tempos["paralelo_total"] = time.perf_counter() - t0
+        
+        return paginas_processadas
+    
+    def _dividir_em_fatias(self, total_paginas: int, processos: int) -> List[Tuple[int, int]]:
+        """
+        Divide o intervalo de páginas em até `processos` fatias contíguas e balanceadas.
+        
+        Args:
+            total_paginas: Número de páginas do documento
+            processos: Número máximo de fatias
+            
+        Returns:
+            Lista de tuplas (início, fim) com fim exclusivo
+        """
+        minimo = max(1, self.processing_config.get('paginas_min_por_fatia', 1))
+        n_fatias = max(1, min(processos, total_paginas // minimo))
+        tamanho, resto = divmod(total_paginas, n_fatias)
+        
+        fatias = []
+        inicio = 0
+        for k in range(n_fatias):
+            fim = inicio + tamanho + (1 if k < resto else 0)
+            fatias.append((inicio, fim))
+            inicio = fim
+        return fatias
+    
+    def _aplicar_hierarquia_customizada(self, texto: str, navegadores: List[Navegador] = None) -> str:
+        """
+        Aplica hierarquia customizada ao texto baseado nas configurações.
+        Versão modificada que considera navegadores de seção.
+        
+        Args:
+            texto: Texto original do PyMuPDF4LLM
+            navegadores: Lista de navegadores laterais detectados
+            
+        Returns:
+            Texto com hierarquia ajustada
+        """
+        linhas = texto.split('\n')
+        linhas_processadas = []
+        secao_atual = None
+        
+        # Mapear navegadores para seções
         if navegadores:
             secao_atual = self._identificar_secao_atual(texto, navegadores)
         
         for linha in linhas:
             linha_limpa = linha.strip()
-            nivel_aplicado = False
             
             # Se linha vazia, mantém
             if not linha_limpa:
@@ -753,34 +1937,21 @@ class ExtratorPDFProjetos:
                 continue
             
             # Verificar se a linha já tem marcação de header
-            match_header_existente = re.match(r'^(.*?)(#{1,4})\s*\*\*(.+?)\*\*\s*$', linha_limpa)
+            match_header_existente = _RE_HEADER_EXISTENTE.match(linha_limpa)
             if match_header_existente:
                 # Se já tem header, vamos verificar se deveria ter outro nível
                 texto_antes = match_header_existente.group(1).strip()
-                header_atual = match_header_existente.group(2)
                 texto_titulo = match_header_existente.group(3).strip()
                 
                 # Verificar se o título deveria ter um nível diferente
-                nivel_correto = None
-                for nivel in ['h1', 'h2', 'h3', 'h4']:
-                    config = self.header_config[nivel]
-                    for pattern in config['patterns']:
-                        if isinstance(pattern, str):
-                            if pattern.upper() == texto_titulo.upper():
-                                nivel_correto = nivel
-                                break
-                    if nivel_correto:
-                        break
+                nivel_correto = self._nivel_titulo_exato(texto_titulo)
                 
                 if nivel_correto:
                     header_prefix = self._get_header_prefix(nivel_correto)
                     if texto_antes:
                         # Se tem texto antes, colocar o título em nova linha
                         linhas_processadas.append(texto_antes)
-                        linhas_processadas.append(f"{header_prefix}**{texto_titulo}**")
-                    else:
-                        # Se não tem texto antes, aplicar o nível correto
-                        linhas_processadas.append(f"{header_prefix}**{texto_titulo}**")
+                    linhas_processadas.append(f"{header_prefix}**{texto_titulo}**")
                 else:
                     # Manter como está se não encontrou padrão
                     linhas_processadas.append(linha)
@@ -789,7 +1960,7 @@ class ExtratorPDFProjetos:
             # Verificar se tem título em negrito no meio ou fim da linha
             if "**" in linha_limpa:
                 # Procurar por títulos em negrito que podem estar no meio da linha
-                partes = re.split(r'(\*\*[^*]+\*\*)', linha_limpa)
+                partes = _RE_FRAGMENTO_NEGRITO.split(linha_limpa)
                 linha_reconstruida = []
                 
                 for parte in partes:
@@ -798,16 +1969,7 @@ class ExtratorPDFProjetos:
                         texto_sem_negrito = parte[2:-2].strip()
                         
                         # Verificar se é um título conhecido
-                        nivel_encontrado = None
-                        for nivel in ['h1', 'h2', 'h3', 'h4']:
-                            config = self.header_config[nivel]
-                            for pattern in config['patterns']:
-                                if isinstance(pattern, str):
-                                    if pattern.upper() == texto_sem_negrito.upper():
-                                        nivel_encontrado = nivel
-                                        break
-                            if nivel_encontrado:
-                                break
+                        nivel_encontrado = self._nivel_titulo_exato(texto_sem_negrito)
                         
                         if nivel_encontrado and len(linha_reconstruida) > 0:
                             # Se é um título e tem texto antes, quebrar linha
@@ -835,52 +1997,29 @@ class ExtratorPDFProjetos:
             texto_sem_negrito = linha_limpa
             
             # Padrão para detectar texto em negrito: **texto**
-            match_negrito = re.match(r'^\*\*(.+)\*\*$', linha_limpa)
+            match_negrito = _RE_LINHA_NEGRITO.match(linha_limpa)
             if match_negrito:
                 tem_negrito = True
                 texto_sem_negrito = match_negrito.group(1).strip()
             
             # Verifica se a linha (com ou sem negrito) é EXATAMENTE um dos padrões de título
-            nivel_aplicado = False
-            
-            # Verificar níveis na ordem correta
-            for nivel in ['h1', 'h2', 'h3', 'h4']:
-                config = self.header_config[nivel]
-                for pattern in config['patterns']:
-                    if isinstance(pattern, str):
-                        # Verifica se o texto (sem negrito) é EXATAMENTE igual ao padrão (case insensitive)
-                        if pattern.upper() == texto_sem_negrito.upper():
-                            # É um título isolado - aplica hierarquia
-                            header_prefix = self._get_header_prefix(nivel)
-                            # Mantém a formatação em negrito se houver
-                            if tem_negrito:
-                                linhas_processadas.append(f"{header_prefix}**{texto_sem_negrito}**")
-                            else:
-                                linhas_processadas.append(f"{header_prefix}{linha_limpa}")
-                            nivel_aplicado = True
-                            break
-                    else:  # regex
-                        # Para regex, verifica se corresponde à linha completa (sem negrito)
-                        if re.fullmatch(pattern, texto_sem_negrito):
-                            header_prefix = self._get_header_prefix(nivel)
-                            # Mantém a formatação em negrito se houver
-                            if tem_negrito:
-                                linhas_processadas.append(f"{header_prefix}**{texto_sem_negrito}**")
-                            else:
-                                linhas_processadas.append(f"{header_prefix}{linha_limpa}")
-                            nivel_aplicado = True
-                            break
-                
-                if nivel_aplicado:
-                    break
+            nivel = self._nivel_titulo(texto_sem_negrito)
             
-            # Se não aplicou nenhum nível, mantém a linha original
-            if not nivel_aplicado:
+            if nivel:
+                # É um título isolado - aplica hierarquia
+                header_prefix = self._get_header_prefix(nivel)
+                # Mantém a formatação em negrito se houver
+                if tem_negrito:
+                    linhas_processadas.append(f"{header_prefix}**{texto_sem_negrito}**")
+                else:
+                    linhas_processadas.append(f"{header_prefix}{linha_limpa}")
+            else:
+                # Se não aplicou nenhum nível, mantém a linha original
                 linhas_processadas.append(linha)
         
         return '\n'.join(linhas_processadas)
     
-    def _identificar_secao_atual(self, texto: str, navegadores: List[Dict]) -> Optional[str]:
+    def _identificar_secao_atual(self, texto: str, navegadores: List[Navegador]) -> Optional[str]:
         """
         Identifica qual seção do documento o texto atual pertence baseado nos navegadores.
         
@@ -893,8 +2032,8 @@ class ExtratorPDFProjetos:
         """
         # Implementação simplificada - pode ser expandida conforme necessário
         for nav in navegadores:
-            if nav["secao"] in texto.upper():
-                return nav["secao"]
+            if nav.secao in texto.upper():
+                return nav.secao
         return None
     
     def _get_header_prefix(self, nivel):
@@ -902,86 +2041,82 @@ class ExtratorPDFProjetos:
         prefixos = {'h1': '# ', 'h2': '## ', 'h3': '### ', 'h4': '#### '}
         return prefixos.get(nivel, '')
     
-    def _extrair_campos_estruturados(self, texto: str) -> List[Dict]:
+    def _construir_varredura_campos(self):
         """
-        Extrai campos estruturados baseado nas configurações.
-        
-        Args:
-            texto: Texto da página
-            
-        Returns:
-            Lista de campos estruturados
+        Compila a varredura única de campos estruturados e elementos especiais.
+        
+        Uma alternação multilinha com grupos nomeados:
+        - no início de cada linha (ignorando espaços e linhas de título "#"):
+          campo em negrito "**Campo:** valor" (se detect_bold_fields) e, em
+          seguida, qualquer um dos field_patterns. Só o rótulo é consumido; a
+          linha inteira é capturada por lookahead, de modo que datas e
+          assinaturas no valor continuam sendo encontradas;
+        - em qualquer posição: assinaturas (signatures) e datas (timestamps)
+          de special_elements, na ordem em que aparecem.
+        
+        Os field_patterns são adaptados por `_padrao_em_linha` para não
+        atravessar quebras de linha, preservando a semântica de re.match por linha.
         """
-        campos = []
-        
-        for linha in texto.split('\n'):
-            linha_limpa = linha.strip()
-            
-            # Pula linhas que são headers
-            if linha_limpa.startswith('#'):
-                continue
-            
-            # Verifica campos em negrito primeiro
-            if self.field_config['detect_bold_fields']:
-                match_bold = re.match(r'\*\*([^:]+):\*\*\s*(.+)', linha_limpa)
-                if match_bold:
-                    campos.append({
-                        "campo": match_bold.group(1).strip(),
-                        "valor": match_bold.group(2).strip(),
-                        "tipo": "campo_negrito"
-                    })
-                    continue
-            
-            # Verifica padrões de campos
-            for pattern in self.field_config['field_patterns']:
-                if re.match(pattern, linha_limpa):
-                    if self.field_config['field_separator'] in linha_limpa:
-                        campo, valor = linha_limpa.split(self.field_config['field_separator'], 1)
-                        campos.append({
-                            "campo": campo.strip(),
-                            "valor": valor.strip(),
-                            "tipo": "campo_estruturado"
-                        })
-                    break
-        
-        return campos
-    
-    def _processar_elementos_especiais(self, texto: str) -> Dict:
+        inicio_linha = []
+        if self.field_config['detect_bold_fields']:
+            # Equivale a re.match(r'\*\*([^:]+):\*\*\s*(.+)') na linha sem espaços nas pontas
+            inicio_linha.append(r'\*\*(?P<negrito>[^:\n]+):\*\*(?=(?P<valor_negrito>[^\n]*\S))')
+        if self.field_config['field_patterns']:
+            padroes = '|'.join(f"(?:{_padrao_em_linha(p)})" for p in self.field_config['field_patterns'])
+            inicio_linha.append(r'(?=(?P<linha_campo>[^\n]*))(?:' + padroes + ')')
+        
+        alternativas = []
+        if inicio_linha:
+            alternativas.append(r'^[^\S\n]*(?!#)(?:' + '|'.join(inicio_linha) + ')')
+        
+        # Elementos especiais roteados para a saída, por grupo nomeado
+        self._grupos_elementos = {}
+        for tipo, grupo, destino in (('signatures', 'assinatura', 'assinaturas'), ('timestamps', 'data', 'datas')):
+            config = self.special_elements.get(tipo)
+            if config:
+                alternativas.append(f"(?P<{grupo}>{config['pattern']})")
+                self._grupos_elementos[grupo] = destino
+        
+        self._varredura_campos = re.compile('|'.join(alternativas), re.MULTILINE) if alternativas else None
+
+    def _extrair_campos_e_elementos(self, texto: str) -> Tuple[Tuple[Campo, ...], Dict[str, Tuple[Elemento, ...]]]:
         """
-        Processa elementos especiais baseado nas configurações.
+        Extrai campos estruturados e elementos especiais em uma única passada (finditer).
         
         Args:
             texto: Texto da página
             
         Returns:
-            Dict com elementos especiais encontrados
+            Tupla (campos estruturados, dict de elementos especiais: assinaturas e datas)
         """
-        elementos = {
-            "assinaturas": [],
-            "datas": [],
-            "texto_sem_hierarquia": []  # Elementos que não receberam marcação hierárquica
-        }
-        
-        # Processa elementos especiais
-        for tipo, config in self.special_elements.items():
-            pattern = config['pattern']
-            matches = re.finditer(pattern, texto)
-            
-            for match in matches:
-                if tipo == 'signatures':
-                    elementos["assinaturas"].append({
-                        "texto": match.group(0),
-                        "posicao": match.start()
-                    })
-                elif tipo == 'timestamps':
-                    elementos["datas"].append({
-                        "texto": match.group(0),
-                        "posicao": match.start()
-                    })
+        campos = []
+        elementos = {"assinaturas": [], "datas": []}
+        if self._varredura_campos is None:
+            return (), {"assinaturas": (), "datas": ()}
+        
+        separador = self.field_config['field_separator']
+        for match in self._varredura_campos.finditer(texto):
+            grupos = match.groupdict()
+            if grupos.get('negrito') is not None:
+                campos.append(Campo(
+                    grupos['negrito'].strip(),
+                    grupos['valor_negrito'].strip(),
+                    "campo_negrito"
+                ))
+            elif grupos.get('linha_campo') is not None:
+                linha_limpa = grupos['linha_campo'].strip()
+                if separador in linha_limpa:
+                    campo, valor = linha_limpa.split(separador, 1)
+                    campos.append(Campo(campo.strip(), valor.strip(), "campo_estruturado"))
+            else:
+                for grupo, destino in self._grupos_elementos.items():
+                    if grupos[grupo] is not None:
+                        elementos[destino].append(Elemento(grupos[grupo], match.start(grupo)))
+                        break
         
-        return elementos
+        return tuple(campos), {destino: tuple(lista) for destino, lista in elementos.items()}
     
-    def _analisar_conteudo_projeto(self, texto: str) -> Dict:
+    def _analisar_conteudo_projeto(self, texto: str) -> Tuple[Optional[str], Optional[str], Tuple[Titulo, ...]]:
         """
         Analisa o conteúdo de projetos com hierarquia avançada.
         
@@ -989,54 +2124,50 @@ class ExtratorPDFProjetos:
             texto: Texto markdown a ser analisado
             
         Returns:
-            Dict com análise do conteúdo
-        """
-        analise = {
-            "tipo_documento": None,
-            "titulo_principal": None,
-            "hierarquia_completa": [],
-            "secoes": {},
-            "campos_estruturados": []
-        }
+            Tupla (tipo de documento, título principal, headers da página em ordem)
+        """
+        tipo_documento = None
+        titulo_principal = None
         
         # Identificar título principal (# Título)
         titulo_h1 = re.search(r'^#\s+([^#\n]+)$', texto, re.MULTILINE)
         if titulo_h1:
-            titulo = titulo_h1.group(1).strip()
+            titulo_principal = titulo_h1.group(1).strip()
             # Remove formatação markdown para análise
-            titulo_limpo = re.sub(r'\*\*(.+?)\*\*', r'\1', titulo)
-            analise["titulo_principal"] = titulo
+            titulo_limpo = re.sub(r'\*\*(.+?)\*\*', r'\1', titulo_principal)
             
             # Verificar tipo de documento
             for pattern in self.header_config['h1']['patterns']:
                 if pattern in titulo_limpo.upper():
-                    analise["tipo_documento"] = pattern.lower().replace(' ', '_')
+                    tipo_documento = pattern.lower().replace(' ', '_')
                     break
         
-        # Extrair hierarquia completa
-        headers = re.finditer(r'^(#+)\s+(.+)$', texto, re.MULTILINE)
-        for header in headers:
-            nivel_markdown = len(header.group(1))
-            titulo = header.group(2).strip()
-            
-            # Mapear para níveis h1-h4
-            nivel_hierarquico = f'h{nivel_markdown}'
-            
-            analise["hierarquia_completa"].append({
-                "nivel": nivel_hierarquico,
-                "nivel_markdown": nivel_markdown,
-                "titulo": titulo,
-                "posicao": header.start()
-            })
-            
-            # Organizar por seções
-            if nivel_hierarquico not in analise["secoes"]:
-                analise["secoes"][nivel_hierarquico] = []
-            analise["secoes"][nivel_hierarquico].append(titulo)
+        # Extrair hierarquia completa (níveis h1-h4 derivados do número de "#")
+        titulos = tuple(
+            Titulo(len(header.group(1)), header.group(2).strip(), header.start())
+            for header in re.finditer(r'^(#+)\s+(.+)$', texto, re.MULTILINE)
+        )
         
-        return analise
+        return tipo_documento, titulo_principal, titulos
     
-    def gerar_markdown_otimizado(self, paginas: List[Dict]) -> str:
+    def remover_cabecalhos_rodapes(self, paginas: List[Pagina]) -> Dict:
+        """
+        Remove do conteudo_markdown das páginas os cabeçalhos/rodapés repetidos.
+        
+        Args:
+            paginas: Lista de páginas processadas (alteradas no lugar)
+            
+        Returns:
+            Economia obtida (ver RemovedorCabecalhosRodapes.economia)
+        """
+        removedor = RemovedorCabecalhosRodapes(self)
+        for pagina in paginas:
+            removedor.registrar(pagina.conteudo_markdown.strip())
+        for pagina in paginas:
+            pagina.conteudo_markdown = removedor.limpar(pagina.conteudo_markdown.strip())
+        return removedor.economia()
+
+    def gerar_markdown_otimizado(self, paginas: List[Pagina]) -> str:
         """
         Gera markdown final com hierarquia preservada sem marcação de páginas.
         
@@ -1050,7 +2181,7 @@ class ExtratorPDFProjetos:
         
         for i, pagina in enumerate(paginas):
             # Conteúdo da página (já processado)
-            conteudo = pagina["conteudo_markdown"]
+            conteudo = pagina.conteudo_markdown
             markdown_parts.append(conteudo.strip())
             
             # Navegadores laterais já foram adicionados como títulos H1 no texto
@@ -1062,7 +2193,7 @@ class ExtratorPDFProjetos:
         
         return "".join(markdown_parts)
     
-    def gerar_indice_hierarquico(self, paginas: List[Dict], niveis_incluir: List[str] = None, incluir_navegadores: bool = True) -> str:
+    def gerar_indice_hierarquico(self, paginas: List[Pagina], niveis_incluir: List[str] = None, incluir_navegadores: bool = True) -> str:
         """
         Gera índice hierárquico baseado na estrutura detectada.
         
@@ -1075,37 +2206,68 @@ class ExtratorPDFProjetos:
         Returns:
             String com índice markdown
         """
-        indice = ["# Índice\n\n"]
-        
         # Se não especificado, inclui apenas h1
         if niveis_incluir is None:
             niveis_incluir = ['h1']
         
         # Coletar hierarquia dos níveis especificados
         hierarquia_filtrada = []
-        
         for pagina in paginas:
-            # Adicionar navegadores laterais primeiro (se houver)
-            if incluir_navegadores and pagina.get("navegadores_laterais"):
-                for nav in pagina["navegadores_laterais"]:
-                    hierarquia_filtrada.append({
-                        "nivel": "h1",
-                        "nivel_markdown": 1,
-                        "titulo": f"**{nav['secao']}**",
-                        "pagina": pagina["numero"],
-                        "tipo": "navegador_lateral"
-                    })
+            hierarquia_filtrada.extend(
+                self._itens_indice_pagina(pagina, niveis_incluir, incluir_navegadores)
+            )
+        
+        return self._formatar_indice(hierarquia_filtrada, niveis_incluir)
+    
+    def _itens_indice_pagina(self, pagina: Pagina, niveis_incluir: List[str], incluir_navegadores: bool = True) -> List[Dict]:
+        """
+        Coleta os itens do índice hierárquico de uma única página.
+        
+        Args:
+            pagina: Página processada
+            niveis_incluir: Lista dos níveis a incluir no índice
+            incluir_navegadores: Se True, inclui navegadores laterais
             
-            # Adicionar itens da hierarquia normal
-            analise = pagina.get("analise_projeto", {})
-            for item in analise.get("hierarquia_completa", []):
-                # Inclui apenas níveis especificados
-                if item["nivel"] in niveis_incluir:
-                    hierarquia_filtrada.append({
-                        **item,
-                        "pagina": pagina["numero"],
-                        "tipo": "normal"
-                    })
+        Returns:
+            Lista de itens do índice na ordem da página
+        """
+        itens = []
+        
+        # Adicionar navegadores laterais primeiro (se houver)
+        if incluir_navegadores:
+            for nav in pagina.navegadores:
+                itens.append({
+                    "nivel": "h1",
+                    "nivel_markdown": 1,
+                    "titulo": f"**{nav.secao}**",
+                    "pagina": pagina.numero,
+                    "tipo": Navegador.TIPO
+                })
+        
+        # Adicionar itens da hierarquia normal
+        for titulo in pagina.titulos:
+            # Inclui apenas níveis especificados
+            if titulo.nivel in niveis_incluir:
+                itens.append({
+                    **titulo.para_dict(),
+                    "pagina": pagina.numero,
+                    "tipo": "normal"
+                })
+        
+        return itens
+    
+    def _formatar_indice(self, hierarquia_filtrada: List[Dict], niveis_incluir: List[str]) -> str:
+        """
+        Formata os itens coletados como índice markdown.
+        
+        Args:
+            hierarquia_filtrada: Itens do índice em ordem
+            niveis_incluir: Lista dos níveis incluídos (define a indentação)
+            
+        Returns:
+            String com índice markdown
+        """
+        indice = ["# Índice\n\n"]
         
         # Organizar com indentação apropriada
         for item in hierarquia_filtrada:
@@ -1129,27 +2291,192 @@ class ExtratorPDFProjetos:
         
         return "".join(indice)
     
-    def extrair_completo(self, pdf_entrada: Path, saida_md: Path, saida_json: Path):
+    def extrair_previa(
+        self,
+        pdf_entrada: OrigemPDF,
+        paginas_iniciais: Optional[int] = None,
+        tempo_limite: Optional[float] = None,
+    ) -> Dict:
+        """
+        Prévia para triagem: primeiras páginas, início de cada seção e índice.
+        
+        Processa só as `paginas_iniciais` primeiras páginas e as páginas em que
+        começa uma seção dos navegadores laterais (navegador diferente do da
+        página anterior), com o mesmo pipeline de iter_paginas. A varredura dos
+        navegadores lê apenas o texto da faixa lateral de cada página. O prazo
+        vale para varredura + extração e é verificado a cada página: ao
+        esgotá-lo, a prévia é devolvida com o que foi processado e "completa"
+        = False.
+        
+        Args:
+            pdf_entrada: Caminho do PDF ou bytes do arquivo em memória
+            paginas_iniciais: Páginas iniciais (padrão: processing_config['previa_paginas'])
+            tempo_limite: Orçamento em segundos (padrão: processing_config['previa_tempo_limite'])
+            
+        Returns:
+            Dict com nome_projeto, indice (gerar_indice_hierarquico), markdown das
+            páginas iniciais, páginas selecionadas/processadas, completa, tempo e paginas
+        """
+        inicio = time.perf_counter()
+        if paginas_iniciais is None:
+            paginas_iniciais = self.processing_config.get('previa_paginas', 3)
+        if tempo_limite is None:
+            tempo_limite = self.processing_config.get('previa_tempo_limite', 5.0)
+        prazo = inicio + tempo_limite
+        
+        # Seleção: páginas iniciais + início de cada seção lateral
+        with _abrir_pdf(pdf_entrada) as doc:
+            total_paginas = doc.page_count
+            selecao = list(range(min(paginas_iniciais, total_paginas)))
+            varridas = 0
+            secoes_anteriores = ()
+            for num_pagina in range(total_paginas):
+                if time.perf_counter() >= prazo:
+                    break
+                secoes = self._secoes_laterais(doc[num_pagina])
+                if secoes and secoes != secoes_anteriores and num_pagina >= paginas_iniciais:
+                    selecao.append(num_pagina)
+                secoes_anteriores = secoes
+                varridas += 1
+        
+        # Extração página a página, até o fim da seleção ou do prazo
+        paginas = []
+        gerador = self.iter_paginas(pdf_entrada, {}, paginas_por_lote=1, baixa_memoria=True, paginas=selecao)
+        try:
+            for pagina in gerador:
+                paginas.append(pagina)
+                if time.perf_counter() >= prazo:
+                    break
+        finally:
+            gerador.close()
+        
+        completa = varridas == total_paginas and len(paginas) == len(selecao)
+        if not completa:
+            logger.info(
+                f"Prévia interrompida pelo prazo de {tempo_limite}s: "
+                f"{varridas}/{total_paginas} páginas varridas, {len(paginas)}/{len(selecao)} processadas"
+            )
+        
+        return {
+            "arquivo": _nome_origem(pdf_entrada),
+            "total_paginas": total_paginas,
+            "nome_projeto": self._nome_projeto(paginas),
+            "indice": self.gerar_indice_hierarquico(paginas, niveis_incluir=['h1'], incluir_navegadores=True),
+            "markdown": self.gerar_markdown_otimizado([p for p in paginas if p.numero <= paginas_iniciais]),
+            "paginas_selecionadas": [n + 1 for n in selecao],
+            "paginas_processadas": [p.numero for p in paginas],
+            "paginas_varridas": varridas,
+            "completa": completa,
+            "tempo_segundos": time.perf_counter() - inicio,
+            "paginas": paginas,
+        }
+    
+    def _secoes_laterais(self, pagina) -> Tuple[str, ...]:
+        """
+        Seções dos navegadores na faixa lateral da página (varredura rápida da prévia).
+        
+        Lê só as palavras à direita de area_margem_direita, linha a linha, sem
+        construir a IR da página; a detecção exata fica com o pipeline completo.
+        
+        Args:
+            pagina: Página fitz
+            
+        Returns:
+            Seções encontradas, na ordem de leitura
+        """
+        largura, altura = pagina.rect.width, pagina.rect.height
+        faixa = fitz.Rect(largura * self.navegadores_laterais['area_margem_direita'], 0, largura, altura)
+        linhas = {}
+        for palavra in pagina.get_text("words", clip=faixa):
+            linhas.setdefault((palavra[5], palavra[6]), []).append(palavra[4])
+        secoes = []
+        for palavras in linhas.values():
+            texto = " ".join(palavras).upper()
+            for pattern in self.navegadores_laterais['patterns']:
+                if pattern in texto and pattern not in secoes:
+                    secoes.append(pattern)
+        return tuple(secoes)
+    
+    @staticmethod
+    def _nome_projeto(paginas: List[Pagina]) -> Optional[str]:
+        """
+        Nome do projeto: campo estruturado (ver _CAMPOS_NOME_PROJETO) ou, se não
+        houver, a linha que segue o rótulo no markdown.
+        """
+        for nome_campo in _CAMPOS_NOME_PROJETO:
+            for pagina in paginas:
+                for campo in pagina.campos:
+                    if campo.campo.lower() == nome_campo and campo.valor:
+                        return campo.valor
+        for pagina in paginas:
+            rotulo = _RE_ROTULO_NOME_PROJETO.search(pagina.conteudo_markdown)
+            if rotulo:
+                for trecho in (rotulo.group("valor"), rotulo.group("seguinte")):
+                    # Sem marcação markdown nem separadores de células de tabela
+                    nome = " ".join(c.strip("#*_ ") for c in trecho.split("|") if c.strip("#*_ "))
+                    if nome:
+                        return nome
+        return None
+    
+    def extrair_completo(
+        self,
+        pdf_entrada: OrigemPDF,
+        saida_md: Optional[Path] = None,
+        saida_json: Optional[Path] = None,
+        processos: Optional[int] = None,
+        baixa_memoria: Optional[bool] = None,
+        saida_ndjson: Optional[Path] = None,
+    ):
         """
         Executa extração completa com hierarquia avançada para projetos.
         
+        O JSON referencia a configuração por "hash_configuracao"; ela é gravada
+        uma única vez ao lado dele (ver salvar_configuracao).
+        
         Args:
-            pdf_entrada: Caminho do PDF de entrada
-            saida_md: Caminho para salvar o Markdown
-            saida_json: Caminho para salvar estrutura JSON
+            pdf_entrada: Caminho do PDF de entrada ou bytes do arquivo em memória
+            saida_md: Caminho para salvar o Markdown (None = não salvar)
+            saida_json: Caminho para salvar estrutura JSON (None = não salvar)
+            processos: Processos paralelos (padrão: processing_config['processos'])
+            baixa_memoria: Modo de memória limitada para PDFs muito grandes
+                          (padrão: processing_config['baixa_memoria']); ver
+                          `_extrair_completo_baixa_memoria`
+            saida_ndjson: No modo de baixa memória, mantém as páginas (uma por
+                          linha, JSON) neste arquivo em vez de um temporário
             
         Returns:
-            Dict com dados completos da extração
+            Dict com dados completos da extração e o markdown final em "markdown".
+            No modo de baixa memória, apenas os dados de resumo (sem "paginas"
+            nem "markdown", que ficam somente nos arquivos de saída)
         """
-        logger.info(f"Iniciando extração de: {pdf_entrada}")
+        logger.info(f"Iniciando extração de: {_nome_origem(pdf_entrada) or '<bytes em memória>'}")
         
         # Garantir diretórios
-        saida_md.parent.mkdir(parents=True, exist_ok=True)
-        saida_json.parent.mkdir(parents=True, exist_ok=True)
+        for saida in (saida_md, saida_json, saida_ndjson):
+            if saida is not None:
+                saida.parent.mkdir(parents=True, exist_ok=True)
+        if saida_json is not None:
+            self.salvar_configuracao(saida_json.parent)
+        
+        if baixa_memoria is None:
+            baixa_memoria = self.processing_config.get('baixa_memoria', False)
         
         try:
+            if baixa_memoria:
+                return self._extrair_completo_baixa_memoria(pdf_entrada, saida_md, saida_json, saida_ndjson)
+            
             # Extração com margens controladas e hierarquia avançada
-            paginas_processadas = self.extrair_com_margens_controladas(pdf_entrada)
+            tempos_etapas = {}
+            processos = processos or self.processing_config.get('processos', 1)
+            if processos > 1:
+                paginas_processadas = self.extrair_com_margens_paralelo(pdf_entrada, processos, tempos_etapas)
+            else:
+                paginas_processadas = self.extrair_com_margens_controladas(pdf_entrada, tempos_etapas)
+            
+            # Remover cabeçalhos/rodapés repetidos entre páginas
+            limpeza = None
+            if self.processing_config.get('clean_headers_footers'):
+                limpeza = self.remover_cabecalhos_rodapes(paginas_processadas)
             
             # Gerar markdown final
             markdown_final = self.gerar_markdown_otimizado(paginas_processadas)
@@ -1165,61 +2492,174 @@ class ExtratorPDFProjetos:
             markdown_completo = indice + "\n---\n\n" + markdown_final
             
             # Salvar markdown
-            saida_md.write_text(markdown_completo, encoding="utf-8")
+            if saida_md is not None:
+                saida_md.write_text(markdown_completo, encoding="utf-8")
+                logger.info(f"[✓] Markdown salvo em: {saida_md}")
             
             # Preparar resumo estatístico
-            total_campos = sum(len(p.get("campos_estruturados", [])) for p in paginas_processadas)
-            total_navegadores = sum(len(p.get("navegadores_laterais", [])) for p in paginas_processadas)
+            total_campos = sum(len(p.campos) for p in paginas_processadas)
+            total_navegadores = sum(len(p.navegadores) for p in paginas_processadas)
             
             # Coletar tipos de documento únicos
             tipos_documento = set()
             
             for p in paginas_processadas:
-                tipo = p.get("analise_projeto", {}).get("tipo_documento")
-                if tipo:
-                    tipos_documento.add(tipo)
+                if p.tipo_documento:
+                    tipos_documento.add(p.tipo_documento)
             
             # Preparar dados completos para JSON
-            dados_completos = {
-                "arquivo": str(pdf_entrada),
-                "total_paginas": len(paginas_processadas),
-                "margens_aplicadas": self.margens,
-                "configuracao": {
-                    "header_config": self.header_config,
-                    "field_config": self.field_config,
-                    "special_elements": self.special_elements,
-                    "navegadores_laterais": self.navegadores_laterais
-                },
-                "resumo": {
+            dados_completos = self._montar_dados_completos(
+                pdf_entrada,
+                len(paginas_processadas),
+                {
                     "total_campos_estruturados": total_campos,
                     "total_navegadores_laterais": total_navegadores,
                     "tipos_documento": list(tipos_documento),
                     "hierarquia_detectada": self._resumir_hierarquia(paginas_processadas),
                     "todo_texto_preservado": True  # Indica que nenhum texto foi removido
                 },
-                "paginas": paginas_processadas
-            }
+                tempos_etapas,
+                limpeza,
+            )
+            dados_completos["paginas"] = paginas_processadas
             
             # Salvar estrutura JSON
-            with open(saida_json, "w", encoding="utf-8") as f:
-                json.dump(dados_completos, f, ensure_ascii=False, indent=2, default=str)
-            
-            logger.info(f"[✓] Markdown salvo em: {saida_md}")
-            logger.info(f"[✓] JSON salvo em: {saida_json}")
-            logger.info(f"[✓] Total de páginas: {dados_completos['total_paginas']}")
-            logger.info(f"[✓] Total de campos estruturados: {total_campos}")
-            logger.info(f"[✓] Total de navegadores laterais: {total_navegadores}")
-            logger.info(f"[✓] Tipos de documento: {', '.join(tipos_documento)}")
-            logger.info(f"[✓] Hierarquia detectada: {dados_completos['resumo']['hierarquia_detectada']}")
-            logger.info(f"[✓] Todo texto preservado: SIM")
+            if saida_json is not None:
+                with open(saida_json, "w", encoding="utf-8") as f:
+                    json.dump(dados_completos, f, ensure_ascii=False, indent=2, default=_json_padrao)
+                logger.info(f"[✓] JSON salvo em: {saida_json}")
+            
+            self._registrar_resumo(dados_completos)
             
+            # Markdown devolvido diretamente (fora do JSON salvo, para não duplicá-lo)
+            dados_completos["markdown"] = markdown_completo
             return dados_completos
             
         except Exception as e:
             logger.error(f"Erro na extração: {e}")
             raise
     
-    def _resumir_hierarquia(self, paginas: List[Dict]) -> Dict:
+    def _extrair_completo_baixa_memoria(
+        self,
+        pdf_entrada: OrigemPDF,
+        saida_md: Optional[Path],
+        saida_json: Optional[Path],
+        saida_ndjson: Optional[Path],
+    ) -> Dict:
+        """
+        Extração completa com memória limitada, para PDFs com milhares de páginas.
+        
+        As páginas vêm de iter_paginas (lotes de processing_config['paginas_por_lote'],
+        sempre sequencial, cada lote recortado em um documento descartável) e
+        cada página concluída é anexada a um arquivo NDJSON
+        e descartada. O resumo é acumulado por EscritorMarkdownIncremental, o
+        markdown é copiado do spool do escritor para saida_md e o JSON é gravado
+        em fluxo, relendo as páginas do NDJSON uma a uma. O JSON e o markdown
+        gerados têm o mesmo formato do modo em memória.
+        
+        Args:
+            pdf_entrada: Caminho do PDF de entrada ou bytes do arquivo em memória
+            saida_md: Caminho para salvar o Markdown (None = não salvar)
+            saida_json: Caminho para salvar estrutura JSON (None = não salvar)
+            saida_ndjson: Arquivo NDJSON das páginas a manter (None = temporário)
+            
+        Returns:
+            Dados de resumo da extração (sem páginas nem markdown)
+        """
+        tempos_etapas = {}
+        with ExitStack() as pilha:
+            escritor = pilha.enter_context(EscritorMarkdownIncremental(self))
+            if saida_ndjson is not None:
+                paginas_ndjson = pilha.enter_context(open(saida_ndjson, "w+", encoding="utf-8"))
+            else:
+                paginas_ndjson = pilha.enter_context(tempfile.TemporaryFile("w+", encoding="utf-8"))
+            
+            for pagina in self.iter_paginas(pdf_entrada, tempos_etapas, baixa_memoria=True):
+                escritor.adicionar(pagina)
+                paginas_ndjson.write(json.dumps(pagina.para_dict(), ensure_ascii=False, default=_json_padrao))
+                paginas_ndjson.write("\n")
+            
+            # Markdown direto do spool; a limpeza de cabeçalhos só é contabilizada ao escrever
+            if saida_md is not None:
+                escritor.salvar(saida_md)
+                logger.info(f"[✓] Markdown salvo em: {saida_md}")
+            elif escritor.economia() is not None:
+                with open(os.devnull, "w", encoding="utf-8") as descarte:
+                    escritor.escrever(descarte)
+            
+            dados_completos = self._montar_dados_completos(
+                pdf_entrada, escritor.total_paginas, escritor.resumo(), tempos_etapas, escritor.economia()
+            )
+            
+            if saida_json is not None:
+                paginas_ndjson.seek(0)
+                with open(saida_json, "w", encoding="utf-8") as f:
+                    self._escrever_json_em_fluxo(f, dados_completos, paginas_ndjson, escritor._removedor)
+                logger.info(f"[✓] JSON salvo em: {saida_json}")
+        
+        self._registrar_resumo(dados_completos)
+        if saida_ndjson is not None:
+            dados_completos["paginas_ndjson"] = str(saida_ndjson)
+        return dados_completos
+    
+    @staticmethod
+    def _escrever_json_em_fluxo(destino: TextIO, dados: Dict, paginas_ndjson: TextIO, removedor=None) -> None:
+        """
+        Grava dados + "paginas" no mesmo formato de json.dump(indent=2), uma página por vez.
+        
+        Args:
+            destino: Stream de texto do arquivo JSON
+            dados: Dados do documento, sem a chave "paginas" (que é gravada por último)
+            paginas_ndjson: Stream posicionado no início do NDJSON das páginas
+            removedor: RemovedorCabecalhosRodapes já alimentado, para limpar o
+                       conteúdo das páginas como no modo em memória (None = não limpar)
+        """
+        cabecalho = json.dumps(dados, ensure_ascii=False, indent=2, default=_json_padrao)
+        destino.write(cabecalho[:-2])  # Sem o "\n}" final
+        destino.write(',\n  "paginas": [')
+        
+        vazia = True
+        for linha in paginas_ndjson:
+            pagina = json.loads(linha)
+            if removedor is not None:
+                pagina["conteudo_markdown"] = removedor.limpar(pagina["conteudo_markdown"].strip())
+            texto = json.dumps(pagina, ensure_ascii=False, indent=2, default=_json_padrao)
+            destino.write(("\n    " if vazia else ",\n    ") + texto.replace("\n", "\n    "))
+            vazia = False
+        
+        destino.write("]\n}" if vazia else "\n  ]\n}")
+    
+    def _montar_dados_completos(
+        self,
+        pdf_entrada: OrigemPDF,
+        total_paginas: int,
+        resumo: Dict,
+        tempos_etapas: Dict,
+        limpeza: Optional[Dict],
+    ) -> Dict:
+        """Dados do documento salvos no JSON (a lista de páginas é acrescentada por quem chama)."""
+        return {
+            "arquivo": _nome_origem(pdf_entrada),
+            "total_paginas": total_paginas,
+            "margens_aplicadas": self.margens,
+            # Configuração referenciada pelo hash (ver salvar_configuracao)
+            "hash_configuracao": self.hash_configuracao(),
+            "resumo": resumo,
+            "tempos_etapas": tempos_etapas,
+            "limpeza_cabecalhos_rodapes": limpeza,
+        }
+    
+    @staticmethod
+    def _registrar_resumo(dados_completos: Dict) -> None:
+        resumo = dados_completos["resumo"]
+        logger.info(f"[✓] Total de páginas: {dados_completos['total_paginas']}")
+        logger.info(f"[✓] Total de campos estruturados: {resumo['total_campos_estruturados']}")
+        logger.info(f"[✓] Total de navegadores laterais: {resumo['total_navegadores_laterais']}")
+        logger.info(f"[✓] Tipos de documento: {', '.join(resumo['tipos_documento'])}")
+        logger.info(f"[✓] Hierarquia detectada: {resumo['hierarquia_detectada']}")
+        logger.info(f"[✓] Todo texto preservado: SIM")
+    
+    def _resumir_hierarquia(self, paginas: List[Pagina]) -> Dict:
         """
         Resume a hierarquia detectada no documento.
         
@@ -1229,7 +2669,15 @@ class ExtratorPDFProjetos:
         Returns:
             Dict com resumo da hierarquia
         """
-        resumo = {
+        resumo = self._resumo_hierarquia_vazio()
+        for pagina in paginas:
+            self._acumular_hierarquia(resumo, pagina)
+        return resumo
+    
+    @staticmethod
+    def _resumo_hierarquia_vazio() -> Dict:
+        """Contadores zerados do resumo de hierarquia."""
+        return {
             "h1": 0,
             "h2": 0,
             "h3": 0,
@@ -1237,24 +2685,289 @@ class ExtratorPDFProjetos:
             "total_headers": 0,
             "navegadores_laterais": 0
         }
+    
+    @staticmethod
+    def _acumular_hierarquia(resumo: Dict, pagina: Pagina) -> None:
+        """
+        Soma ao resumo os headers e navegadores de uma página.
         
+        Args:
+            resumo: Contadores (ver _resumo_hierarquia_vazio), alterados no lugar
+            pagina: Página processada
+        """
         # Contar navegadores laterais
-        for pagina in paginas:
-            if pagina.get("navegadores_laterais"):
-                resumo["navegadores_laterais"] += len(pagina["navegadores_laterais"])
-                # Navegadores também são contados como h1
-                resumo["h1"] += len(pagina["navegadores_laterais"])
-                resumo["total_headers"] += len(pagina["navegadores_laterais"])
+        if pagina.navegadores:
+            resumo["navegadores_laterais"] += len(pagina.navegadores)
+            # Navegadores também são contados como h1
+            resumo["h1"] += len(pagina.navegadores)
+            resumo["total_headers"] += len(pagina.navegadores)
         
         # Contar headers normais
-        for pagina in paginas:
-            analise = pagina.get("analise_projeto", {})
-            for nivel, titulos in analise.get("secoes", {}).items():
-                if nivel in resumo:
-                    resumo[nivel] += len(titulos)
-                    resumo["total_headers"] += len(titulos)
+        for titulo in pagina.titulos:
+            if titulo.nivel in resumo:
+                resumo[titulo.nivel] += 1
+                resumo["total_headers"] += 1
+
+
+class RemovedorCabecalhosRodapes:
+    """
+    Detecta e remove cabeçalhos/rodapés corridos (linhas repetidas entre páginas).
+    
+    Em uma primeira passada, `registrar` guarda as linhas do topo e da base de cada
+    página, normalizadas (sem marcação markdown e caixa, e com a numeração de
+    página mascarada, para que "Página 3 / 10" e "Página 4 / 10" coincidam).
+    Linhas presentes em ao menos
+    `frequencia_cabecalho` das páginas são consideradas repetidas e `limpar` as
+    remove apenas dessas bordas. Títulos conhecidos (header_config e navegadores
+    laterais) nunca são removidos, pois estruturam o documento.
+    """
+    
+    def __init__(self, extrator: ExtratorPDFProjetos):
+        """
+        Args:
+            extrator: Extrator cujas configurações e títulos são usados
+        """
+        self.extrator = extrator
+        self.linhas_borda = extrator.processing_config.get('linhas_borda_cabecalho', 3)
+        self.frequencia = extrator.processing_config.get('frequencia_cabecalho', 0.6)
+        self._contagem = {}
+        self._total_paginas = 0
+        self._repetidas = None
+        self.linhas_removidas = 0
+        self.caracteres_removidos = 0
+    
+    @staticmethod
+    def _normalizar(linha: str) -> str:
+        texto = ' '.join(_RE_MARCACAO_LINHA.sub(' ', linha).lower().split())
+        # Só os números da numeração de página são ignorados, para não igualar
+        # linhas de conteúdo que diferem apenas em valores ("Meta 1", "Meta 2")
+        return _RE_NUMERACAO_PAGINA.sub(lambda m: _RE_DIGITOS.sub('0', m.group()), texto)
+    
+    def _indices_borda(self, linhas: List[str]) -> List[int]:
+        """
+        Índices das primeiras e últimas linhas não vazias da página.
         
-        return resumo
+        Em páginas curtas cada borda fica limitada a (n - 1) // 2 linhas, sem
+        sobreposição: ao menos uma linha do meio nunca é tratada como borda.
+        """
+        nao_vazias = [i for i, linha in enumerate(linhas) if linha.strip()]
+        quantidade = min(self.linhas_borda, (len(nao_vazias) - 1) // 2)
+        if quantidade <= 0:
+            return []
+        return nao_vazias[:quantidade] + nao_vazias[-quantidade:]
+    
+    def registrar(self, markdown: str) -> None:
+        """Contabiliza as linhas de borda de uma página (primeira passada)."""
+        linhas = markdown.split("\n")
+        chaves = {self._normalizar(linhas[i]) for i in self._indices_borda(linhas)}
+        chaves.discard('')
+        for chave in chaves:
+            self._contagem[chave] = self._contagem.get(chave, 0) + 1
+        self._total_paginas += 1
+        self._repetidas = None
+    
+    def repetidas(self) -> set:
+        """Linhas normalizadas que se repetem na maioria das páginas."""
+        if self._repetidas is None:
+            # Com poucas páginas a repetição não é evidência suficiente
+            minimo = max(3, self.frequencia * self._total_paginas)
+            self._repetidas = {
+                chave for chave, contagem in self._contagem.items()
+                if contagem >= minimo and not self._titulo_estrutural(chave)
+            }
+        return self._repetidas
+    
+    def _titulo_estrutural(self, chave: str) -> bool:
+        if self.extrator._nivel_titulo(chave) is not None:
+            return True
+        return self.extrator._identificar_navegador(chave, None) is not None
+    
+    def limpar(self, markdown: str) -> str:
+        """
+        Remove as linhas repetidas das bordas de uma página (segunda passada).
+        
+        Args:
+            markdown: Markdown da página, como passado a `registrar`
+            
+        Returns:
+            Markdown sem os cabeçalhos/rodapés repetidos
+        """
+        repetidas = self.repetidas()
+        if not repetidas:
+            return markdown
+        linhas = markdown.split("\n")
+        remover = {i for i in self._indices_borda(linhas) if self._normalizar(linhas[i]) in repetidas}
+        if not remover:
+            return markdown
+        limpo = "\n".join(linha for i, linha in enumerate(linhas) if i not in remover).strip()
+        self.linhas_removidas += len(remover)
+        self.caracteres_removidos += len(markdown) - len(limpo)
+        return limpo
+    
+    def economia(self) -> Dict:
+        """Linhas, caracteres e tokens estimados (~4 caracteres/token) removidos."""
+        return {
+            "linhas_repetidas": len(self.repetidas()),
+            "linhas_removidas": self.linhas_removidas,
+            "caracteres_economizados": self.caracteres_removidos,
+            "tokens_estimados_economizados": self.caracteres_removidos // _CHARS_POR_TOKEN,
+        }
+
+
+class EscritorMarkdownIncremental:
+    """
+    Monta o markdown final (índice + conteúdo) página a página, sem reter as páginas.
+    
+    O conteúdo é gravado em um arquivo temporário em spool (memória até
+    `limite_memoria` bytes, disco depois); do índice e do resumo apenas os
+    itens e contadores são mantidos. O resultado é idêntico ao de
+    gerar_indice_hierarquico + gerar_markdown_otimizado em extrair_completo.
+    
+    Com processing_config['clean_headers_footers'], as linhas de borda de cada
+    página são registradas durante a adição e os cabeçalhos/rodapés repetidos
+    são removidos ao escrever o resultado (só então a repetição é conhecida).
+    """
+    
+    def __init__(
+        self,
+        extrator: ExtratorPDFProjetos,
+        niveis_indice: List[str] = None,
+        incluir_navegadores: bool = True,
+        limite_memoria: int = 8 * 1024 * 1024,
+    ):
+        """
+        Args:
+            extrator: Extrator que gerou as páginas
+            niveis_indice: Níveis incluídos no índice (padrão: apenas h1)
+            incluir_navegadores: Se True, inclui navegadores laterais no índice
+            limite_memoria: Bytes mantidos em memória antes de usar o disco
+        """
+        self.extrator = extrator
+        self.niveis_indice = niveis_indice or ['h1']
+        self.incluir_navegadores = incluir_navegadores
+        # newline="": sem tradução de "\r"/"\r\n", para que as páginas relidas
+        # por tamanho (remoção de cabeçalhos) tenham exatamente os caracteres gravados
+        self._conteudo = tempfile.SpooledTemporaryFile(
+            max_size=limite_memoria, mode="w+", encoding="utf-8", newline=""
+        )
+        self._itens_indice = []
+        
+        # Remoção de cabeçalhos/rodapés: tamanho de cada página para relê-las do spool
+        self._removedor = None
+        self._tamanhos = []
+        if extrator.processing_config.get('clean_headers_footers'):
+            self._removedor = RemovedorCabecalhosRodapes(extrator)
+        
+        # Contadores do resumo, atualizados a cada página
+        self.total_paginas = 0
+        self.total_campos = 0
+        self.total_navegadores = 0
+        self.tipos_documento = set()
+        self.hierarquia = extrator._resumo_hierarquia_vazio()
+    
+    def adicionar(self, pagina: Pagina) -> str:
+        """
+        Acrescenta uma página processada ao markdown.
+        
+        Args:
+            pagina: Página gerada por iter_paginas
+            
+        Returns:
+            Fragmento markdown da página (útil para repassar texto parcial)
+        """
+        fragmento = pagina.conteudo_markdown.strip()
+        if self.total_paginas:
+            self._conteudo.write("\n\n")
+        self._conteudo.write(fragmento)
+        if self._removedor is not None:
+            self._removedor.registrar(fragmento)
+            self._tamanhos.append(len(fragmento))
+        
+        self._itens_indice.extend(
+            self.extrator._itens_indice_pagina(pagina, self.niveis_indice, self.incluir_navegadores)
+        )
+        self.total_paginas += 1
+        self.total_campos += len(pagina.campos)
+        self.total_navegadores += len(pagina.navegadores)
+        if pagina.tipo_documento:
+            self.tipos_documento.add(pagina.tipo_documento)
+        self.extrator._acumular_hierarquia(self.hierarquia, pagina)
+        
+        return fragmento
+    
+    def indice(self) -> str:
+        """Índice hierárquico das páginas adicionadas até agora."""
+        return self.extrator._formatar_indice(self._itens_indice, self.niveis_indice)
+    
+    def resumo(self) -> Dict:
+        """Resumo estatístico no mesmo formato de dados_completos['resumo']."""
+        return {
+            "total_campos_estruturados": self.total_campos,
+            "total_navegadores_laterais": self.total_navegadores,
+            "tipos_documento": list(self.tipos_documento),
+            "hierarquia_detectada": dict(self.hierarquia),
+            "todo_texto_preservado": True
+        }
+    
+    def economia(self) -> Optional[Dict]:
+        """
+        Economia da remoção de cabeçalhos/rodapés na última chamada a texto()/escrever().
+        
+        Returns:
+            Dict de RemovedorCabecalhosRodapes.economia, ou None se a remoção está desabilitada
+        """
+        if self._removedor is None:
+            return None
+        return self._removedor.economia()
+    
+    def texto(self) -> str:
+        """Markdown completo (índice + conteúdo) como string."""
+        if self._removedor is not None:
+            destino = io.StringIO()
+            self.escrever(destino)
+            return destino.getvalue()
+        self._conteudo.seek(0)
+        conteudo = self._conteudo.read()
+        return self.indice() + "\n---\n\n" + conteudo
+    
+    def escrever(self, destino: TextIO) -> None:
+        """Escreve índice + conteúdo em um stream de texto, copiando o conteúdo em blocos."""
+        destino.write(self.indice() + "\n---\n\n")
+        self._conteudo.seek(0)
+        if self._removedor is None:
+            shutil.copyfileobj(self._conteudo, destino)
+        else:
+            # Relê página a página (separadas por "\n\n") e limpa as bordas
+            self._removedor.linhas_removidas = 0
+            self._removedor.caracteres_removidos = 0
+            for i, tamanho in enumerate(self._tamanhos):
+                if i:
+                    destino.write(self._conteudo.read(2))
+                destino.write(self._removedor.limpar(self._conteudo.read(tamanho)))
+        self._conteudo.seek(0, 2)
+    
+    def salvar(self, caminho: Path) -> None:
+        """Salva o markdown completo em disco."""
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        with open(caminho, "w", encoding="utf-8") as f:
+            self.escrever(f)
+    
+    def fechar(self) -> None:
+        """Libera o arquivo temporário do conteúdo."""
+        self._conteudo.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def _extrair_fatia(extrator: ExtratorPDFProjetos, caminho_pdf: OrigemPDF, intervalo: Tuple[int, int]):
+    """Executa uma fatia da extração paralela (precisa ser top-level para o pickle)."""
+    tempos = {}
+    paginas = extrator.extrair_com_margens_controladas(caminho_pdf, tempos, intervalo)
+    return paginas, tempos
 
 # Script principal
 if __name__ == "__main__":
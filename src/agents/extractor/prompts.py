@@ -449,3 +449,119 @@ Antes de fornecer o JSON, certifique-se de que:
 17.	Nenhum campo usa variações, sinônimos ou expressões fora das listas permitidas para tpIniciativa, tpIniciativa2, objEstrategicoX ou categoriaPremio?
 
 """
+
+# Campos de inscrição CNMP, na ordem do JSON de saída de EXTRACTION_PROMPT
+CAMPOS_CNMP = (
+    "nmProjeto", "tpIniciativa", "tpIniciativa2", "vinculacaoContatoNome", "dtInicio",
+    "envolvidos", "cronograma", "recursos", "descricao", "impacto", "dsObjEstrategico",
+    "desafios1", "desafios2", "desafios3", "resolutividade", "inovacao", "transparencia",
+    "proatividade", "cooperacao", "resultado1", "resultado2", "resultado3",
+    "objEstrategico1", "objEstrategico2", "objEstrategico3", "categoriaPremio",
+)
+
+# Etapa "map" da extração em partes: levanta evidências de um trecho do documento
+MAP_PROMPT = """
+Você recebe UM TRECHO (uma ou mais seções) de um documento de projeto do Ministério Público de Goiás (MPGO).
+O projeto será inscrito no Prêmio CNMP. Outro passo preencherá o formulário depois. Sua tarefa é só levantar evidências deste trecho.
+
+Para cada campo abaixo, copie do trecho as informações que servem para preenchê-lo. Copie literalmente ou condense sem perder fatos, nomes, números e datas.
+NÃO elabore textos finais, NÃO invente nada e NÃO use conhecimento externo. Omita os campos sem evidência neste trecho.
+
+- nmProjeto: nome completo do projeto
+- tpIniciativa, tpIniciativa2: indícios da natureza da iniciativa (programa/projeto; ação/campanha/ferramenta)
+- vinculacaoContatoNome: idealizadores, responsáveis, gerente, coordenador e equipe (nomes e cargos)
+- dtInicio: datas do cronograma ou das entregas (a primeira é a data inicial)
+- envolvidos: órgãos e instituições envolvidos ou parceiros
+- cronograma: etapas, prazos e datas
+- recursos: custos previstos e recursos humanos/materiais
+- descricao: justificativa, problema, objetivo, método e produtos
+- impacto: público impactado (interno/externo) e números
+- dsObjEstrategico: objetivos e alinhamento estratégico
+- desafios1: riscos, obstáculos e dificuldades
+- resolutividade, inovacao, transparencia, proatividade, cooperacao: fatos que evidenciem cada valor institucional
+- resultado1: produtos, entregas, resultados e indicadores
+- objEstrategico1, categoriaPremio: área de atuação e tema do projeto
+
+Responda SOMENTE com um JSON no formato {"campo": ["trecho", ...]}, usando apenas os nomes de campo acima.
+Se nada for relevante, responda {}.
+"""
+
+# Etapa "reduce": monta os 26 campos a partir das evidências combinadas de todas as partes
+REDUCE_PROMPT = EXTRACTION_PROMPT + """
+
+---
+# ENTRADA DESTA ETAPA
+
+O texto abaixo NÃO é o documento integral. É um JSON com as evidências extraídas de cada seção do documento, agrupadas por campo de destino.
+Considere as evidências de todos os campos em conjunto como se fossem o documento.
+Aplique todas as regras acima e responda com o JSON final completo dos 26 campos.
+"""
+
+# Extração por grupos de campos: cada grupo recebe só as seções recuperadas pela
+# busca BM25 com a sua "consulta" e só as regras de EXTRACTION_PROMPT dos seus
+# campos, mais os trechos do prompt listados em "secoes_prompt" (por título)
+GRUPOS_CAMPOS = {
+    "identificacao": {
+        "campos": ("nmProjeto", "tpIniciativa", "tpIniciativa2", "vinculacaoContatoNome", "envolvidos"),
+        "consulta": (
+            "nome completo do projeto programa apresentação idealizador responsável gerente "
+            "coordenador geral equipe de gerenciamento colaboradores áreas responsáveis "
+            "órgãos instituições parceiros cooperação"
+        ),
+        "secoes_prompt": (),
+    },
+    "cronograma": {
+        "campos": ("dtInicio", "cronograma", "recursos"),
+        "consulta": (
+            "cronograma grupo de entregas entrega data início término prazo etapas "
+            "custo previsto recursos orçamento materiais humanos"
+        ),
+        "secoes_prompt": (),
+    },
+    "descricao": {
+        "campos": ("descricao", "impacto", "dsObjEstrategico"),
+        "consulta": (
+            "justificativa objetivo geral específicos método produtos público beneficiários "
+            "população atendida alinhamento estratégico"
+        ),
+        "secoes_prompt": ("# **REGRAS DE REDAÇÃO E ESTILO**",),
+    },
+    "desafios": {
+        "campos": ("desafios1", "desafios2", "desafios3"),
+        "consulta": "riscos desafios probabilidade impacto mitigação restrições premissas obstáculos dificuldades",
+        "secoes_prompt": ("## **DESAFIOS E RESULTADOS", "# **REGRAS DE REDAÇÃO E ESTILO**"),
+    },
+    "resultados": {
+        "campos": ("resultado1", "resultado2", "resultado3"),
+        "consulta": "produtos entregas resultados benefícios indicadores de desempenho metas",
+        "secoes_prompt": ("## **DESAFIOS E RESULTADOS", "# **REGRAS DE REDAÇÃO E ESTILO**"),
+    },
+    "valores": {
+        "campos": ("resolutividade", "inovacao", "transparencia", "proatividade", "cooperacao"),
+        "consulta": (
+            "alinhamento estratégico valores resolutividade inovação transparência proatividade "
+            "cooperação objetivo justificativa"
+        ),
+        "secoes_prompt": ("## **VALORES INSTITUCIONAIS", "# **REGRAS DE REDAÇÃO E ESTILO**"),
+    },
+    "classificacao": {
+        "campos": ("objEstrategico1", "objEstrategico2", "objEstrategico3", "categoriaPremio"),
+        "consulta": "objetivo justificativa alinhamento estratégico área de atuação tema produtos",
+        "secoes_prompt": ("## **OBJETIVO ESTRATÉGICO PEN-MP**", "## **CATEGORIAS PARA O PRÊMIO**"),
+    },
+}
+
+# Cabeçalho dos prompts por grupo; as regras dos campos são anexadas em seguida
+GRUPO_PROMPT = """
+# Instruções para Processamento de Projetos MPGO para Inscrição CNMP
+
+Você é um especialista em análise documental e formatação de informações para inscrição de projetos no Prêmio CNMP (Conselho Nacional do Ministério Público).
+O texto enviado contém as seções de um documento de projeto do Ministério Público de Goiás (MPGO) mais relevantes para os campos: {campos}.
+
+Preencha SOMENTE esses campos, seguindo as regras abaixo e respeitando os limites de caracteres.
+Nunca invente informações que não estejam presentes no documento. Se algo não estiver explícito, use o contexto das seções para inferir a informação mais adequada.
+Nunca deixe campos vazios.
+Responda SOMENTE com um JSON contendo exatamente as chaves: {campos}.
+
+# REGRAS DOS CAMPOS
+"""
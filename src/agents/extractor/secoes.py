@@ -0,0 +1,151 @@
+import re
+from dataclasses import dataclass
+from typing import List, Tuple
+
+# Títulos H1: seções do documento e navegadores laterais (inseridos como "# **SEÇÃO**")
+_RE_H1 = re.compile(r'^#[ \t]+(.+?)[ \t]*$', re.MULTILINE)
+_RE_MARCACAO_TITULO = re.compile(r'[#*_`]+')
+
+# Índice gerado por EscritorMarkdownIncremental no início do texto
+_TITULO_INDICE = "# Índice"
+_SEPARADOR_INDICE = "\n---\n"
+
+
+@dataclass(slots=True)
+class Secao:
+    """Seção H1 do markdown extraído (páginas seguidas da mesma seção já unidas)."""
+    titulo: str
+    texto: str
+
+    def markdown(self) -> str:
+        return f"# {self.titulo}\n\n{self.texto}" if self.titulo else self.texto
+
+
+@dataclass(slots=True)
+class Parte:
+    """Trecho do documento enviado em uma única chamada ao LLM (uma ou mais seções)."""
+    titulos: Tuple[str, ...]
+    texto: str
+
+
+def _titulo_limpo(titulo: str) -> str:
+    return " ".join(_RE_MARCACAO_TITULO.sub(" ", titulo).split())
+
+
+def dividir_secoes(texto: str) -> List[Secao]:
+    """
+    Divide o markdown extraído nas seções H1 detectadas pelo ExtratorPDFProjetos.
+
+    Os navegadores laterais viram títulos H1 no início de cada página, então
+    uma seção que ocupa várias páginas aparece com o mesmo título repetido:
+    seções consecutivas com o mesmo título são unidas. O índice gerado no
+    início do texto é descartado e o conteúdo antes do primeiro título vira
+    uma seção sem título.
+
+    Args:
+        texto: Markdown gerado por pdf_text_tool / EscritorMarkdownIncremental
+
+    Returns:
+        Lista de seções na ordem do documento
+    """
+    if texto.lstrip().startswith(_TITULO_INDICE):
+        _, _, texto = texto.partition(_SEPARADOR_INDICE)
+
+    secoes: List[Secao] = []
+    titulos = list(_RE_H1.finditer(texto))
+    preambulo = texto[:titulos[0].start()] if titulos else texto
+    if preambulo.strip():
+        secoes.append(Secao("", preambulo.strip()))
+
+    for i, titulo in enumerate(titulos):
+        fim = titulos[i + 1].start() if i + 1 < len(titulos) else len(texto)
+        nome = _titulo_limpo(titulo.group(1))
+        corpo = texto[titulo.end():fim].strip()
+        if secoes and secoes[-1].titulo.casefold() == nome.casefold():
+            if corpo:
+                secoes[-1].texto = f"{secoes[-1].texto}\n\n{corpo}" if secoes[-1].texto else corpo
+        else:
+            secoes.append(Secao(nome, corpo))
+
+    return secoes
+
+
+def _fatiar(texto: str, max_caracteres: int) -> List[str]:
+    """Quebra um texto longo em pedaços de até max_caracteres, preferindo limites de parágrafo."""
+    pedacos = []
+    atual = ""
+    for paragrafo in texto.split("\n\n"):
+        while len(paragrafo) > max_caracteres:
+            if atual:
+                pedacos.append(atual)
+                atual = ""
+            pedacos.append(paragrafo[:max_caracteres])
+            paragrafo = paragrafo[max_caracteres:]
+        if atual and len(atual) + 2 + len(paragrafo) > max_caracteres:
+            pedacos.append(atual)
+            atual = ""
+        atual = f"{atual}\n\n{paragrafo}" if atual else paragrafo
+    if atual:
+        pedacos.append(atual)
+    return pedacos
+
+
+def agrupar_secoes(secoes: List[Secao], max_caracteres: int) -> List[Parte]:
+    """
+    Agrupa seções consecutivas em partes de até max_caracteres.
+
+    Seções pequenas dividem a mesma parte (menos chamadas ao LLM); seções
+    maiores que o limite são quebradas em limites de parágrafo, repetindo o
+    título em cada pedaço para o LLM saber de que seção o trecho veio.
+
+    Args:
+        secoes: Seções de dividir_secoes
+        max_caracteres: Tamanho máximo do texto de cada parte
+
+    Returns:
+        Lista de partes na ordem do documento
+    """
+    partes: List[Parte] = []
+    titulos: List[str] = []
+    blocos: List[str] = []
+    tamanho = 0
+
+    def fechar():
+        nonlocal titulos, blocos, tamanho
+        if blocos:
+            partes.append(Parte(tuple(titulos), "\n\n".join(blocos)))
+        titulos, blocos, tamanho = [], [], 0
+
+    for secao in secoes:
+        markdown = secao.markdown()
+        if len(markdown) > max_caracteres:
+            fechar()
+            cabecalho = f"# {secao.titulo}\n\n" if secao.titulo else ""
+            for pedaco in _fatiar(secao.texto, max(1, max_caracteres - len(cabecalho))):
+                partes.append(Parte((secao.titulo,), cabecalho + pedaco))
+            continue
+        if tamanho and tamanho + 2 + len(markdown) > max_caracteres:
+            fechar()
+        if secao.titulo not in titulos:
+            titulos.append(secao.titulo)
+        blocos.append(markdown)
+        tamanho += len(markdown) + (2 if tamanho else 0)
+    fechar()
+
+    return partes
+
+
+def fragmentar_secoes(secoes: List[Secao], max_caracteres: int) -> List[Secao]:
+    """
+    Quebra seções maiores que max_caracteres em limites de parágrafo, mantendo o título.
+
+    Usado na busca por seções: cada fragmento é indexado e recuperado
+    separadamente, sem juntar seções diferentes (ao contrário de agrupar_secoes).
+    """
+    fragmentos: List[Secao] = []
+    for secao in secoes:
+        if len(secao.texto) <= max_caracteres:
+            fragmentos.append(secao)
+            continue
+        fragmentos.extend(Secao(secao.titulo, pedaco) for pedaco in _fatiar(secao.texto, max_caracteres))
+    return fragmentos
@@ -1,6 +1,7 @@
 from fastmcp import FastMCP, Context
 from src.config import load_settings
 from src.services.llm import gerar_resposta_llm  # Centraliza chamada à LLM
+from src.utils.streaming import gerar_com_streaming
 from .prompts import PRISAO_PREVENTIVA_PROMPT, LIBERDADE_PROVISORIA_PROMPT, RELAXAMENTO_PRISAO_PROMPT
 import datetime
 import json
@@ -39,10 +40,12 @@ async def gerar_documento(
     prompt_usuario: str,
     conteudo_resultado_markdown: str,
     session_id: str,
+    stream: bool = False,
 ) -> Dict[str, Any]:
     """
     Gera um documento jurídico a partir dos dados extraídos, tipo de ação e instruções do usuário.
     Seleciona o prompt adequado conforme a ação, envia ao módulo centralizado da LLM e retorna o texto gerado.
+    Com stream=True o texto é gerado em streaming: cada trecho é enviado ao cliente como notificação MCP (ver src.utils.streaming).
     """
     acao_normalizada = action.strip().lower()
     mapa_prompts = {
@@ -70,7 +73,10 @@ async def gerar_documento(
     await ctx.info(f"Recebido pedido para gerar documento do tipo: {acao_normalizada}")
     prompt_text = await prompt_func(ctx, texto_extraido, structured_data, prompt_usuario, conteudo_resultado_markdown)
     await ctx.info(f"Enviando prompt para o módulo centralizado da LLM para gerar documento de {acao_normalizada}")
-    documento_texto = await gerar_resposta_llm(prompt_text)
+    if stream:
+        documento_texto = await gerar_com_streaming(ctx, prompt_text, "redator")
+    else:
+        documento_texto = await gerar_resposta_llm(prompt_text)
     timestamp = datetime.datetime.utcnow().isoformat()
     return {
         "documento_gerado": documento_texto,
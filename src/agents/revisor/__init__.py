@@ -5,6 +5,7 @@ from fastmcp import FastMCP, Context
 from src.config import load_settings
 from .prompts import REVISOR_PROMPT
 from src.services.llm import gerar_resposta_llm  # Centraliza chamada à LLM
+from src.utils.streaming import gerar_com_streaming
 
 settings = load_settings()
 
@@ -46,14 +47,18 @@ async def build_prompt(ctx: Context, texto_final: str, conteudo_resultado_markdo
     return prompt_final
 
 @revisor_mcp.tool("revisao_tool")
-async def revisao_tool(ctx: Context, texto_final: str, conteudo_resultado_markdown: str) -> Dict[str, Any]:
+async def revisao_tool(ctx: Context, texto_final: str, conteudo_resultado_markdown: str, stream: bool = False) -> Dict[str, Any]:
     """
     Realiza a revisão do texto final utilizando a LLM centralizada.
+    Com stream=True o texto revisado é gerado em streaming: cada trecho é enviado ao cliente como notificação MCP.
     """
     await ctx.info("Montando prompt para revisão jurídica.")
     prompt_text = await build_prompt(ctx, texto_final, conteudo_resultado_markdown)
     await ctx.info("Enviando prompt para o módulo centralizado da LLM para revisão.")
-    texto_revisado = await gerar_resposta_llm(prompt_text)
+    if stream:
+        texto_revisado = await gerar_com_streaming(ctx, prompt_text, "revisor")
+    else:
+        texto_revisado = await gerar_resposta_llm(prompt_text)
     timestamp = datetime.datetime.utcnow().isoformat()
     return {
         "documento_gerado": texto_revisado,
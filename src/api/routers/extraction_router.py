@@ -11,9 +11,9 @@ import json
 import traceback
 import uuid
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-from src.utils.limpar_json import parse_json_safely
+from src.utils.validar_pdf import CODIGOS_ERRO, PDFInvalido, validar_pdf, validar_tamanho
 
 router = APIRouter()
 
@@ -24,12 +24,31 @@ versao = "0.1"
 class ExtracaoResponse(BaseModel):
     dados_estruturados: Dict[str, Any]
     versao: str
+    previa: Optional[Dict[str, Any]] = None
+    campos_ausentes: Optional[List[str]] = None  # Campos que o LLM não conseguiu extrair (saem vazios)
+
+def _erro_pdf(e: PDFInvalido) -> HTTPException:
+    """Converte a rejeição da validação prévia em resposta HTTP com código específico."""
+    return HTTPException(status_code=e.status_http, detail=e.para_dict())
 
 @router.post("/extrair-dados", response_model=ExtracaoResponse)
-async def extrair_dados(arquivo: UploadFile = File(...)):
+async def extrair_dados(arquivo: UploadFile = File(...), previa: bool = False):
     try:
         session_id = str(uuid.uuid4())
-        conteudo = await arquivo.read()
+        
+        # Validação prévia: uploads inválidos ou grandes demais não chegam ao MCP
+        try:
+            validar_tamanho(arquivo.size, settings.extractor_max_mb)
+            conteudo = await arquivo.read()
+            validar_pdf(
+                conteudo,
+                max_mb=settings.extractor_max_mb,
+                max_paginas=settings.extractor_max_paginas,
+                exigir_texto=settings.extractor_exigir_texto,
+            )
+        except PDFInvalido as e:
+            print(f"[INFO] PDF rejeitado ({e.codigo}): {arquivo.filename}")
+            raise _erro_pdf(e)
         texto_base64 = base64.b64encode(conteudo).decode("utf-8")
 
         # Medir tempo de extração do PDF
@@ -41,8 +60,10 @@ async def extrair_dados(arquivo: UploadFile = File(...)):
         transport = SSETransport(url=MCP_SERVER_URL)
         client = Client(transport)
         async with client:
-            print(f"📄 Chamando tool extractor_pdf_text_tool")
-            response_pdf = await client.call_tool("extractor_pdf_text_tool", payload_pdf)
+            # Prévia: índice e páginas iniciais dentro do orçamento de tempo, sem LLM
+            tool_pdf = "extractor_pdf_preview_tool" if previa else "extractor_pdf_text_tool"
+            print(f"📄 Chamando tool {tool_pdf}")
+            response_pdf = await client.call_tool(tool_pdf, payload_pdf)
             t1_pdf = time.perf_counter()
             tempo_pdf_segundos = t1_pdf - t0_pdf
 
@@ -54,6 +75,16 @@ async def extrair_dados(arquivo: UploadFile = File(...)):
             else:
                 raise HTTPException(status_code=500, detail="Resposta inesperada do MCP. Esperado list[TextContent].")
 
+            # Rejeição da própria tool (mesmos códigos da validação prévia)
+            if parsed.get("codigo") in CODIGOS_ERRO:
+                raise _erro_pdf(PDFInvalido(parsed["codigo"], parsed.get("erro", "")))
+            
+            if previa:
+                if "erro" in parsed:
+                    raise HTTPException(status_code=500, detail=parsed["erro"])
+                print(f"[INFO] Prévia processada: {arquivo.filename} ({tempo_pdf_segundos:.2f}s)")
+                return ExtracaoResponse(versao=versao, dados_estruturados={}, previa=parsed)
+            
             texto_extraido = parsed.get("texto")
             if not texto_extraido:
                 raise HTTPException(status_code=500, detail="Texto extraído está vazio.")
@@ -64,19 +95,23 @@ async def extrair_dados(arquivo: UploadFile = File(...)):
             response_structured = await client.call_tool("extractor_structured_data_tool", {"texto": texto_extraido})
             t1_llm = time.perf_counter()
             tempo_llm_segundos = t1_llm - t0_llm
-            raw = response_structured[0].text
-            try:
-                dados_estruturados = parse_json_safely(raw)
-            except json.JSONDecodeError:
-                dados_estruturados = {"texto_raw": raw}
+            dados_estruturados = json.loads(response_structured[0].text)
+            if "erro" in dados_estruturados:
+                raise HTTPException(status_code=500, detail=dados_estruturados["erro"])
+            campos_ausentes = dados_estruturados.pop("campos_ausentes", None)
+            if campos_ausentes:
+                print(f"[INFO] Extração parcial, campos ausentes: {', '.join(campos_ausentes)}")
             print(f"[INFO] Extração processada: {arquivo.filename}")
             print(f"[INFO] Tempo PDF: {tempo_pdf_segundos:.2f}s, Tempo LLM: {tempo_llm_segundos:.2f}s")
 
         # Retorna JSON em vez de HTML
         return ExtracaoResponse(
             versao=versao,
-            dados_estruturados=dados_estruturados
+            dados_estruturados=dados_estruturados,
+            campos_ausentes=campos_ausentes
         )
+    except HTTPException:
+        raise
     except Exception as e:
         print("Erro completo:", traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Erro na extração: {str(e)}")
@@ -104,11 +139,12 @@ async def extrair_texto(payload: TextoExtrair):
             t1_llm = time.perf_counter()
             tempo_llm_segundos = t1_llm - t0_llm
             
-            raw = response_structured[0].text.strip("`\n ")
-            try:
-                dados_estruturados = json.loads(raw)
-            except json.JSONDecodeError:
-                dados_estruturados = {"texto_raw": raw}
+            dados_estruturados = json.loads(response_structured[0].text)
+            if "erro" in dados_estruturados:
+                raise HTTPException(status_code=500, detail=dados_estruturados["erro"])
+            campos_ausentes = dados_estruturados.pop("campos_ausentes", None)
+            if campos_ausentes:
+                print(f"[INFO] Extração parcial, campos ausentes: {', '.join(campos_ausentes)}")
 
         t1_total = time.perf_counter()
         tempo_total = t1_total - t0_total        # Loga informações para debug
@@ -118,8 +154,11 @@ async def extrair_texto(payload: TextoExtrair):
         # Retorna JSON
         return ExtracaoResponse(
             dados_estruturados=dados_estruturados,
-            versao=versao
+            versao=versao,
+            campos_ausentes=campos_ausentes
         )
+    except HTTPException:
+        raise
     except Exception as e:
         print("Erro completo:", traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Erro no processamento do texto: {str(e)}")
\ No newline at end of file
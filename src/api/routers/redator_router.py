@@ -2,12 +2,15 @@
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
+from sse_starlette.sse import EventSourceResponse
 from typing import Optional, Dict, Any
 
 from fastmcp import Client
 from fastmcp.client.transports import SSETransport
 from src.config import load_settings
+from src.utils.streaming import trecho_da_notificacao
 
+import asyncio
 import json
 import uuid
 import traceback
@@ -103,3 +106,98 @@ async def gerar_documento(
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Erro ao gerar documento: {str(e)}")
+
+
+@router.post("/gerar-documento/stream")
+async def gerar_documento_stream(
+    payload: DocumentoRequest
+):
+    """
+    Versão em streaming de /gerar-documento (Server-Sent Events).
+    
+    Os trechos gerados pelo redator e depois pelo revisor chegam assim que o
+    modelo os produz. Eventos:
+    - "token": {"etapa": "redator" | "revisor", "texto": trecho}
+    - "etapa": {"etapa", "tempo"} ao concluir cada etapa
+    - "fim": mesmo JSON de /gerar-documento, mais tempo_primeiro_token
+    - "erro": {"detail"} em caso de falha
+    """
+    mcp_payload = {
+        "texto_extraido": payload.texto_extraido,
+        "structured_data": payload.dados_estruturados,
+        "action": payload.action,
+        "session_id": payload.session_id,
+        "prompt_usuario": payload.prompt_usuario,
+        "conteudo_resultado_markdown": payload.conteudo_resultado_markdown
+    }
+    
+    async def eventos():
+        fila: asyncio.Queue = asyncio.Queue()
+        inicio = time.time()
+        tempo_primeiro_token = None
+        chamada = None
+        
+        async def ao_receber_log(mensagem):
+            trecho = trecho_da_notificacao(mensagem)
+            if trecho is not None:
+                fila.put_nowait(trecho)
+        
+        def evento_token(trecho):
+            nonlocal tempo_primeiro_token
+            if tempo_primeiro_token is None:
+                tempo_primeiro_token = time.time() - inicio
+                print(f"📄 Primeiro trecho em {tempo_primeiro_token:.2f} segundos")
+            etapa, texto = trecho
+            return {"event": "token", "data": json.dumps({"etapa": etapa, "texto": texto}, ensure_ascii=False)}
+        
+        try:
+            client = Client(SSETransport(url=MCP_SERVER_URL), log_handler=ao_receber_log)
+            async with client:
+                tempos = {}
+                resposta = None
+                for etapa, tool in (("redator", "redactor_gerar_documento_tool"), ("revisor", "revisor_revisao_tool")):
+                    if etapa == "revisor":
+                        argumentos = {
+                            "texto_final": resposta[0].text,
+                            "conteudo_resultado_markdown": payload.conteudo_resultado_markdown,
+                            "stream": True
+                        }
+                    else:
+                        argumentos = {**mcp_payload, "stream": True}
+                    
+                    inicio_etapa = time.time()
+                    print(f"📄 Chamando tool {tool} (streaming)")
+                    chamada = asyncio.create_task(client.call_tool(tool, argumentos))
+                    # Repassa os trechos enquanto a tool roda
+                    while not chamada.done():
+                        proximo = asyncio.create_task(fila.get())
+                        await asyncio.wait({chamada, proximo}, return_when=asyncio.FIRST_COMPLETED)
+                        if proximo.done():
+                            yield evento_token(proximo.result())
+                        else:
+                            proximo.cancel()
+                    while not fila.empty():
+                        yield evento_token(fila.get_nowait())
+                    
+                    resposta = chamada.result()
+                    tempos[etapa] = time.time() - inicio_etapa
+                    print(f"📄 Tempo do {etapa}: {tempos[etapa]:.2f} segundos")
+                    yield {"event": "etapa", "data": json.dumps({"etapa": etapa, "tempo": tempos[etapa]})}
+                
+                data = json.loads(resposta[0].text)
+                data["tempo_total"] = tempos["redator"] + tempos["revisor"]
+                data["tempo_redator"] = tempos["redator"]
+                data["tempo_revisor"] = tempos["revisor"]
+                data["tempo_primeiro_token"] = tempo_primeiro_token
+                print(f"[INFO] Decisão processada (streaming): {payload.action}")
+                print(f"[INFO] Tempo total: {data['tempo_total']:.2f}s")
+                yield {"event": "fim", "data": json.dumps(data, ensure_ascii=False)}
+        except Exception as e:
+            traceback.print_exc()
+            yield {"event": "erro", "data": json.dumps({"detail": f"Erro ao gerar documento: {str(e)}"}, ensure_ascii=False)}
+        finally:
+            # Cliente desconectou no meio da geração: não deixa a tool órfã
+            if chamada is not None and not chamada.done():
+                chamada.cancel()
+    
+    return EventSourceResponse(eventos())
@@ -11,6 +11,47 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8001
     
+    # Extração de PDF
+    extractor_processos: int = 1  # Processos paralelos por extração (1 = sequencial)
+    extractor_modo: str = "fidelidade"  # "fidelidade" (PyMuPDF4LLM) ou "rapido" (spans do fitz)
+    extractor_cache_habilitado: bool = True
+    extractor_cache_dir: str = ""  # Vazio = <tmp>/projeto_conexoes/cache
+    extractor_cache_max_mb: int = 512
+    extractor_cache_ttl_segundos: int = 7 * 24 * 3600
+    extractor_cache_paginas_habilitado: bool = True  # Reaproveita páginas inalteradas de PDFs revisados
+    extractor_salvar_artefatos: bool = False  # Grava output.md/output.json por sessão (depuração)
+    extractor_remover_cabecalhos: bool = True  # Remove cabeçalhos/rodapés repetidos antes de enviar ao LLM
+    extractor_baixa_memoria: bool = False  # Recorta/converte PDFs muito grandes por lote, com memória constante
+    extractor_max_mb: int = 50  # Tamanho máximo do PDF recebido (0 = sem limite)
+    extractor_max_paginas: int = 1000  # Páginas por PDF (0 = sem limite)
+    extractor_exigir_texto: bool = True  # Rejeita PDFs sem camada de texto (digitalizados sem OCR)
+    extractor_previa_paginas: int = 3  # Prévia: páginas iniciais sempre processadas
+    extractor_previa_tempo_limite: float = 5.0  # Prévia: orçamento de tempo em segundos
+    extractor_previa_modo: str = "rapido"  # Modo de extração usado na prévia
+    extractor_llm_estrategia: str = "auto"  # "auto", "unica", "partes" (map-reduce) ou "grupos" (busca BM25 por grupo de campos)
+    extractor_llm_dividir_acima_caracteres: int = 60000  # Textos maiores: extração por grupos ou em partes ("auto"); 0 = nunca
+    extractor_llm_parte_max_caracteres: int = 20000  # Tamanho máximo de cada parte enviada ao LLM
+    extractor_llm_concorrencia: int = 4  # Chamadas simultâneas na extração em partes
+    extractor_llm_evidencias_max_caracteres: int = 3000  # Evidências por campo enviadas à redução
+    extractor_llm_secoes_por_grupo: int = 3  # Seções recuperadas para cada grupo de campos
+    extractor_llm_grupo_max_caracteres: int = 16000  # Texto do documento enviado em cada grupo
+    
+    # Cache de respostas do LLM
+    llm_cache_habilitado: bool = True
+    llm_cache_arquivo: str = ""  # Vazio = <tmp>/projeto_conexoes/cache/llm.sqlite3
+    llm_cache_memoria_itens: int = 256
+    llm_cache_memoria_mb: int = 64
+    llm_cache_disco_mb: int = 256
+    llm_cache_ttl_segundos: int = 24 * 3600
+    
+    # Limites das chamadas ao LLM (todas as chamadas do processo)
+    llm_requisicoes_por_minuto: int = 60  # Taxa máxima (token bucket); 0 = sem limite
+    llm_rajada: int = 10  # Requisições seguidas permitidas acima da taxa
+    llm_concorrencia_maxima: int = 8  # Chamadas simultâneas ao Gemini; 0 = sem limite
+    llm_tentativas: int = 5  # Tentativas por chamada em erros 429/5xx, incluindo a primeira
+    llm_backoff_base_segundos: float = 1.0  # Espera máxima antes da 2ª tentativa (dobra a cada tentativa, com jitter)
+    llm_backoff_maximo_segundos: float = 30.0  # Teto da espera entre tentativas
+    
     # Configurações JWT - mantidas para evitar erro no middleware de sessões
     jwt_secret_key: str = "chave_secreta_temporaria_deve_ser_substituida"
     jwt_algorithm: str = "HS256"
@@ -5,6 +5,7 @@ from src.agents import redactor_mcp
 from src.agents.revisor import revisor_mcp
 from src.agents.extractor import extractor_mcp
 from src.agents.redactor import redactor_mcp
+from src.services.llm import estatisticas_cache_llm, estatisticas_limites_llm
 
 settings = load_settings()
 
@@ -18,6 +19,18 @@ mcp = FastMCP(
 )
 
 
+@mcp.tool()
+def llm_cache_estatisticas() -> dict:
+    """Acertos, faltas e economia do cache de respostas do LLM neste servidor."""
+    return estatisticas_cache_llm() or {"habilitado": False}
+
+
+@mcp.tool()
+def llm_limites_estatisticas() -> dict:
+    """Requisições ao Gemini, repetições e tempos de espera na fila e de geração neste servidor."""
+    return estatisticas_limites_llm()
+
+
 async def setup():
     # monta agentes e tools
     mcp.mount("revisor", revisor_mcp)
@@ -0,0 +1,228 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CacheRespostasLLM:
+    """
+    Cache de respostas do LLM em dois níveis: LRU em memória e SQLite em disco.
+
+    A chave combina o id do modelo, a GenerateContentConfig completa e o hash
+    do prompt (ver chave()). As entradas expiram pelo TTL contado da gravação;
+    acima do limite de tamanho, cada nível descarta primeiro as entradas usadas
+    há mais tempo (no disco, em varreduras a cada intervalo_poda). Acertos no
+    disco promovem a entrada para a memória.
+
+    Os métodos fazem I/O no SQLite: em código assíncrono, chame-os com
+    asyncio.to_thread.
+
+    Os contadores (acertos por nível, faltas, gravações e o tempo de geração
+    economizado) ficam em estatisticas().
+    """
+
+    def __init__(
+        self,
+        arquivo: Optional[Path],
+        max_itens_memoria: int = 256,
+        max_bytes_memoria: int = 64 * 1024 * 1024,
+        max_bytes_disco: int = 256 * 1024 * 1024,
+        ttl_segundos: int = 24 * 3600,
+        intervalo_poda: float = 10.0,
+    ):
+        """
+        Args:
+            arquivo: Banco SQLite do nível em disco (None = apenas memória)
+            max_itens_memoria: Entradas mantidas em memória
+            max_bytes_memoria: Tamanho máximo das respostas em memória
+            max_bytes_disco: Tamanho máximo das respostas em disco
+            ttl_segundos: Validade de cada entrada desde a gravação
+            intervalo_poda: Intervalo mínimo (s) entre varreduras de TTL/tamanho
+                           no disco, para que gravações em rajada não somem a
+                           tabela inteira a cada chamada
+        """
+        self.max_itens_memoria = max_itens_memoria
+        self.max_bytes_memoria = max_bytes_memoria
+        self.max_bytes_disco = max_bytes_disco
+        self.ttl_segundos = ttl_segundos
+        self.intervalo_poda = intervalo_poda
+        self._ultima_poda = 0.0
+
+        # chave -> (criado, duração da geração, resposta), do menos ao mais recente
+        self._memoria: "OrderedDict[str, Tuple[float, float, str]]" = OrderedDict()
+        self._bytes_memoria = 0
+        self._lock = threading.Lock()
+
+        self.acertos_memoria = 0
+        self.acertos_disco = 0
+        self.faltas = 0
+        self.gravacoes = 0
+        self.segundos_economizados = 0.0
+
+        self._db = None
+        if arquivo is not None:
+            arquivo = Path(arquivo)
+            arquivo.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(arquivo), check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS respostas ("
+                " chave TEXT PRIMARY KEY, resposta TEXT NOT NULL, tamanho INTEGER NOT NULL,"
+                " duracao REAL NOT NULL, criado REAL NOT NULL, acessado REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_respostas_acessado ON respostas (acessado)")
+
+    @staticmethod
+    def chave(model_id: str, config: Any, prompt: str) -> str:
+        """
+        Chave da chamada: modelo + configuração de geração completa + hash do prompt.
+
+        Args:
+            model_id: ID do modelo
+            config: GenerateContentConfig (pydantic) ou None
+            prompt: Conteúdo enviado ao modelo
+        """
+        config_json = "null"
+        if config is not None:
+            config_json = json.dumps(
+                config.model_dump(mode="json", exclude_none=True), sort_keys=True, ensure_ascii=False
+            )
+        hash_prompt = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{model_id}\0{config_json}\0{hash_prompt}".encode("utf-8")).hexdigest()
+
+    def _expirada(self, criado: float, agora: float) -> bool:
+        return bool(self.ttl_segundos) and agora - criado > self.ttl_segundos
+
+    def _guardar_em_memoria(self, chave: str, criado: float, duracao: float, resposta: str) -> None:
+        anterior = self._memoria.pop(chave, None)
+        if anterior is not None:
+            self._bytes_memoria -= len(anterior[2].encode("utf-8"))
+        tamanho = len(resposta.encode("utf-8"))
+        if tamanho > self.max_bytes_memoria:
+            return
+        self._memoria[chave] = (criado, duracao, resposta)
+        self._bytes_memoria += tamanho
+        while self._memoria and (
+            len(self._memoria) > self.max_itens_memoria or self._bytes_memoria > self.max_bytes_memoria
+        ):
+            _, (_, _, removida) = self._memoria.popitem(last=False)
+            self._bytes_memoria -= len(removida.encode("utf-8"))
+
+    def obter(self, chave: str) -> Optional[str]:
+        """Resposta em cache (memória, depois disco) ou None se ausente/expirada."""
+        agora = time.time()
+        with self._lock:
+            entrada = self._memoria.get(chave)
+            if entrada is not None:
+                criado, duracao, resposta = entrada
+                if not self._expirada(criado, agora):
+                    self._memoria.move_to_end(chave)
+                    self.acertos_memoria += 1
+                    self.segundos_economizados += duracao
+                    return resposta
+                del self._memoria[chave]
+                self._bytes_memoria -= len(resposta.encode("utf-8"))
+
+            if self._db is not None:
+                try:
+                    linha = self._db.execute(
+                        "SELECT resposta, duracao, criado FROM respostas WHERE chave = ?", (chave,)
+                    ).fetchone()
+                    if linha is not None:
+                        resposta, duracao, criado = linha
+                        if not self._expirada(criado, agora):
+                            self._db.execute("UPDATE respostas SET acessado = ? WHERE chave = ?", (agora, chave))
+                            self._guardar_em_memoria(chave, criado, duracao, resposta)
+                            self.acertos_disco += 1
+                            self.segundos_economizados += duracao
+                            return resposta
+                        self._db.execute("DELETE FROM respostas WHERE chave = ?", (chave,))
+                except sqlite3.Error as e:
+                    logger.warning(f"Falha ao ler o cache de respostas do LLM: {e}")
+
+            self.faltas += 1
+            return None
+
+    def salvar(self, chave: str, resposta: str, duracao: float = 0.0) -> None:
+        """
+        Grava uma resposta nos dois níveis; no disco, TTL e limite de tamanho
+        são aplicados no máximo uma vez por intervalo_poda.
+
+        Args:
+            chave: Chave de chave()
+            resposta: Texto gerado
+            duracao: Tempo que a geração levou (somado em segundos_economizados a cada acerto)
+        """
+        agora = time.time()
+        with self._lock:
+            self._guardar_em_memoria(chave, agora, duracao, resposta)
+            self.gravacoes += 1
+            if self._db is None:
+                return
+            try:
+                tamanho = len(resposta.encode("utf-8"))
+                self._db.execute(
+                    "INSERT OR REPLACE INTO respostas (chave, resposta, tamanho, duracao, criado, acessado)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (chave, resposta, tamanho, duracao, agora, agora),
+                )
+                if agora - self._ultima_poda >= self.intervalo_poda:
+                    self._ultima_poda = agora
+                    self._podar_disco(agora)
+            except sqlite3.Error as e:
+                logger.warning(f"Falha ao gravar no cache de respostas do LLM: {e}")
+
+    def _podar_disco(self, agora: float) -> None:
+        """Remove entradas expiradas e, acima do limite, as acessadas há mais tempo."""
+        if self.ttl_segundos:
+            self._db.execute("DELETE FROM respostas WHERE criado < ?", (agora - self.ttl_segundos,))
+        total = self._db.execute("SELECT COALESCE(SUM(tamanho), 0) FROM respostas").fetchone()[0]
+        if not self.max_bytes_disco or total <= self.max_bytes_disco:
+            return
+        excesso = total - self.max_bytes_disco
+        remover = []
+        for chave, tamanho in self._db.execute("SELECT chave, tamanho FROM respostas ORDER BY acessado"):
+            remover.append((chave,))
+            excesso -= tamanho
+            if excesso <= 0:
+                break
+        self._db.executemany("DELETE FROM respostas WHERE chave = ?", remover)
+
+    def limpar(self) -> None:
+        """Descarta todas as entradas (memória e disco); os contadores são mantidos."""
+        with self._lock:
+            self._memoria.clear()
+            self._bytes_memoria = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM respostas")
+
+    def estatisticas(self) -> Dict:
+        """Contadores de acertos/faltas e ocupação de cada nível."""
+        with self._lock:
+            itens_disco = bytes_disco = 0
+            if self._db is not None:
+                itens_disco, bytes_disco = self._db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM respostas"
+                ).fetchone()
+            acertos = self.acertos_memoria + self.acertos_disco
+            consultas = acertos + self.faltas
+            return {
+                "acertos_memoria": self.acertos_memoria,
+                "acertos_disco": self.acertos_disco,
+                "faltas": self.faltas,
+                "taxa_acerto": round(acertos / consultas, 4) if consultas else 0.0,
+                "gravacoes": self.gravacoes,
+                "segundos_economizados": round(self.segundos_economizados, 3),
+                "itens_memoria": len(self._memoria),
+                "bytes_memoria": self._bytes_memoria,
+                "itens_disco": itens_disco,
+                "bytes_disco": bytes_disco,
+            }
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+from google.genai import errors
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 429 (cota excedida) e falhas transitórias do servidor
+CODIGOS_REPETIR = (429, 500, 502, 503, 504)
+
+
+class BaldeDeFichas:
+    """
+    Limitador de taxa token bucket: `capacidade` fichas, repostas a `por_segundo`.
+
+    Cada requisição retira uma ficha; sem fichas, espera a próxima reposição.
+    As esperas são atendidas em ordem de chegada (lock assíncrono).
+    """
+
+    def __init__(self, por_segundo: float, capacidade: int):
+        """
+        Args:
+            por_segundo: Fichas repostas por segundo (taxa sustentada)
+            capacidade: Máximo de fichas acumuladas (rajada permitida)
+        """
+        self.por_segundo = por_segundo
+        self.capacidade = max(1, capacidade)
+        self._fichas = float(self.capacidade)
+        self._atualizado = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def retirar(self) -> None:
+        """Retira uma ficha, esperando a reposição se o balde estiver vazio."""
+        async with self._lock:
+            while True:
+                agora = time.monotonic()
+                self._fichas = min(self.capacidade, self._fichas + (agora - self._atualizado) * self.por_segundo)
+                self._atualizado = agora
+                if self._fichas >= 1:
+                    self._fichas -= 1
+                    return
+                await asyncio.sleep((1 - self._fichas) / self.por_segundo)
+
+
+class LimitadorLLM:
+    """
+    Controle de carga das chamadas ao LLM: taxa (BaldeDeFichas), concorrência
+    global (semáforo) e novas tentativas com backoff exponencial e jitter.
+
+    vaga() ocupa uma vaga para uma tentativa e mede separadamente o tempo de
+    espera na fila (semáforo + balde) e o tempo de geração; repetir() decide
+    se um erro merece nova tentativa e quanto esperar. Os totais ficam em
+    estatisticas().
+    """
+
+    def __init__(
+        self,
+        requisicoes_por_minuto: int = 0,
+        rajada: int = 1,
+        concorrencia: int = 0,
+        tentativas: int = 1,
+        espera_base_segundos: float = 1.0,
+        espera_maxima_segundos: float = 30.0,
+    ):
+        """
+        Args:
+            requisicoes_por_minuto: Taxa máxima de requisições (0 = sem limite)
+            rajada: Requisições seguidas permitidas acima da taxa
+            concorrencia: Chamadas simultâneas (0 = sem limite)
+            tentativas: Tentativas por chamada, incluindo a primeira
+            espera_base_segundos: Espera máxima antes da 2ª tentativa (dobra a cada tentativa)
+            espera_maxima_segundos: Teto da espera entre tentativas
+        """
+        self.tentativas = max(1, tentativas)
+        self.espera_base_segundos = espera_base_segundos
+        self.espera_maxima_segundos = espera_maxima_segundos
+        self._balde = BaldeDeFichas(requisicoes_por_minuto / 60, rajada) if requisicoes_por_minuto > 0 else None
+        self._semaforo = asyncio.Semaphore(concorrencia) if concorrencia > 0 else None
+
+        self.aguardando = 0
+        self.em_andamento = 0
+        self.requisicoes = 0
+        self.repeticoes = 0
+        self.falhas = 0
+        self.espera_fila_segundos = 0.0
+        self.espera_fila_maxima_segundos = 0.0
+        self.geracao_segundos = 0.0
+        self.geracao_maxima_segundos = 0.0
+        self.backoff_segundos = 0.0
+
+    @asynccontextmanager
+    async def vaga(self) -> AsyncIterator[float]:
+        """
+        Ocupa uma vaga (semáforo + ficha do balde) durante uma tentativa.
+
+        Yields:
+            Tempo de espera na fila até a vaga ser liberada, em segundos
+        """
+        inicio = time.perf_counter()
+        self.aguardando += 1
+        try:
+            if self._semaforo is not None:
+                await self._semaforo.acquire()
+            try:
+                if self._balde is not None:
+                    await self._balde.retirar()
+            except BaseException:
+                if self._semaforo is not None:
+                    self._semaforo.release()
+                raise
+        finally:
+            self.aguardando -= 1
+
+        espera = time.perf_counter() - inicio
+        self.espera_fila_segundos += espera
+        self.espera_fila_maxima_segundos = max(self.espera_fila_maxima_segundos, espera)
+        self.requisicoes += 1
+        self.em_andamento += 1
+        inicio_geracao = time.perf_counter()
+        try:
+            yield espera
+        finally:
+            geracao = time.perf_counter() - inicio_geracao
+            self.geracao_segundos += geracao
+            self.geracao_maxima_segundos = max(self.geracao_maxima_segundos, geracao)
+            self.em_andamento -= 1
+            if self._semaforo is not None:
+                self._semaforo.release()
+
+    def repetir(self, erro: Exception, tentativa: int, pode_repetir: bool = True) -> Optional[float]:
+        """
+        Espera antes da próxima tentativa, ou None se o erro deve ser propagado.
+
+        Só erros 429/5xx da API são repetidos, até `tentativas`. A espera é
+        sorteada entre 0 e espera_base * 2^(tentativa - 1), limitada a
+        espera_maxima (backoff exponencial com jitter completo).
+
+        Args:
+            erro: Exceção da tentativa
+            tentativa: Número da tentativa que falhou (1 = primeira)
+            pode_repetir: False quando a tentativa já produziu efeitos (ex.: trechos enviados)
+        """
+        repetivel = pode_repetir and isinstance(erro, errors.APIError) and erro.code in CODIGOS_REPETIR
+        if not repetivel or tentativa >= self.tentativas:
+            self.falhas += 1
+            return None
+        espera = random.uniform(0, min(self.espera_maxima_segundos, self.espera_base_segundos * 2 ** (tentativa - 1)))
+        self.repeticoes += 1
+        self.backoff_segundos += espera
+        logger.warning(
+            f"Erro {erro.code} do LLM na tentativa {tentativa}/{self.tentativas}; nova tentativa em {espera:.2f}s"
+        )
+        return espera
+
+    async def executar(self, chamada: Callable[[], Awaitable[T]]) -> T:
+        """
+        Executa `chamada` dentro de uma vaga, repetindo em erros 429/5xx.
+
+        Args:
+            chamada: Função sem argumentos que cria a corrotina de uma tentativa
+
+        Returns:
+            Resultado da primeira tentativa bem-sucedida
+        """
+        tentativa = 1
+        while True:
+            try:
+                async with self.vaga() as espera:
+                    inicio = time.perf_counter()
+                    resultado = await chamada()
+                logger.info(
+                    f"Chamada ao LLM: espera na fila {espera:.2f}s, geração {time.perf_counter() - inicio:.2f}s"
+                )
+                return resultado
+            except Exception as e:
+                espera_repetir = self.repetir(e, tentativa)
+                if espera_repetir is None:
+                    raise
+            await asyncio.sleep(espera_repetir)
+            tentativa += 1
+
+    def estatisticas(self) -> Dict:
+        """Requisições, repetições, falhas e tempos de fila e de geração (totais e máximos)."""
+        requisicoes = self.requisicoes
+        return {
+            "aguardando": self.aguardando,
+            "em_andamento": self.em_andamento,
+            "requisicoes": requisicoes,
+            "repeticoes": self.repeticoes,
+            "falhas": self.falhas,
+            "espera_fila_segundos": round(self.espera_fila_segundos, 3),
+            "espera_fila_media_segundos": round(self.espera_fila_segundos / requisicoes, 3) if requisicoes else 0.0,
+            "espera_fila_maxima_segundos": round(self.espera_fila_maxima_segundos, 3),
+            "geracao_segundos": round(self.geracao_segundos, 3),
+            "geracao_media_segundos": round(self.geracao_segundos / requisicoes, 3) if requisicoes else 0.0,
+            "geracao_maxima_segundos": round(self.geracao_maxima_segundos, 3),
+            "backoff_segundos": round(self.backoff_segundos, 3),
+        }
@@ -1,12 +1,19 @@
 # services/llm.py
 from google import genai
 from src.config import load_settings
-import re
-from typing import Dict, Union, Optional, Any
+from src.services.cache_llm import CacheRespostasLLM
+from src.services.limites_llm import LimitadorLLM
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional, Any, Tuple
 import json
 from google.genai import types
 
 settings = load_settings()
+logger = logging.getLogger(__name__)
 
 # Inicializa o client Gemini uma vez
 _gemini_client: genai.Client = genai.Client(api_key=settings.gemini_api_key)
@@ -17,6 +24,99 @@ def get_gemini_client() -> genai.Client:
     return _gemini_client
 
 
+def get_gemini_aio_client():
+    """
+    Retorna a interface assíncrona (client.aio) do client Gemini.
+
+    As chamadas por ela não bloqueiam o event loop: gerações do redator, do
+    revisor e do extrator rodam sobrepostas no mesmo servidor MCP.
+    """
+    return _gemini_client.aio
+
+
+# Cache de respostas: mesma chamada (modelo + configuração + prompt) não volta ao Gemini
+_cache_llm: Optional[CacheRespostasLLM] = None
+if settings.llm_cache_habilitado:
+    _cache_llm = CacheRespostasLLM(
+        Path(settings.llm_cache_arquivo or Path(tempfile.gettempdir()) / "projeto_conexoes" / "cache" / "llm.sqlite3"),
+        max_itens_memoria=settings.llm_cache_memoria_itens,
+        max_bytes_memoria=settings.llm_cache_memoria_mb * 1024 * 1024,
+        max_bytes_disco=settings.llm_cache_disco_mb * 1024 * 1024,
+        ttl_segundos=settings.llm_cache_ttl_segundos,
+    )
+
+
+def estatisticas_cache_llm() -> Optional[Dict]:
+    """Acertos, faltas e ocupação do cache de respostas (None se desabilitado)."""
+    return _cache_llm.estatisticas() if _cache_llm is not None else None
+
+
+# Taxa, concorrência e novas tentativas de todas as chamadas ao Gemini do processo
+# (acertos de cache não passam pelo limitador)
+_limitador_llm = LimitadorLLM(
+    requisicoes_por_minuto=settings.llm_requisicoes_por_minuto,
+    rajada=settings.llm_rajada,
+    concorrencia=settings.llm_concorrencia_maxima,
+    tentativas=settings.llm_tentativas,
+    espera_base_segundos=settings.llm_backoff_base_segundos,
+    espera_maxima_segundos=settings.llm_backoff_maximo_segundos,
+)
+
+
+def estatisticas_limites_llm() -> Dict:
+    """Requisições ao Gemini, repetições, falhas e tempos de espera na fila e de geração."""
+    return _limitador_llm.estatisticas()
+
+
+async def _consultar_cache(
+    model_id: str,
+    contents: str,
+    config: types.GenerateContentConfig,
+    usar_cache: bool,
+) -> Tuple[Optional[str], Optional[str]]:
+    """Retorna (chave para gravar depois ou None, texto em cache ou None)."""
+    if not usar_cache or _cache_llm is None:
+        return None, None
+    chave = _cache_llm.chave(model_id, config, contents)
+    # Leitura no SQLite fora do event loop
+    texto = await asyncio.to_thread(_cache_llm.obter, chave)
+    if texto is not None:
+        logger.info(f"Resposta do LLM recuperada do cache ({len(texto)} caracteres)")
+    return chave, texto
+
+
+async def _gerar_conteudo(
+    model_id: str,
+    contents: str,
+    config: types.GenerateContentConfig,
+    usar_cache: bool = True,
+) -> types.GenerateContentResponse:
+    """
+    Chama client.aio.models.generate_content passando pelo cache de respostas.
+
+    Em um acerto, a resposta é remontada a partir do texto guardado (só o
+    texto é armazenado). Respostas sem texto não são guardadas. Chamadas ao
+    modelo passam pelo limitador (taxa, concorrência e novas tentativas).
+    """
+    chave, texto = await _consultar_cache(model_id, contents, config, usar_cache)
+    if texto is not None:
+        return types.GenerateContentResponse(candidates=[
+            types.Candidate(content=types.Content(role="model", parts=[types.Part(text=texto)]))
+        ])
+    
+    inicio = time.perf_counter()
+    response = await _limitador_llm.executar(
+        lambda: get_gemini_aio_client().models.generate_content(
+            model=model_id,
+            contents=contents,
+            config=config
+        )
+    )
+    if chave is not None and response.text:
+        await asyncio.to_thread(_cache_llm.salvar, chave, response.text, time.perf_counter() - inicio)
+    return response
+
+
 def build_generation_config(
     model_id: Optional[str] = None,
     temperature: float = 0.7,
@@ -47,80 +147,107 @@ def build_generation_config(
     return (model_id or settings.gemini_model, config)
 
 
-def parse_resposta_gemini(resposta: str) -> Union[Dict, str]:
+async def extrair_dados_estruturados(
+    texto: str,
+    prompt: str,
+    esquema: Optional[Dict] = None,
+    usar_cache: bool = True,
+) -> Dict:
     """
-    Processa a resposta da Gemini:
-    - Se contiver um bloco ```json ... ```, extrai esse conteúdo e faz json.loads.
-    - Substitui literais JSON por None/True/False se necessário.
-    - Se json.loads falhar, devolve a resposta original como string (Markdown).
-    """
-    if not resposta or not resposta.strip():
-        raise ValueError("Resposta vazia")
+    Usa o modelo Gemini em modo JSON para extrair dados estruturados do texto.
 
-    # 1) Tentar encontrar um bloco ```json ... ```
-    bloco_json = None
-    m = re.search(r"```(?:json)?\s*(\{.*\})\s*```", resposta, flags=re.DOTALL|re.IGNORECASE)
-    if m:
-        bloco_json = m.group(1)
-    else:
-        # talvez a resposta já venha sem fence, mas seja JSON puro
-        # tentar isolar o trecho entre a primeira '{' e última '}'
-        start = resposta.find('{')
-        end   = resposta.rfind('}')
-        if start != -1 and end != -1 and end > start:
-            bloco_json = resposta[start:end+1]
-
-    if bloco_json:
-        # limpando possíveis backticks ou espaços
-        texto = bloco_json.strip("`\n ")
-        # normalizar literais JSON (null, true, false)
-        texto = re.sub(r'\bnull\b', 'null', texto, flags=re.IGNORECASE)
-        texto = re.sub(r'\btrue\b', 'true', texto, flags=re.IGNORECASE)
-        texto = re.sub(r'\bfalse\b', 'false', texto, flags=re.IGNORECASE)
-
-        try:
-            return json.loads(texto)
-        except json.JSONDecodeError:
-            # não era um JSON válido – vamos cair no fallback
-            pass
+    A resposta é pedida como application/json e, com `esquema`, restrita a ele
+    (response_schema), então é lida direto com json.loads, sem reparos.
+    Com usar_cache=False a chamada sempre vai ao modelo (e não grava no cache).
 
-    # 2) Fallback: devolve raw (incluindo Markdown) para renderização posterior
-    return resposta
+    Args:
+        texto: Texto de entrada
+        prompt: Instruções de extração
+        esquema: Schema OBJECT da resposta (ex.: esquema.ESQUEMA_CNMP)
+        usar_cache: Consulta e grava o cache de respostas
 
+    Returns:
+        Objeto JSON devolvido pelo modelo
 
-def extrair_dados_estruturados(texto: str, prompt: str) -> Union[Dict, str]:
-    """
-    Usa o modelo Gemini para gerar uma resposta e converte para JSON estruturado.
+    Raises:
+        ValueError: Se a resposta vier vazia ou não for um objeto JSON
     """
-    client = get_gemini_client()
     model_id, config = build_generation_config(
-        temperature=0.2
+        temperature=0.2,
+        response_mime_type="application/json",
+        response_schema=esquema,
     )
-    response = client.models.generate_content(
-        model=model_id,
-        contents=f"{prompt}\n\nTexto:\n{texto}",
-        config=config
-    )
-    # Garante que .text não seja None antes do parsing
-    return parse_resposta_gemini(response.text or "")
+    response = await _gerar_conteudo(model_id, f"{prompt}\n\nTexto:\n{texto}", config, usar_cache)
+    if not response.text:
+        raise ValueError("Resposta vazia")
+    dados = json.loads(response.text)
+    if not isinstance(dados, dict):
+        raise ValueError(f"Resposta JSON não é um objeto: {type(dados).__name__}")
+    return dados
 
 
-async def gerar_resposta_llm(prompt: str) -> str:
+async def gerar_resposta_llm(prompt: str, usar_cache: bool = True) -> str:
     """
     Envia um prompt ao modelo Gemini e retorna a resposta de texto.
+    Com usar_cache=False a chamada sempre vai ao modelo (e não grava no cache).
     """
-    client = get_gemini_client()
     model_id, config = build_generation_config(
         system_instruction=None,
         max_output_tokens=None
     )
-    response = client.models.generate_content(
-        model=model_id,
-        contents=prompt,
-        config=config
-    )
+    response = await _gerar_conteudo(model_id, prompt, config, usar_cache)
     # Retorna o texto gerado ou fallback para string da resposta
     text = getattr(response, 'text', None)
     if text:
         return text.strip()
     return str(response)
+
+
+async def gerar_resposta_llm_stream(prompt: str, usar_cache: bool = True) -> AsyncIterator[str]:
+    """
+    Versão em streaming de gerar_resposta_llm (generate_content_stream).
+
+    Produz os trechos de texto à medida que o modelo os gera. Usa a mesma
+    entrada de cache de gerar_resposta_llm: em um acerto, a resposta inteira
+    sai em um único trecho; uma geração completa é gravada no cache ao final.
+
+    A geração ocupa uma vaga do limitador até o último trecho. Erros 429/5xx
+    só são repetidos antes do primeiro trecho (o que já saiu não é desfeito).
+    """
+    model_id, config = build_generation_config(
+        system_instruction=None,
+        max_output_tokens=None
+    )
+    chave, texto = await _consultar_cache(model_id, prompt, config, usar_cache)
+    if texto is not None:
+        yield texto
+        return
+    
+    inicio = time.perf_counter()
+    trechos = []
+    tentativa = 1
+    while True:
+        try:
+            async with _limitador_llm.vaga() as espera:
+                inicio_geracao = time.perf_counter()
+                async for chunk in await get_gemini_aio_client().models.generate_content_stream(
+                    model=model_id,
+                    contents=prompt,
+                    config=config
+                ):
+                    if chunk.text:
+                        trechos.append(chunk.text)
+                        yield chunk.text
+            logger.info(
+                f"Chamada ao LLM (streaming): espera na fila {espera:.2f}s, "
+                f"geração {time.perf_counter() - inicio_geracao:.2f}s"
+            )
+            break
+        except Exception as e:
+            espera_repetir = _limitador_llm.repetir(e, tentativa, pode_repetir=not trechos)
+            if espera_repetir is None:
+                raise
+        await asyncio.sleep(espera_repetir)
+        tentativa += 1
+    if chave is not None and trechos:
+        await asyncio.to_thread(_cache_llm.salvar, chave, "".join(trechos), time.perf_counter() - inicio)
@@ -0,0 +1,50 @@
+from typing import Any, Optional, Tuple
+
+from fastmcp import Context
+
+from src.services.llm import gerar_resposta_llm_stream
+
+# logger_name das notificações de log MCP que carregam trechos gerados pelo LLM
+LOGGER_TRECHOS = "llm.trechos"
+
+
+async def gerar_com_streaming(ctx: Context, prompt: str, etapa: str) -> str:
+    """
+    Gera a resposta do LLM em streaming, repassando cada trecho ao cliente MCP.
+
+    Cada trecho vira uma notificação de log (nível debug, logger_name
+    LOGGER_TRECHOS, extra={"etapa": etapa}) e uma notificação de progresso com
+    o total de caracteres gerados até o momento.
+
+    Args:
+        ctx: Contexto da tool MCP
+        prompt: Prompt completo
+        etapa: Identifica a origem dos trechos no cliente (ex.: "redator", "revisor")
+
+    Returns:
+        Texto completo gerado (sem espaços nas pontas, como gerar_resposta_llm)
+    """
+    trechos = []
+    caracteres = 0
+    async for trecho in gerar_resposta_llm_stream(prompt):
+        trechos.append(trecho)
+        caracteres += len(trecho)
+        await ctx.debug(trecho, logger_name=LOGGER_TRECHOS, extra={"etapa": etapa})
+        await ctx.report_progress(caracteres)
+    return "".join(trechos).strip()
+
+
+def trecho_da_notificacao(mensagem: Any) -> Optional[Tuple[str, str]]:
+    """
+    Extrai (etapa, texto) de uma notificação de log recebida pelo cliente MCP.
+
+    Returns:
+        None se a notificação não for um trecho gerado por gerar_com_streaming
+    """
+    if getattr(mensagem, "logger", None) != LOGGER_TRECHOS:
+        return None
+    dados = mensagem.data
+    if isinstance(dados, dict):
+        extra = dados.get("extra") or {}
+        return extra.get("etapa", ""), dados.get("msg", "")
+    return "", str(dados)
@@ -0,0 +1,130 @@
+import fitz  # PyMuPDF
+from typing import Any, Dict, Optional
+
+# Assinatura de arquivo PDF; leitores aceitam o cabeçalho nos primeiros 1024 bytes
+ASSINATURA_PDF = b"%PDF-"
+_LIMITE_CABECALHO = 1024
+
+# Páginas verificadas (espalhadas pelo documento) em busca de camada de texto
+_PAGINAS_AMOSTRA_TEXTO = 8
+
+# Código de erro -> status HTTP correspondente
+CODIGOS_ERRO = {
+    "arquivo_vazio": 400,
+    "nao_e_pdf": 415,
+    "arquivo_muito_grande": 413,
+    "paginas_excedidas": 413,
+    "pdf_corrompido": 422,
+    "pdf_criptografado": 422,
+    "pdf_sem_paginas": 422,
+    "sem_camada_texto": 422,
+}
+
+
+class PDFInvalido(ValueError):
+    """PDF rejeitado pela validação prévia, com código de erro específico."""
+
+    def __init__(self, codigo: str, mensagem: str):
+        super().__init__(mensagem)
+        self.codigo = codigo
+        self.mensagem = mensagem
+
+    @property
+    def status_http(self) -> int:
+        return CODIGOS_ERRO.get(self.codigo, 400)
+
+    def para_dict(self) -> Dict[str, str]:
+        return {"codigo": self.codigo, "erro": self.mensagem}
+
+
+def validar_tamanho(tamanho_bytes: Optional[int], max_mb: int) -> None:
+    """
+    Rejeita arquivos acima do limite antes mesmo de lê-los (ex.: tamanho do upload).
+
+    Args:
+        tamanho_bytes: Tamanho do arquivo (None = desconhecido, não verifica)
+        max_mb: Tamanho máximo em MB (0 = sem limite)
+
+    Raises:
+        PDFInvalido: "arquivo_muito_grande"
+    """
+    if max_mb and tamanho_bytes is not None and tamanho_bytes > max_mb * 1024 * 1024:
+        raise PDFInvalido(
+            "arquivo_muito_grande",
+            f"Arquivo de {tamanho_bytes / (1024 * 1024):.1f} MB excede o limite de {max_mb} MB."
+        )
+
+
+def _paginas_amostra(total_paginas: int) -> range:
+    """Índices das páginas verificadas: todas ou _PAGINAS_AMOSTRA_TEXTO espaçadas."""
+    passo = max(1, total_paginas // _PAGINAS_AMOSTRA_TEXTO)
+    return range(0, total_paginas, passo)
+
+
+def validar_pdf(
+    conteudo: bytes,
+    max_mb: int = 0,
+    max_paginas: int = 0,
+    exigir_texto: bool = True,
+) -> Dict[str, Any]:
+    """
+    Verificação rápida de um PDF antes do pipeline de extração.
+
+    Confere, em ordem e parando no primeiro problema: tamanho, assinatura
+    (magic bytes), abertura do documento, senha, número de páginas e presença
+    de camada de texto em uma amostra de páginas. Só lê a estrutura do
+    arquivo e o texto das páginas amostradas, sem renderizar nada.
+
+    Args:
+        conteudo: Bytes do arquivo recebido
+        max_mb: Tamanho máximo em MB (0 = sem limite)
+        max_paginas: Número máximo de páginas (0 = sem limite)
+        exigir_texto: Rejeita PDFs só de imagem (digitalizados, sem OCR)
+
+    Returns:
+        Dict com total_paginas, tamanho_bytes, criptografado, reparado
+        (estrutura danificada, recuperada pelo MuPDF) e tem_texto
+
+    Raises:
+        PDFInvalido: Com o código do problema encontrado (ver CODIGOS_ERRO)
+    """
+    if not conteudo:
+        raise PDFInvalido("arquivo_vazio", "Arquivo vazio.")
+    validar_tamanho(len(conteudo), max_mb)
+    if ASSINATURA_PDF not in conteudo[:_LIMITE_CABECALHO]:
+        raise PDFInvalido("nao_e_pdf", "O arquivo enviado não é um PDF.")
+
+    try:
+        doc = fitz.open(stream=conteudo, filetype="pdf")
+    except Exception as e:
+        raise PDFInvalido("pdf_corrompido", f"PDF corrompido ou ilegível: {e}")
+
+    with doc:
+        if doc.needs_pass:
+            raise PDFInvalido("pdf_criptografado", "PDF protegido por senha.")
+        total_paginas = doc.page_count
+        if total_paginas == 0:
+            raise PDFInvalido("pdf_sem_paginas", "PDF sem páginas.")
+        if max_paginas and total_paginas > max_paginas:
+            raise PDFInvalido(
+                "paginas_excedidas",
+                f"PDF com {total_paginas} páginas excede o limite de {max_paginas}."
+            )
+
+        try:
+            tem_texto = any(doc[i].get_text("text").strip() for i in _paginas_amostra(total_paginas))
+        except Exception as e:
+            raise PDFInvalido("pdf_corrompido", f"PDF corrompido ou ilegível: {e}")
+        if exigir_texto and not tem_texto:
+            raise PDFInvalido(
+                "sem_camada_texto",
+                "PDF sem camada de texto (documento digitalizado); aplique OCR antes de enviar."
+            )
+
+        return {
+            "total_paginas": total_paginas,
+            "tamanho_bytes": len(conteudo),
+            "criptografado": bool(doc.is_encrypted),
+            "reparado": bool(doc.is_repaired),
+            "tem_texto": tem_texto,
+        }